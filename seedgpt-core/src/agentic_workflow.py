@@ -508,10 +508,7 @@ Closes #{issue['number']}
             self.logger.error(f"\nPR creation error: {e}")
             return 1
         except Exception as e:
-            self.logger.error(f"\nUnexpected error during workflow execution: {e}")
-            import traceback
-
-            traceback.print_exc()
+            self.logger.exception(f"\nUnexpected error during workflow execution: {e}")
             return 1
 
 
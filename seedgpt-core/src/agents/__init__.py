@@ -3,6 +3,7 @@ AI Agents Package
 
 Core agent implementations for GitHub automation:
 - IssueGenerator: Generates new issues using AI
+- IssueGeneratorBatch: Generates issues for several repos in one API batch
 - IssueResolver: Resolves issues and creates PRs
 - PRFailureResolver: Fixes failing PR checks and updates PRs
 - QAAgent: Monitors repository health
@@ -14,7 +15,7 @@ Specialized Issue Agents:
 - SalesAgent: Generates sales and revenue-related issues
 """
 
-from .issue_generator import IssueGenerator
+from .issue_generator import IssueGenerator, IssueGeneratorBatch
 from .issue_resolver import IssueResolver
 from .pr_failure_resolver import PRFailureResolver
 from .qa_agent import QAAgent
@@ -25,6 +26,7 @@ from .sales_agent import SalesAgent
 
 __all__ = [
     "IssueGenerator",
+    "IssueGeneratorBatch",
     "IssueResolver",
     "PRFailureResolver",
     "QAAgent",
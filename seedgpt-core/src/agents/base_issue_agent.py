@@ -378,11 +378,11 @@ Keep descriptions brief and output ONLY the JSON, nothing else."""
             cleaned_response = response_text.strip()
             if "```json" in cleaned_response:
                 cleaned_response = (
-                    cleaned_response.split("```json")[1].split("```")[0].strip()
+                    cleaned_response.partition("```json")[2].partition("```")[0].strip()
                 )
             elif "```" in cleaned_response:
                 cleaned_response = (
-                    cleaned_response.split("```")[1].split("```")[0].strip()
+                    cleaned_response.partition("```")[2].partition("```")[0].strip()
                 )
 
             # Find JSON object in response
@@ -6,9 +6,11 @@ Ensures minimum number of open issues by generating new ones with Claude AI usin
 """
 
 import json
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 # Add src directory to path to import modules
 sys.path.insert(0, str(Path(__file__).parent.parent / "claude-agent"))
@@ -16,13 +18,24 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import model configuration
 from models_config import CLAUDE_MODELS, SystemPrompts
+from utils import json_helpers
 from utils.deduplication import IssueDuplicateChecker
 from utils.outcome_tracker import OutcomeTracker
 from utils.feedback_analyzer import FeedbackAnalyzer
 from utils.rate_limiter import RateLimiter, RateLimitConfig
 from utils.project_brief_validator import get_project_brief
-from utils.github_helpers import get_readme, get_recent_commits, get_open_issues, create_issue
-from utils.anthropic_helpers import call_anthropic_api
+from utils.github_helpers import (
+    get_readme,
+    get_recent_commits,
+    get_open_issues,
+    count_open_issues,
+    create_issue,
+)
+from utils.anthropic_helpers import (
+    stream_anthropic_json,
+    submit_message_batch,
+    get_message_batch_results,
+)
 from utils.exceptions import (
     AgentResponseError,
     JSONParseError,
@@ -37,6 +50,28 @@ from logging_config import get_logger
 # Initialize logger
 logger = get_logger(__name__)
 
+# JSON object inside a ``` or ```json fence; non-greedy, so it stops at the
+# first closing brace that is directly followed by the closing fence
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Response format instructions appended to every issue generation prompt
+_STATIC_SUFFIX = """
+
+Respond with ONLY a JSON object in this exact format:
+{{
+  "issues": [
+    {{
+      "title": "Brief title (max 80 chars)",
+      "body": "Description (max 300 chars)",
+      "labels": ["feature"]
+    }}
+  ]
+}}
+
+Use appropriate labels: feature, bug, documentation, refactor, test, performance, security, ci/cd
+
+Keep descriptions brief and output ONLY the JSON, nothing else."""
+
 # Import Claude CLI Agent or fallback to Anthropic SDK
 try:
     from claude_cli_agent import ClaudeAgent
@@ -55,7 +90,8 @@ class IssueGenerator:
     """Generates GitHub issues using AI based on repository context"""
 
     def __init__(
-        self, repo, anthropic_api_key: Optional[str] = None, min_issues: int = 3, dry_mode: bool = False
+        self, repo, anthropic_api_key: Optional[str] = None, min_issues: int = 3, dry_mode: bool = False,
+        rate_limit_state_path: Optional[Path] = None
     ):
         """
         Initialize the Issue Generator
@@ -65,6 +101,8 @@ class IssueGenerator:
             anthropic_api_key: Anthropic API key (required if not using Claude CLI)
             min_issues: Minimum number of open issues to maintain
             dry_mode: If True, skip actual issue creation (for CI validation)
+            rate_limit_state_path: Rate limiter state file (defaults to the
+                shared .seedgpt/rate_limit_state.json)
         """
         self.repo = repo
         self.anthropic_api_key = anthropic_api_key
@@ -102,7 +140,8 @@ class IssueGenerator:
                 max_quality_reject_rate=0.5,
                 cooldown_minutes=60,
                 min_time_between_generations_minutes=5
-            )
+            ),
+            state_path=rate_limit_state_path
         )
 
     def check_and_generate(self) -> bool:
@@ -112,6 +151,21 @@ class IssueGenerator:
         Returns:
             bool: True if issues were generated, False otherwise
         """
+        needed, open_issues = self._count_needed()
+        if not needed:
+            return False
+
+        self._generate_issues(needed, open_issues)
+        return True
+
+    def _count_needed(self) -> Tuple[int, List]:
+        """
+        Check the rate limiter and open issue count
+
+        Returns:
+            Tuple of (number of issues to generate, current open issues);
+            the count is 0 when nothing should be generated
+        """
         logger.info(f"Checking issue count (minimum: {self.min_issues})")
 
         # Check rate limiter first
@@ -121,28 +175,29 @@ class IssueGenerator:
             # Log statistics
             stats = self.rate_limiter.get_statistics()
             logger.info("Rate limit stats", extra=stats)
-            return False
+            return 0, []
 
-        # Count open issues (excluding pull requests) with retry
+        # Count open issues (excluding pull requests) with retry; the full list
+        # is only fetched when generation is likely, and then it's at most a page
         try:
-            open_issues = get_open_issues(self.repo, exclude_pull_requests=True)
+            issue_count = count_open_issues(self.repo)
+            if issue_count < self.min_issues:
+                open_issues = get_open_issues(self.repo, exclude_pull_requests=True)
+                issue_count = len(open_issues)
         except Exception as e:
             raise get_exception_for_github_error(e, "Failed to fetch open issues")
 
-        issue_count = len(open_issues)
-
         logger.info(f"Current open issues: {issue_count}")
 
         if issue_count >= self.min_issues:
             logger.info(f"Sufficient issues exist ({issue_count} >= {self.min_issues})")
-            return False
+            return 0, []
 
         # Need to generate issues
         needed = self.min_issues - issue_count
         logger.info(f"Generating {needed} new issue(s)...")
 
-        self._generate_issues(needed, open_issues)
-        return True
+        return needed, open_issues
 
     def _generate_issues(self, needed: int, open_issues: List) -> None:
         """
@@ -152,12 +207,38 @@ class IssueGenerator:
             needed: Number of issues to generate
             open_issues: List of current open issues
         """
+        prompt = self._prepare_prompt(needed, open_issues)
+
+        # Call Claude AI
+        response_text = self._call_claude(prompt)
+
+        if not response_text:
+            raise AgentResponseError("Failed to get response from Claude")
+
+        # Parse and create issues (with deduplication)
+        self._parse_and_create_issues(response_text, needed, open_issues)
+
+    def _prepare_prompt(self, needed: int, open_issues: List) -> str:
+        """
+        Gather repository context and feedback guidance into a prompt
+
+        Args:
+            needed: Number of issues to generate
+            open_issues: List of current open issues
+
+        Returns:
+            str: Prompt for Claude
+        """
         # Get repository context with retry
         logger.info("Analyzing repository for potential issues...")
 
+        # README and commits are independent round-trips, so fetch them together
         try:
-            readme = get_readme(self.repo, max_length=1000)
-            recent_commits = get_recent_commits(self.repo, max_commits=5)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                readme_future = executor.submit(get_readme, self.repo, max_length=1000)
+                commits_future = executor.submit(get_recent_commits, self.repo, max_commits=5)
+                readme = readme_future.result()
+                recent_commits = commits_future.result()
         except Exception as e:
             raise get_exception_for_github_error(e, "Failed to fetch repository context")
 
@@ -194,19 +275,13 @@ class IssueGenerator:
 
         logger.debug(f"Prompt length: {len(prompt)} chars")
 
-        # Call Claude AI
-        response_text = self._call_claude(prompt)
-
-        if not response_text:
-            raise AgentResponseError("Failed to get response from Claude")
-
-        # Parse and create issues (with deduplication)
-        self._parse_and_create_issues(response_text, needed, open_issues)
+        return prompt
 
     def _build_prompt(
         self, needed: int, readme: str, commit_messages: str, open_issues: List, project_brief: str = "", guidance = None
     ) -> str:
         """Build the prompt for Claude with adaptive guidance"""
+        open_issue_lines = "\n".join(f"- #{i.number}: {i.title}" for i in open_issues[:10])
         base_prompt = f"""Analyze this GitHub repository and suggest {needed} new issue(s).
 
 Repository: {self.repo.full_name}
@@ -218,7 +293,7 @@ Recent commits:
 {commit_messages}
 
 Current open issues:
-{chr(10).join([f"- #{i.number}: {i.title}" for i in open_issues[:10]])}
+{open_issue_lines}
 
 Project Context:
 {project_brief}
@@ -232,24 +307,7 @@ Read the whole project and find the most important thing for it - from new featu
 
 {guidance.prompt_adjustments}"""
 
-        base_prompt += """
-
-Respond with ONLY a JSON object in this exact format:
-{{
-  "issues": [
-    {{
-      "title": "Brief title (max 80 chars)",
-      "body": "Description (max 300 chars)",
-      "labels": ["feature"]
-    }}
-  ]
-}}
-
-Use appropriate labels: feature, bug, documentation, refactor, test, performance, security, ci/cd
-
-Keep descriptions brief and output ONLY the JSON, nothing else."""
-
-        return base_prompt
+        return base_prompt + _STATIC_SUFFIX
 
     def _call_claude(self, prompt: str) -> Optional[str]:
         """Call Claude AI (CLI or API)"""
@@ -269,7 +327,7 @@ Keep descriptions brief and output ONLY the JSON, nothing else."""
                     return str(result)
             else:
                 logger.info("Using Anthropic API for issue generation")
-                return call_anthropic_api(
+                return stream_anthropic_json(
                     api_key=self.anthropic_api_key,
                     prompt=prompt,
                     model=CLAUDE_MODELS.ISSUE_GENERATION,
@@ -281,38 +339,46 @@ Keep descriptions brief and output ONLY the JSON, nothing else."""
             logger.exception("Error calling Claude API")
             raise get_exception_for_anthropic_error(e, "Failed to call Claude API")
 
-    def _parse_and_create_issues(self, response_text: str, needed: int, open_issues: List) -> None:
-        """Parse Claude response and create GitHub issues after deduplication check"""
-        try:
-            logger.info("Parsing Claude response...")
+    @staticmethod
+    def _extract_json(response_text: str) -> Dict:
+        """
+        Pull the JSON object out of a Claude response
 
-            # Clean up response - remove markdown code blocks if present
-            cleaned_response = response_text.strip()
-            if "```json" in cleaned_response:
-                cleaned_response = (
-                    cleaned_response.split("```json")[1].split("```")[0].strip()
-                )
-                logger.debug("Removed ```json``` markers")
-            elif "```" in cleaned_response:
-                cleaned_response = (
-                    cleaned_response.split("```")[1].split("```")[0].strip()
-                )
-                logger.debug("Removed ``` markers")
+        A fenced block is preferred. Otherwise each `{` is tried in turn and
+        the first one that starts a valid object wins, so braces in leading
+        prose (e.g. "{json}") are skipped.
 
-            # Find JSON object in response
-            start_idx = cleaned_response.find("{")
-            end_idx = cleaned_response.rfind("}") + 1
+        Raises:
+            JSONParseError: If no JSON object can be decoded
+        """
+        match = _JSON_FENCE_RE.search(response_text)
+        if match:
+            try:
+                return json_helpers.loads(match.group(1))
+            except json.JSONDecodeError:
+                pass
 
-            if start_idx == -1 or end_idx == 0:
-                raise JSONParseError(response_text, "No JSON object found in response")
+        decoder = json.JSONDecoder()
+        start_idx = response_text.find("{")
+        while start_idx != -1:
+            try:
+                data, _ = decoder.raw_decode(response_text, start_idx)
+            except json.JSONDecodeError:
+                start_idx = response_text.find("{", start_idx + 1)
+                continue
+            if isinstance(data, dict):
+                return data
+            start_idx = response_text.find("{", start_idx + 1)
 
-            json_str = cleaned_response[start_idx:end_idx]
-            logger.debug(f"Extracted JSON: {len(json_str)} chars")
+        raise JSONParseError(response_text, "No JSON object found in response")
 
-            try:
-                data = json.loads(json_str)
-            except json.JSONDecodeError as e:
-                raise JSONParseError(json_str, str(e))
+    def _parse_and_create_issues(self, response_text: str, needed: int, open_issues: List) -> None:
+        """Parse Claude response and create GitHub issues after deduplication check"""
+        try:
+            logger.info("Parsing Claude response...")
+
+            # Find JSON object in response, inside markdown code blocks if present
+            data = self._extract_json(response_text)
 
             issues_to_create = data.get("issues", [])[:needed]
 
@@ -343,6 +409,7 @@ Keep descriptions brief and output ONLY the JSON, nothing else."""
 
             # Create issues with retry
             created_count = 0
+            pending = []
             for issue_data in unique_issues:
                 title = issue_data.get("title", "Untitled Issue")[
                     :80
@@ -356,23 +423,43 @@ Keep descriptions brief and output ONLY the JSON, nothing else."""
                     logger.info(f"DRY MODE: Would create issue: {title}", extra={"labels": labels})
                     created_count += 1
                 else:
-                    try:
-                        new_issue = create_issue(self.repo, title=title, body=full_body, labels=labels)
+                    pending.append((title, full_body, labels))
+
+            # A failed create is raised only after the issues that did get
+            # created are counted and recorded with the rate limiter
+            failed_count = 0
+            create_error = None
+            if pending:
+                # Each create is its own retried POST; a few workers overlap them
+                # without tripping GitHub's secondary rate limit
+                with ThreadPoolExecutor(max_workers=min(4, len(pending))) as executor:
+                    futures = {
+                        executor.submit(create_issue, self.repo, title=title, body=full_body, labels=labels): title
+                        for title, full_body, labels in pending
+                    }
+
+                    for future in as_completed(futures):
+                        title = futures[future]
+                        try:
+                            new_issue = future.result()
+                        except Exception as e:
+                            logger.error(f"Failed to create issue '{title}': {e}")
+                            failed_count += 1
+                            if create_error is None:
+                                create_error = get_exception_for_github_error(e, f"Failed to create issue '{title}'")
+                            continue
                         created_count += 1
                         logger.info(f"Created issue #{new_issue.number}: {title}")
-                    except Exception as e:
-                        logger.error(f"Failed to create issue '{title}': {e}")
-                        raise get_exception_for_github_error(e, f"Failed to create issue '{title}'")
 
-            # Calculate quality rejections (proposed - created - duplicates)
-            quality_rejected = len(issues_to_create) - created_count - len(duplicates)
+            # Calculate quality rejections (proposed - created - failed - duplicates)
+            quality_rejected = len(issues_to_create) - created_count - failed_count - len(duplicates)
 
             # Report final statistics
             logger.info("Deduplication Summary", extra={
                 "proposed": len(issues_to_create),
                 "duplicates_filtered": len(duplicates),
                 "quality_rejected": quality_rejected,
-                "created": created_count,
+                "issues_created": created_count,
                 "spam_reduction_pct": (len(duplicates) / len(issues_to_create) * 100) if len(issues_to_create) > 0 else 0
             })
 
@@ -385,6 +472,9 @@ Keep descriptions brief and output ONLY the JSON, nothing else."""
                     quality_rejected=quality_rejected
                 )
 
+            if create_error is not None:
+                raise create_error
+
             if self.dry_mode:
                 logger.info(f"DRY MODE: Would have generated {created_count} unique issue(s)")
             else:
@@ -399,3 +489,139 @@ Keep descriptions brief and output ONLY the JSON, nothing else."""
         except Exception as e:
             logger.exception("Error creating issues")
             raise
+
+
+class IssueGeneratorBatch:
+    """
+    Generates issues for several repositories with one Message Batches API call
+
+    Each repository is checked and its prompt built as usual, then all
+    prompts are submitted together. Batched requests cost half as much as
+    synchronous calls, at the price of waiting for the batch to finish, so
+    this suits scheduled non-interactive runs. Always uses the Anthropic API.
+
+    Repository checks and issue creation run on a thread pool, so those
+    phases take about as long as the slowest repository rather than the
+    sum. Give each generator its own rate_limit_state_path, since the
+    shared default state file is not safe to write from several threads.
+    """
+
+    def __init__(
+        self,
+        generators: List[IssueGenerator],
+        anthropic_api_key: str,
+        poll_interval: float = 30.0,
+        max_wait_seconds: int = 3600,
+        max_workers: int = 4,
+    ):
+        """
+        Initialize the batch coordinator
+
+        Args:
+            generators: One IssueGenerator per repository
+            anthropic_api_key: Anthropic API key
+            poll_interval: Seconds between batch status checks
+            max_wait_seconds: Maximum time to wait for the batch to finish
+            max_workers: Repositories checked or updated at once
+        """
+        if not anthropic_api_key:
+            raise MissingEnvironmentVariableError("ANTHROPIC_API_KEY")
+
+        self.generators = generators
+        self.anthropic_api_key = anthropic_api_key
+        self.poll_interval = poll_interval
+        self.max_wait_seconds = max_wait_seconds
+        self.max_workers = max_workers
+
+    def run(self) -> int:
+        """
+        Check every repository and generate issues where needed
+
+        Returns:
+            int: Number of repositories issues were generated for
+
+        A repository that fails its check or issue creation doesn't stop the
+        others; the first failure is raised once every repository has run.
+        """
+        # custom_id must match [A-Za-z0-9_-]{1,64}, so repo names can't be used directly
+        pending: Dict[str, Tuple[IssueGenerator, int, List]] = {}
+        prompts: Dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            plans = list(executor.map(self._plan, self.generators))
+
+        # A repository whose check failed is left out of the batch; its error
+        # is raised once the others have been attempted
+        plan_error = None
+        for index, (generator, (needed, open_issues, prompt, error)) in enumerate(zip(self.generators, plans)):
+            if error is not None:
+                plan_error = plan_error or error
+                continue
+            if not needed:
+                continue
+            custom_id = f"repo-{index}"
+            prompts[custom_id] = prompt
+            pending[custom_id] = (generator, needed, open_issues)
+
+        if not prompts:
+            logger.info("No repositories need new issues")
+            if plan_error is not None:
+                raise plan_error
+            return 0
+
+        logger.info(f"Submitting issue generation for {len(prompts)} repositories as one batch")
+        try:
+            batch_id = submit_message_batch(
+                api_key=self.anthropic_api_key,
+                prompts=prompts,
+                model=CLAUDE_MODELS.ISSUE_GENERATION,
+                max_tokens=CLAUDE_MODELS.DEFAULT_MAX_TOKENS,
+                system_prompt=SystemPrompts.ISSUE_GENERATOR,
+            )
+            responses = get_message_batch_results(
+                api_key=self.anthropic_api_key,
+                batch_id=batch_id,
+                poll_interval=self.poll_interval,
+                max_wait_seconds=self.max_wait_seconds,
+            )
+        except Exception as e:
+            logger.exception("Error running issue generation batch")
+            raise get_exception_for_anthropic_error(e, "Failed to run issue generation batch")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for custom_id, (generator, needed, open_issues) in pending.items():
+                response_text = responses.get(custom_id)
+                if not response_text:
+                    logger.error(f"No batch response for {generator.repo.full_name} - skipping")
+                    continue
+                futures.append(executor.submit(
+                    generator._parse_and_create_issues, response_text, needed, open_issues
+                ))
+
+        # Every repository has been attempted; surface the first failure, if any
+        if plan_error is not None:
+            raise plan_error
+        for future in futures:
+            future.result()
+
+        return len(futures)
+
+    @staticmethod
+    def _plan(generator: IssueGenerator) -> Tuple[int, List, Optional[str], Optional[Exception]]:
+        """
+        Check one repository and build its prompt if issues are needed
+
+        Returns:
+            Tuple of (issues needed, open issues, prompt, error); on failure
+            the error is returned instead of raised so other repositories
+            still run
+        """
+        try:
+            needed, open_issues = generator._count_needed()
+            if not needed:
+                return 0, open_issues, None, None
+            return needed, open_issues, generator._prepare_prompt(needed, open_issues), None
+        except Exception as e:
+            logger.error(f"Failed to check {generator.repo.full_name} - skipping it in this batch: {e}")
+            return 0, [], None, e
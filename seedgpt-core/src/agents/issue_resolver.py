@@ -5,9 +5,14 @@ Issue Resolver Agent - Core Logic
 Takes an open issue, analyzes it with Claude AI using Agent SDK, implements a fix, and creates a PR
 """
 
+import hashlib
+import io
+import re
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Optional, List, Tuple
 
@@ -30,6 +35,7 @@ from utils.exceptions import (
     PushError,
     PRCreationError,
     AgentError,
+    AgentTimeoutError,
     AgentResponseError,
     ValidationError,
     get_exception_for_github_error,
@@ -39,6 +45,18 @@ from utils.exceptions import (
 # Initialize logger
 logger = get_logger(__name__)
 
+# The pull request description the agent is asked to emit with its fix
+_PR_BODY_RE = re.compile(r"<PR_BODY>(.*?)</PR_BODY>", re.DOTALL)
+# A file path in an issue body, e.g. "src/utils/retry.py"
+_FILE_PATH_RE = re.compile(r'[\w/]+\.(py|md|ts|js|yaml)\b')
+
+# Issues about these topics are exempt from PROJECT_BRIEF.md validation
+_SKIP_VALIDATION_RE = re.compile(
+    r"project[_ ]brief|template|example|documentation|readme|setup|initial|bootstrap",
+    re.IGNORECASE,
+)
+_SKIP_VALIDATION_LABELS = frozenset({"documentation", "setup", "template"})
+
 # Import Claude CLI Agent
 try:
     from claude_cli_agent import ClaudeAgent
@@ -46,7 +64,6 @@ try:
     logger.info("✅ Claude CLI Agent imported successfully")
 except ImportError as e:
     logger.warning(f"⚠️  claude_cli_agent not available: {e}, falling back to anthropic SDK")
-    from anthropic import Anthropic
     USE_CLAUDE_CLI = False
 
 # Import model configuration
@@ -56,10 +73,17 @@ from models_config import CLAUDE_MODELS
 from utils.project_brief_validator import validate_project_brief, get_project_brief
 from utils.retry import retry_github_api
 from utils.outcome_tracker import OutcomeTracker, ResolutionStatus
-from utils.github_helpers import get_readme, get_open_issues_sorted, get_issue, create_pull_request, get_open_pull_requests_count
+from utils.github_helpers import (
+    get_readme,
+    search_open_issues,
+    get_issue,
+    create_pull_request,
+    get_open_pull_requests_count,
+    get_label_node_ids,
+    comment_and_label_issue,
+)
 from utils.git_helpers import (
     create_branch,
-    is_repo_dirty,
     get_all_changed_files,
     commit_changes,
     push_branch,
@@ -70,6 +94,21 @@ from utils.git_helpers import (
 class IssueResolver:
     """Resolves GitHub issues using AI and creates pull requests"""
 
+    # Added when claiming an issue and always skipped during selection
+    CLAIM_LABEL = "agent-claimed"
+
+    # Fixed so the CLI's tool definitions (and its prompt cache) stay identical
+    CLI_ALLOWED_TOOLS = ("Read", "Write", "Bash")
+
+    # Below this many seconds of the max_time budget, no fix is attempted
+    MIN_FIX_TIME = 60
+
+    # Issues examined before giving up; with per_page=100 this is one page
+    MAX_CANDIDATES = 50
+
+    # Shared by every resolver in the process; see _get_cli_agent
+    _cli_agent = None
+
     def __init__(
         self,
         repo,
@@ -88,7 +127,8 @@ class IssueResolver:
             git_repo: GitPython Repo object
             anthropic_api_key: Anthropic API key (required if not using Claude CLI)
             labels_to_handle: List of labels to handle (empty list = handle all types)
-            labels_to_skip: List of labels to skip (default: wontfix, duplicate, in-progress)
+            labels_to_skip: List of labels to skip (default: wontfix, duplicate, in-progress);
+                CLAIM_LABEL is always skipped as well
             max_time: Maximum execution time in seconds
             dry_mode: If True, skip all GitHub write operations (for CI validation)
         """
@@ -97,10 +137,19 @@ class IssueResolver:
         self.anthropic_api_key = anthropic_api_key
         # Empty list means handle all issue types, None defaults to ["bug", "enhancement"]
         self.labels_to_handle = labels_to_handle if labels_to_handle is not None else ["bug", "enhancement"]
-        self.labels_to_skip = labels_to_skip or ["wontfix", "duplicate", "in-progress", "qa-report"]
+        self.labels_to_skip = list(labels_to_skip or ["wontfix", "duplicate", "in-progress", "qa-report"])
+        if self.CLAIM_LABEL not in self.labels_to_skip:
+            self.labels_to_skip.append(self.CLAIM_LABEL)
+        self._handle_set = frozenset(self.labels_to_handle)
+        self._skip_set = frozenset(self.labels_to_skip)
         self.max_time = max_time
         self.dry_mode = dry_mode
         self.start_time = time.time()
+        self._anthropic = None
+
+        # Overlaps independent GitHub requests (claim comment/label, README
+        # prefetch); only set while resolve_issue() runs
+        self._executor: Optional[ThreadPoolExecutor] = None
 
         # Initialize outcome tracker for feedback loop
         self.outcome_tracker = OutcomeTracker()
@@ -123,6 +172,16 @@ class IssueResolver:
         Returns:
             bool: True if issue was resolved, False otherwise
         """
+        # Shut down with the call so no worker threads outlive it
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self._executor = executor
+            try:
+                return self._resolve_issue(specific_issue)
+            finally:
+                self._executor = None
+
+    def _resolve_issue(self, specific_issue: Optional[int]) -> bool:
+        """Run the resolution workflow on the executor set up by resolve_issue"""
         logger.info("=" * 80)
         logger.info("STARTING ISSUE RESOLUTION WORKFLOW")
         logger.info("=" * 80)
@@ -150,13 +209,25 @@ class IssueResolver:
             logger.info("=" * 80)
             return False
 
+        # The only read of selected_issue.labels; everything downstream uses issue_labels
+        issue_labels = [label.name for label in selected_issue.labels]
+
         logger.info(f"ISSUE SELECTED: #{selected_issue.number}")
         logger.info(f"Title: {selected_issue.title}")
-        logger.info(f"Labels: {[label.name for label in selected_issue.labels]}")
+        logger.info(f"Labels: {issue_labels}")
         logger.info(f"Created: {selected_issue.created_at}")
 
+        if self._remaining_time() < self.MIN_FIX_TIME:
+            logger.warning(
+                f"WORKFLOW ABORTED: Only {self._remaining_time():.0f}s of the {self.max_time}s budget left"
+            )
+            logger.info("=" * 80)
+            return False
+
+        # README is only needed for the prompt; fetch it while the issue is claimed
+        readme_future = self._executor.submit(get_readme, self.repo, max_length=2000)
+
         # Record attempt in outcome tracker
-        issue_labels = [label.name for label in selected_issue.labels]
         if not self.dry_mode:
             self.outcome_tracker.record_attempt(
                 issue_number=selected_issue.number,
@@ -171,7 +242,6 @@ class IssueResolver:
 
         # Get issue details for validation check
         issue_body = selected_issue.body or "No description provided"
-        issue_labels = [label.name for label in selected_issue.labels]
 
         # Validate PROJECT_BRIEF.md before proceeding
         is_valid, validation_msg = self._validate_project_brief_if_exists(
@@ -208,14 +278,18 @@ class IssueResolver:
                 logger.debug("DRY MODE: Would post validation success comment")
 
         # Create branch
-        branch_name = f"fix/issue-{selected_issue.number}-{int(time.time())}"
+        # Suffix from the issue's state, so the name is stable for an unchanged issue
+        state_hash = hashlib.blake2b(
+            f"{selected_issue.number}-{selected_issue.updated_at.isoformat()}".encode(), digest_size=4
+        ).hexdigest()
+        branch_name = f"fix/issue-{selected_issue.number}-{state_hash}"
         if not self._create_branch(branch_name, selected_issue, issue_claimed):
             return False
 
         # Generate fix using Claude
-        summary = self._generate_fix(selected_issue, issue_body, issue_labels)
+        fix = self._generate_fix(selected_issue, issue_body, issue_labels, readme_future)
 
-        if summary is None:
+        if fix is None:
             if issue_claimed and not self.dry_mode:
                 try:
                     selected_issue.create_comment("Failed to generate fix")
@@ -234,7 +308,8 @@ class IssueResolver:
             return False
 
         # Check if files were modified and create PR
-        return self._create_pr_if_changes(selected_issue, branch_name, summary)
+        summary, pr_description = fix
+        return self._create_pr_if_changes(selected_issue, branch_name, summary, pr_description)
 
     def _select_issue(self, specific_issue: Optional[int]) -> Optional[object]:
         """Select an issue to work on"""
@@ -257,15 +332,27 @@ class IssueResolver:
         logger.info("Mode: Searching for suitable issue")
         logger.info(f"Criteria: state=open, labels_to_handle={self.labels_to_handle}, labels_to_skip={self.labels_to_skip}")
 
+        # Label filters run server-side; the checks below stay as a guard against
+        # search index lag on recently relabelled issues
         try:
-            open_issues = get_open_issues_sorted(self.repo, sort="created", direction="asc")
+            open_issues = search_open_issues(
+                self.repo,
+                labels_any=self.labels_to_handle,
+                labels_excluded=self.labels_to_skip,
+                sort="created",
+                direction="asc",
+            )
         except Exception as e:
             github_error = get_exception_for_github_error(e, "Failed to get open issues")
             logger.exception(f"Failed to get open issues: {github_error}")
             raise github_error
 
         issues_checked = 0
-        for issue in open_issues:
+        for issue in islice(open_issues, self.MAX_CANDIDATES):
+            if self._remaining_time() < self.MIN_FIX_TIME:
+                logger.warning("Stopping issue search: not enough time left to fix an issue")
+                break
+
             issues_checked += 1
 
             if issue.pull_request:
@@ -273,32 +360,17 @@ class IssueResolver:
                 continue
 
             issue_labels = [label.name for label in issue.labels]
+            label_set = set(issue_labels)
 
-            if any(skip_label in issue_labels for skip_label in self.labels_to_skip):
-                skip_label_found = [l for l in issue_labels if l in self.labels_to_skip]
-                logger.debug(f"Skipping #{issue.number}: Has skip label {skip_label_found}")
+            skip_label_found = label_set & self._skip_set
+            if skip_label_found:
+                logger.debug(f"Skipping #{issue.number}: Has skip label {sorted(skip_label_found)}")
                 continue
 
-            if self.labels_to_handle and not any(
-                handle_label in issue_labels for handle_label in self.labels_to_handle
-            ):
+            if self._handle_set and label_set.isdisjoint(self._handle_set):
                 logger.debug(f"Skipping #{issue.number}: No matching labels (has: {issue_labels})")
                 continue
 
-            try:
-                comments = list(issue.get_comments())
-            except Exception as e:
-                github_error = get_exception_for_github_error(e, f"Failed to get comments for issue #{issue.number}")
-                logger.warning(f"Failed to get comments for issue #{issue.number}: {github_error}")
-                continue
-
-            if any(
-                "Issue Resolver Agent" in c.body and "claimed" in c.body.lower()
-                for c in comments
-            ):
-                logger.debug(f"Skipping #{issue.number}: Already claimed by agent")
-                continue
-
             logger.info(f"SELECTED: Issue #{issue.number}")
             logger.info(f"Title: {issue.title}")
             logger.info(f"Labels: {issue_labels}")
@@ -314,43 +386,66 @@ class IssueResolver:
         logger.info("STEP 2: CLAIMING ISSUE")
         logger.info("-" * 80)
 
-        claim_message = f"""**Issue Resolver Agent**
+        claim_message = """**Issue Resolver Agent**
 
 I'm working on this issue now.
 
-**Started at:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
 **Status:** In Progress
 
 ---
 *Automated by GitHub Actions*"""
 
         if self.dry_mode:
-            logger.debug("DRY MODE: Would add 'in-progress' label")
+            logger.debug(f"DRY MODE: Would add 'in-progress' and '{self.CLAIM_LABEL}' labels")
             logger.debug("DRY MODE: Would post claim comment to issue")
             return True
 
+        claim_labels = ["in-progress", self.CLAIM_LABEL]
+        try:
+            label_ids = get_label_node_ids(self.repo, claim_labels)
+        except Exception as e:
+            # The REST endpoint creates missing labels; GraphQL needs them to exist
+            logger.debug(f"Claim labels not resolvable ({e}), claiming over REST")
+            return self._claim_issue_rest(issue, claim_message, claim_labels)
+
+        try:
+            comment_and_label_issue(issue, claim_message, label_ids)
+        except Exception as e:
+            github_error = get_exception_for_github_error(e, "Failed to claim issue")
+            logger.exception(f"Failed to claim issue: {github_error}")
+            raise github_error
+
+        logger.info(f"Posted claim comment and added 'in-progress' and '{self.CLAIM_LABEL}' labels")
+        return True
+
+    def _claim_issue_rest(self, issue, claim_message: str, claim_labels: List[str]) -> bool:
+        """Claim an issue with separate (concurrent) REST comment and label requests"""
         @retry_github_api
         def create_comment():
             return issue.create_comment(claim_message)
 
         @retry_github_api
         def add_label():
-            return issue.add_to_labels("in-progress")
+            return issue.add_to_labels(*claim_labels)
+
+        comment_future = self._executor.submit(create_comment)
+        label_future = self._executor.submit(add_label)
 
         try:
-            create_comment()
+            comment_future.result()
             logger.info("Posted claim comment to issue")
         except Exception as e:
+            label_future.exception()  # wait for the label request before raising
             github_error = get_exception_for_github_error(e, "Failed to post claim comment")
             logger.exception(f"Failed to post claim comment: {github_error}")
             raise github_error
 
         try:
-            add_label()
-            logger.info("Added 'in-progress' label")
+            label_future.result()
+            logger.info(f"Added 'in-progress' and '{self.CLAIM_LABEL}' labels")
         except Exception as e:
-            github_error = get_exception_for_github_error(e, "Failed to add in-progress label")
-            logger.warning(f"Failed to add in-progress label: {github_error}")
+            github_error = get_exception_for_github_error(e, "Failed to add claim labels")
+            logger.warning(f"Failed to add claim labels: {github_error}")
             # Don't raise here - claiming without label is acceptable
 
         return True
@@ -359,27 +454,10 @@ I'm working on this issue now.
         self, issue_title: str, issue_body: str, issue_labels: List[str]
     ) -> bool:
         """Determine if PROJECT_BRIEF.md validation should be skipped"""
-        skip_keywords = [
-            "project_brief",
-            "project brief",
-            "template",
-            "example",
-            "documentation",
-            "readme",
-            "setup",
-            "initial",
-            "bootstrap",
-        ]
-
-        text_to_check = f"{issue_title} {issue_body}".lower()
-        if any(keyword in text_to_check for keyword in skip_keywords):
+        if _SKIP_VALIDATION_RE.search(issue_title) or _SKIP_VALIDATION_RE.search(issue_body):
             return True
 
-        skip_labels = ["documentation", "setup", "template"]
-        if any(label in skip_labels for label in issue_labels):
-            return True
-
-        return False
+        return not _SKIP_VALIDATION_LABELS.isdisjoint(issue_labels)
 
     def _validate_project_brief_if_exists(
         self,
@@ -461,17 +539,78 @@ I'm working on this issue now.
                 logger.debug("DRY MODE: Would post branch creation failure comment")
             return False
 
+    def _remaining_time(self) -> float:
+        """Seconds left of the max_time budget (negative once it is exceeded)"""
+        return self.max_time - (time.time() - self.start_time)
+
+    @classmethod
+    def _get_cli_agent(cls):
+        """Claude CLI agent, created once per process and reused across issues"""
+        if cls._cli_agent is None:
+            # require_cli=False only checks availability
+            cls._cli_agent = ClaudeAgent(
+                output_format="text",
+                verbose=True,
+                allowed_tools=cls.CLI_ALLOWED_TOOLS,
+                permission_mode="acceptEdits",
+                require_cli=False,
+            )
+        return cls._cli_agent
+
+    @property
+    def _anthropic_client(self):
+        """Anthropic SDK client, imported and created on first use"""
+        if self._anthropic is None:
+            # Deferred so CLI-only runs never load the SDK
+            from anthropic import Anthropic
+            self._anthropic = Anthropic(api_key=self.anthropic_api_key)
+        return self._anthropic
+
+    @staticmethod
+    def _log_output(summary: str, max_lines: int = 50) -> None:
+        """Log the first lines of Claude's output without splitting all of it"""
+        logger.info("CLAUDE OUTPUT:")
+        logger.info("-" * 76)
+        for line in islice(io.StringIO(summary), max_lines):
+            logger.info(line.rstrip("\n"))
+        remaining_lines = summary.count("\n") + 1 - max_lines
+        if remaining_lines > 0:
+            logger.info(f"... ({remaining_lines} more lines)")
+        logger.info("-" * 76)
+
+    @staticmethod
+    def _readme_context(readme: str, issue_body: str) -> str:
+        """
+        Trim the README to what is useful for this issue
+
+        Issues that already name the files involved get no README; otherwise
+        only the introduction before the first "## " section is kept.
+        """
+        if _FILE_PATH_RE.search(issue_body):
+            logger.info("Issue references specific files - omitting README context")
+            return "Omitted (the issue references the files involved)"
+        return readme.partition("\n## ")[0]
+
     def _generate_fix(
-        self, issue, issue_body: str, issue_labels: List[str]
-    ) -> Optional[str]:
-        """Generate a fix using Claude AI"""
+        self, issue, issue_body: str, issue_labels: List[str], readme_future: Optional[Future] = None
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Generate a fix using Claude AI, using a prefetched README if given
+
+        Returns (summary, pr_body), where pr_body is the <PR_BODY> block the
+        agent wrote while it still had the full context (None if absent), or
+        None if no fix could be generated.
+        """
         logger.info("-" * 80)
         logger.info("STEP 5: GENERATING FIX WITH CLAUDE AI")
         logger.info("-" * 80)
 
         # Get context with retry
         try:
-            readme = get_readme(self.repo, max_length=2000)
+            if readme_future is not None:
+                readme = readme_future.result()
+            else:
+                readme = get_readme(self.repo, max_length=2000)
             if readme == "No README found":
                 logger.warning("No README found")
             else:
@@ -481,30 +620,38 @@ I'm working on this issue now.
             github_error = get_exception_for_github_error(e, "Failed to load README")
             logger.warning(f"Failed to load README: {github_error}")
 
+        readme = self._readme_context(readme, issue_body)
+
         project_brief = get_project_brief()
         if not project_brief:
             logger.warning("No PROJECT_BRIEF.md found")
         else:
             logger.info("Loaded PROJECT_BRIEF.md context")
         
-        # Build prompt for Claude CLI
+        # Build prompt for Claude CLI. Static instructions and repository
+        # context come first so the prefix is shared across issues; the issue
+        # itself goes last.
         cli_prompt = f"""You are an expert software engineer. 
-Fix this GitHub issue by modifying the necessary files.
+Fix the GitHub issue in the TASK section by modifying the necessary files.
 Save your tokens and don't write documents unless asked. 
+After making changes, output exactly one block delimited by <PR_BODY>...</PR_BODY>
+containing a crisp pull request description (1-3 paragraphs + bullet list of files changed).
 
 Repository: {self.repo.full_name}
-Issue #{issue.number}: {issue.title}
-
-Description:
-{issue_body}
-
-Labels: {', '.join(issue_labels)}
 
 Context from README:
 {readme}
 
 Project Context:
 {project_brief}
+
+--- TASK ---
+Issue #{issue.number}: {issue.title}
+
+Description:
+{issue_body}
+
+Labels: {', '.join(issue_labels)}
 """
 
         logger.debug(f"Prompt prepared ({len(cli_prompt)} chars)")
@@ -517,19 +664,12 @@ Project Context:
             logger.debug("Permission mode: acceptEdits")
 
             try:
-                # Try to initialize with require_cli=False to check availability
-                agent = ClaudeAgent(
-                    output_format="text",
-                    verbose=True,
-                    allowed_tools=["Read", "Write", "Bash"],
-                    permission_mode="acceptEdits",
-                    require_cli=False,
-                )
+                agent = self._get_cli_agent()
 
                 if agent.cli_available:
                     logger.info("Sending query to Claude CLI...")
                     logger.info("=" * 76)
-                    result = agent.query(cli_prompt, stream_output=True)
+                    result = agent.query(cli_prompt, stream_output=True, timeout=self._remaining_time())
                     logger.info("=" * 76)
 
                     # Extract the response
@@ -541,17 +681,18 @@ Project Context:
                     logger.info("Claude CLI completed work successfully")
                     logger.info(f"Response length: {len(summary)} chars")
 
-                    # Print the full output
-                    logger.info("CLAUDE OUTPUT:")
-                    logger.info("-" * 76)
-                    for line in summary.split('\n'):
-                        logger.info(line)
-                    logger.info("-" * 76)
+                    self._log_output(summary)
 
-                    return summary
+                    pr_body_match = _PR_BODY_RE.search(summary)
+                    pr_body = pr_body_match.group(1).strip() if pr_body_match else None
+                    return summary, pr_body
                 else:
                     logger.warning("Claude CLI not available, falling back to Anthropic SDK")
 
+            except AgentTimeoutError as e:
+                # No budget left for the API fallback either
+                logger.error(f"Claude CLI ran past the time budget: {e}")
+                return None
             except Exception as e:
                 agent_error = AgentError(f"Claude CLI error: {e}")
                 logger.warning(f"Claude CLI error: {agent_error}")
@@ -564,40 +705,53 @@ Project Context:
             logger.error("No Anthropic API key provided")
             return None
 
+        if self._remaining_time() < self.MIN_FIX_TIME:
+            logger.error("Not enough time left for the Anthropic SDK fallback")
+            return None
+
         try:
-            client = Anthropic(api_key=self.anthropic_api_key)
+            client = self._anthropic_client
 
-            # Build a simpler prompt for API (no tool use)
-            api_prompt = f"""You are an expert software engineer. Analyze this GitHub issue and provide a detailed solution.
+            # Build a simpler prompt for API (no tool use). Instructions and
+            # repository context are the same for every issue in a run, so they
+            # form a cached system prefix; only the issue goes in the message.
+            api_system = [{
+                "type": "text",
+                "text": f"""You are an expert software engineer. Analyze GitHub issues and provide a detailed solution.
 
-Repository: {self.repo.full_name}
-Issue #{issue.number}: {issue.title}
+For each issue, please provide:
+1. Analysis of the issue
+2. Detailed solution approach
+3. Specific code changes needed (with file paths and code snippets)
+4. Testing recommendations
 
-Description:
-{issue_body}
+Format your response clearly with sections.
 
-Labels: {', '.join(issue_labels)}
+Repository: {self.repo.full_name}
 
 Context from README:
 {readme}
 
 Project Context:
-{project_brief}
+{project_brief}""",
+                "cache_control": {"type": "ephemeral"},
+            }]
 
-Please provide:
-1. Analysis of the issue
-2. Detailed solution approach
-3. Specific code changes needed (with file paths and code snippets)
-4. Testing recommendations
+            api_prompt = f"""Issue #{issue.number}: {issue.title}
 
-Format your response clearly with sections."""
+Description:
+{issue_body}
+
+Labels: {', '.join(issue_labels)}"""
 
             logger.info("Sending query to Claude API...")
 
             response = client.messages.create(
                 model=CLAUDE_MODELS.ISSUE_RESOLUTION,
                 max_tokens=CLAUDE_MODELS.WORKFLOW_MAX_TOKENS,
-                messages=[{"role": "user", "content": api_prompt}]
+                system=api_system,
+                messages=[{"role": "user", "content": api_prompt}],
+                timeout=self._remaining_time(),
             )
 
             summary = response.content[0].text
@@ -605,34 +759,28 @@ Format your response clearly with sections."""
             logger.info("Claude API completed successfully")
             logger.info(f"Response length: {len(summary)} chars")
 
-            # Print the output
-            logger.info("CLAUDE OUTPUT:")
-            logger.info("-" * 76)
-            summary_lines = summary.split('\n')
-            for line in summary_lines[:50]:  # Limit output
-                logger.info(line)
-            if len(summary_lines) > 50:
-                remaining_lines = len(summary_lines) - 50
-                logger.info(f"... ({remaining_lines} more lines)")
-            logger.info("-" * 76)
+            self._log_output(summary)
 
             logger.warning("Note: API mode provides guidance only")
             logger.info("Manual code changes may be needed based on the suggestions")
 
-            return summary
+            return summary, None
 
         except Exception as e:
             anthropic_error = get_exception_for_anthropic_error(e, "Anthropic SDK error")
             logger.exception(f"Anthropic SDK error: {anthropic_error}")
             return None
 
-    def _create_pr_if_changes(self, issue, branch_name: str, summary: str) -> bool:
-        """Create a PR if files were modified"""
+    def _create_pr_if_changes(
+        self, issue, branch_name: str, summary: str, pr_description: Optional[str] = None
+    ) -> bool:
+        """Create a PR if files were modified, described by pr_description when given"""
         logger.info("-" * 80)
         logger.info("STEP 6: COMMITTING CHANGES & CREATING PR")
         logger.info("-" * 80)
 
-        if not is_repo_dirty(self.git_repo, include_untracked=True):
+        files_modified = get_all_changed_files(self.git_repo)
+        if not files_modified:
             logger.warning("No files were modified")
             if not self.dry_mode:
                 try:
@@ -653,9 +801,6 @@ Format your response clearly with sections."""
                 logger.debug("DRY MODE: Would post no changes comment")
             return False
 
-        # Get list of changed files
-        files_modified = get_all_changed_files(self.git_repo)
-
         logger.info(f"Files modified: {len(files_modified)}")
         for f in files_modified:
             logger.info(f"- {f}")
@@ -691,7 +836,10 @@ Format your response clearly with sections."""
         # Push
         logger.info(f"Pushing branch '{branch_name}' to origin...")
         try:
-            push_branch(self.git_repo, branch_name, remote_name="origin")
+            remaining = self._remaining_time()
+            if remaining <= 0:
+                raise PushError(f"Time budget of {self.max_time}s exhausted before push")
+            push_branch(self.git_repo, branch_name, remote_name="origin", timeout=remaining)
         except PushError as error:
             logger.exception(f"Failed to push branch: {error}")
             raise error
@@ -699,7 +847,7 @@ Format your response clearly with sections."""
         # Create PR with retry
         logger.info("Creating Pull Request...")
         pr_title = f"Fix: {issue.title}"
-        pr_body = f"""{summary[:500]}
+        pr_body = f"""{pr_description or summary[:500]}
 
 ## Changes
 {chr(10).join(['- ' + f for f in files_modified[:20]])}
@@ -66,7 +66,6 @@ from utils.github_helpers import (
 )
 from utils.git_helpers import (
     checkout_branch,
-    is_repo_dirty,
     get_all_changed_files,
     commit_changes,
     push_branch,
@@ -246,7 +245,7 @@ class PRFailureResolver:
                     logger.info(f"   🔴 MERGE CONFLICT DETECTED")
                 
                 # Check for failing check runs
-                checks = get_pr_checks(pr)
+                checks = get_pr_checks(pr, self.repo)
                 logger.info(f"   Check Runs: {len(checks)} total")
                 
                 failing_checks = []
@@ -366,7 +365,7 @@ The conflicts may be in one or more files that have been modified in both this b
 
         # Check for failing check runs
         try:
-            checks = get_pr_checks(pr)
+            checks = get_pr_checks(pr, self.repo)
         except Exception as e:
             github_error = get_exception_for_github_error(e, "Failed to get PR checks")
             logger.exception(f"Failed to get PR checks: {github_error}")
@@ -639,7 +638,8 @@ Format your response clearly with sections."""
         logger.info("STEP 6: COMMITTING & PUSHING CHANGES")
         logger.info("-" * 80)
 
-        if not is_repo_dirty(self.git_repo, include_untracked=True):
+        files_modified = get_all_changed_files(self.git_repo)
+        if not files_modified:
             logger.warning("No files were modified")
             if not self.dry_mode:
                 try:
@@ -660,9 +660,6 @@ Format your response clearly with sections."""
                 logger.debug("DRY MODE: Would post no changes comment")
             return False
 
-        # Get list of changed files
-        files_modified = get_all_changed_files(self.git_repo)
-
         logger.info(f"Files modified: {len(files_modified)}")
         for f in files_modified:
             logger.info(f"- {f}")
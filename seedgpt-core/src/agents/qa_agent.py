@@ -6,10 +6,15 @@ Monitors repository health by reviewing issues, PRs, and commits
 Reports problems by creating issues
 """
 
+import hashlib
 import json
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import Dict, List, Optional
 
 # Add src directory to path
@@ -21,9 +26,18 @@ from logging_config import get_logger
 
 # Import model configuration
 from models_config import CLAUDE_MODELS, SystemPrompts
-from utils.github_helpers import get_recent_commits, create_issue, get_recent_issues, get_repo_info
-from utils.anthropic_helpers import call_anthropic_api
-from utils.retry import retry_github_api
+from utils.github_helpers import (
+    get_recent_commits,
+    create_issue,
+    update_issue,
+    search_open_issues,
+    search_recent_issues,
+    get_recent_pull_requests,
+    get_recent_activity,
+    get_repo_info,
+)
+from utils.anthropic_helpers import stream_anthropic_json
+from utils import json_helpers
 
 # Import exception classes
 from utils.exceptions import (
@@ -57,9 +71,92 @@ except ImportError:
         raise
 
 
+# Prompt budget per issue description and per commit headline, in UTF-8
+# bytes (which track tokens more closely than characters)
+_ISSUE_BODY_BYTES = 200
+_COMMIT_MESSAGE_BYTES = 100
+
+_SCAN_DATE_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+
+# Problem categories that are also applied as issue labels
+_CATEGORY_LABELS = frozenset({"security", "code_quality", "process", "health"})
+
+# Hidden marker holding a report's status/summary hash
+_REPORT_KEY_MARKER = "<!-- qa-report-key: {} -->"
+
+# Report markers by overall QA status and by problem severity
+_STATUS_EMOJI = {"warning": "⚠️", "critical": "🔴"}
+_SEVERITY_EMOJI = {"low": "🟡", "medium": "🟠", "high": "🔴"}
+
+# Instructions and response schema that follow the repository activity
+_QA_TASK_SUFFIX = """
+
+## Your Task
+
+Analyze the above information and identify any problems or concerns:
+
+1. **Code Quality Issues**
+   - Are there PRs that should have been merged but weren't?
+   - Are there stale issues or PRs?
+   - Are commit messages clear and descriptive?
+
+2. **Process Issues**
+   - Are issues properly labeled?
+   - Are there duplicate issues?
+   - Are PRs being reviewed in a timely manner?
+
+3. **Project Health**
+   - Is the project progressing well?
+   - Are there any red flags?
+   - Are the AI agents working correctly?
+
+4. **Specific Problems**
+   - Any broken workflows?
+   - Any security concerns?
+   - Any performance issues mentioned?
+
+Respond in this EXACT JSON format:
+{
+  "status": "healthy" or "warning" or "critical",
+  "summary": "Brief overall assessment (max 200 chars)",
+  "problems": [
+    {
+      "severity": "low" or "medium" or "high",
+      "category": "code_quality" or "process" or "health" or "security",
+      "title": "Brief problem title (max 80 chars)",
+      "description": "Detailed description (max 300 chars)",
+      "recommendation": "What should be done (max 200 chars)"
+    }
+  ],
+  "positive_observations": [
+    "Things that are going well (max 150 chars each)"
+  ]
+}
+
+If everything looks good, return status "healthy" with empty problems array.
+Output ONLY the JSON, nothing else.
+"""
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """Cut text to at most max_bytes of UTF-8 without splitting a character"""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
+def _iso_timestamp(value: str) -> str:
+    """Normalize a GraphQL timestamp ("...Z") to the isoformat() of REST datetimes"""
+    return datetime.fromisoformat(value).isoformat()
+
+
 class QAAgent:
     """QA Agent for monitoring repository health"""
 
+    # An open report with identical findings this recent is updated, not duplicated
+    REPORT_REUSE_WINDOW = timedelta(hours=24)
+
     def __init__(
         self,
         repo,
@@ -67,6 +164,8 @@ class QAAgent:
         max_issues_to_review: int = 10,
         max_prs_to_review: int = 5,
         max_commits_to_review: int = 10,
+        cache_ttl: int = 3600,
+        cache_dir: Optional[Path] = None,
     ):
         """
         Initialize the QA Agent
@@ -77,12 +176,16 @@ class QAAgent:
             max_issues_to_review: Maximum number of issues to review
             max_prs_to_review: Maximum number of PRs to review
             max_commits_to_review: Maximum number of commits to review
+            cache_ttl: Seconds an analysis is reused for an identical prompt (0 disables)
+            cache_dir: Directory for cached analyses (defaults to .seedgpt/qa_cache)
         """
         self.repo = repo
         self.anthropic_api_key = anthropic_api_key
         self.max_issues = max_issues_to_review
         self.max_prs = max_prs_to_review
         self.max_commits = max_commits_to_review
+        self.cache_ttl = cache_ttl
+        self.cache_dir = cache_dir or Path.cwd() / ".seedgpt" / "qa_cache"
 
         logger.info("QA Agent Initialized")
         logger.info(
@@ -129,73 +232,30 @@ class QAAgent:
         """Gather context about recent repository activity"""
         logger.info("Gathering repository context...")
 
-        context = {"issues": [], "pull_requests": [], "commits": [], "repo_info": {}}
-
         try:
-            # Get repository info with retry
-            context["repo_info"] = get_repo_info(self.repo)
-
-            # Get recent issues with retry
-            logger.info(f"Reviewing {self.max_issues} recent issues...")
-            issues = get_recent_issues(
-                self.repo, 
-                max_issues=self.max_issues, 
-                state="all", 
-                sort="updated", 
-                direction="desc"
+            context = self._gather_repository_context_graphql()
+            logger.info(
+                f"Gathered context: {len(context['issues'])} issues, {len(context['pull_requests'])} PRs, {len(context['commits'])} commits"
             )
-            for issue in issues:
-                if issue.pull_request:
-                    continue
-                context["issues"].append(
-                    {
-                        "number": issue.number,
-                        "title": issue.title,
-                        "state": issue.state,
-                        "labels": [label.name for label in issue.labels],
-                        "created_at": issue.created_at.isoformat(),
-                        "updated_at": issue.updated_at.isoformat(),
-                        "body": (issue.body or "")[:500],
-                    }
-                )
+            return context
+        except Exception as e:
+            github_error = get_exception_for_github_error(e, "GraphQL context query failed")
+            logger.warning(f"GraphQL context query failed, falling back to REST: {github_error}")
 
-            # Get recent pull requests with retry
-            @retry_github_api
-            def get_prs():
-                return list(self.repo.get_pulls(state="all", sort="updated", direction="desc"))[
-                    : self.max_prs
-                ]
-
-            logger.info(f"Reviewing {self.max_prs} recent pull requests...")
-            prs = get_prs()
-            for pr in prs:
-                context["pull_requests"].append(
-                    {
-                        "number": pr.number,
-                        "title": pr.title,
-                        "state": pr.state,
-                        "merged": pr.merged,
-                        "created_at": pr.created_at.isoformat(),
-                        "updated_at": pr.updated_at.isoformat(),
-                        "additions": pr.additions,
-                        "deletions": pr.deletions,
-                        "changed_files": pr.changed_files,
-                    }
-                )
+        context = {"issues": [], "pull_requests": [], "commits": [], "repo_info": {}}
 
-            # Get recent commits with retry
-            logger.info(f"Reviewing {self.max_commits} recent commits...")
-            commits = get_recent_commits(self.repo, max_commits=self.max_commits)
-            for commit in commits:
-                context["commits"].append(
-                    {
-                        "sha": commit.sha[:8],
-                        "message": commit.commit.message.split("\n")[0][:100],
-                        "author": commit.commit.author.name,
-                        "date": commit.commit.author.date.isoformat(),
-                        "files_changed": len(list(commit.files)) if commit.files else 0,
-                    }
-                )
+        try:
+            # The listings are independent, so their round-trips overlap
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                repo_info_future = executor.submit(get_repo_info, self.repo)
+                issues_future = executor.submit(self._fetch_issues)
+                prs_future = executor.submit(self._fetch_pull_requests)
+                commits_future = executor.submit(self._fetch_commits)
+
+                context["repo_info"] = repo_info_future.result()
+                context["issues"] = issues_future.result()
+                context["pull_requests"] = prs_future.result()
+                context["commits"] = commits_future.result()
 
             logger.info(
                 f"Gathered context: {len(context['issues'])} issues, {len(context['pull_requests'])} PRs, {len(context['commits'])} commits"
@@ -207,9 +267,129 @@ class QAAgent:
             logger.error(f"Error gathering repository context: {github_error}", exc_info=True)
             raise github_error
 
+    def _gather_repository_context_graphql(self) -> Dict:
+        """Gather the same context as the REST listings with one GraphQL query"""
+        data = get_recent_activity(
+            self.repo,
+            max_issues=self.max_issues,
+            max_prs=self.max_prs,
+            max_commits=self.max_commits,
+        )
+
+        branch = data["defaultBranchRef"]
+        commits = branch["target"]["history"]["nodes"] if branch else []
+
+        return {
+            "repo_info": {
+                "name": data["name"],
+                "description": data["description"],
+                # REST's open_issues_count includes pull requests
+                "open_issues_count": data["openIssues"]["totalCount"] + data["openPullRequests"]["totalCount"],
+                "stargazers_count": data["stargazerCount"],
+                "language": (data["primaryLanguage"] or {}).get("name"),
+            },
+            "issues": [
+                {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "state": issue["state"].lower(),
+                    "labels": [label["name"] for label in issue["labels"]["nodes"]],
+                    "created_at": _iso_timestamp(issue["createdAt"]),
+                    "updated_at": _iso_timestamp(issue["updatedAt"]),
+                    "body": _truncate_utf8(issue["body"] or "", _ISSUE_BODY_BYTES),
+                }
+                for issue in data["issues"]["nodes"]
+            ],
+            "pull_requests": [
+                {
+                    "number": pr["number"],
+                    "title": pr["title"],
+                    # GraphQL's MERGED state is "closed" in REST
+                    "state": "open" if pr["state"] == "OPEN" else "closed",
+                    "merged": pr["merged"],
+                    "created_at": _iso_timestamp(pr["createdAt"]),
+                    "updated_at": _iso_timestamp(pr["updatedAt"]),
+                    "additions": pr["additions"],
+                    "deletions": pr["deletions"],
+                    "changed_files": pr["changedFiles"],
+                }
+                for pr in data["pullRequests"]["nodes"]
+            ],
+            "commits": [
+                {
+                    "sha": commit["oid"][:8],
+                    "message": _truncate_utf8(commit["messageHeadline"], _COMMIT_MESSAGE_BYTES),
+                    "author": commit["author"]["name"],
+                    "date": _iso_timestamp(commit["author"]["date"]),
+                }
+                for commit in commits
+            ],
+        }
+
+    def _fetch_issues(self) -> List[Dict]:
+        """Fetch recent issues (the search excludes PRs) as prompt context"""
+        logger.info(f"Reviewing {self.max_issues} recent issues...")
+        issues = search_recent_issues(
+            self.repo,
+            max_issues=self.max_issues,
+            sort="updated",
+            direction="desc"
+        )
+        return [
+            {
+                "number": issue.number,
+                "title": issue.title,
+                "state": issue.state,
+                "labels": [label.name for label in issue.labels],
+                "created_at": issue.created_at.isoformat(),
+                "updated_at": issue.updated_at.isoformat(),
+                "body": _truncate_utf8(issue.body or "", _ISSUE_BODY_BYTES),
+            }
+            for issue in issues
+        ]
+
+    def _fetch_pull_requests(self) -> List[Dict]:
+        """Fetch recent pull requests as prompt context"""
+        logger.info(f"Reviewing {self.max_prs} recent pull requests...")
+        prs = get_recent_pull_requests(
+            self.repo,
+            max_prs=self.max_prs,
+            state="all",
+            sort="updated",
+            direction="desc"
+        )
+        return [
+            {
+                "number": pr.number,
+                "title": pr.title,
+                "state": pr.state,
+                "merged": pr.merged,
+                "created_at": pr.created_at.isoformat(),
+                "updated_at": pr.updated_at.isoformat(),
+                "additions": pr.additions,
+                "deletions": pr.deletions,
+                "changed_files": pr.changed_files,
+            }
+            for pr in prs
+        ]
+
+    def _fetch_commits(self) -> List[Dict]:
+        """Fetch recent commits as prompt context"""
+        logger.info(f"Reviewing {self.max_commits} recent commits...")
+        # Only fields from the list payload; files would cost a request per commit
+        return [
+            {
+                "sha": commit.sha[:8],
+                "message": _truncate_utf8(commit.commit.message.partition("\n")[0], _COMMIT_MESSAGE_BYTES),
+                "author": commit.commit.author.name,
+                "date": commit.commit.author.date.isoformat(),
+            }
+            for commit in get_recent_commits(self.repo, max_commits=self.max_commits)
+        ]
+
     def _build_qa_prompt(self, context: Dict) -> str:
         """Build the QA analysis prompt"""
-        prompt = f"""You are a QA engineer reviewing the SeedGPT repository: {self.repo.full_name}
+        parts = [f"""You are a QA engineer reviewing the SeedGPT repository: {self.repo.full_name}
 
 Your job is to analyze recent activity and identify any problems, inconsistencies, or areas of concern.
 
@@ -220,81 +400,43 @@ Your job is to analyze recent activity and identify any problems, inconsistencie
 - Language: {context['repo_info']['language']}
 
 ## Recent Issues ({len(context['issues'])})
-"""
+"""]
 
         for issue in context["issues"]:
-            prompt += f"\n### Issue #{issue['number']}: {issue['title']}\n"
-            prompt += f"- State: {issue['state']}\n"
-            prompt += f"- Labels: {', '.join(issue['labels'])}\n"
-            prompt += f"- Created: {issue['created_at']}\n"
+            parts.append(f"\n### Issue #{issue['number']}: {issue['title']}\n")
+            parts.append(f"- State: {issue['state']}\n")
+            parts.append(f"- Labels: {', '.join(issue['labels'])}\n")
+            parts.append(f"- Created: {issue['created_at']}\n")
             if issue["body"]:
-                prompt += f"- Description: {issue['body'][:200]}...\n"
+                parts.append(f"- Description: {issue['body']}...\n")
 
-        prompt += f"\n## Recent Pull Requests ({len(context['pull_requests'])})\n"
+        parts.append(f"\n## Recent Pull Requests ({len(context['pull_requests'])})\n")
         for pr in context["pull_requests"]:
-            prompt += f"\n### PR #{pr['number']}: {pr['title']}\n"
-            prompt += f"- State: {pr['state']}, Merged: {pr['merged']}\n"
-            prompt += f"- Changes: +{pr['additions']} -{pr['deletions']} in {pr['changed_files']} files\n"
-            prompt += f"- Updated: {pr['updated_at']}\n"
+            parts.append(f"\n### PR #{pr['number']}: {pr['title']}\n")
+            parts.append(f"- State: {pr['state']}, Merged: {pr['merged']}\n")
+            parts.append(f"- Changes: +{pr['additions']} -{pr['deletions']} in {pr['changed_files']} files\n")
+            parts.append(f"- Updated: {pr['updated_at']}\n")
 
-        prompt += f"\n## Recent Commits ({len(context['commits'])})\n"
+        parts.append(f"\n## Recent Commits ({len(context['commits'])})\n")
         for commit in context["commits"]:
-            prompt += f"- [{commit['sha']}] {commit['message']} by {commit['author']} ({commit['files_changed']} files)\n"
-
-        prompt += """
-
-## Your Task
-
-Analyze the above information and identify any problems or concerns:
-
-1. **Code Quality Issues**
-   - Are there PRs that should have been merged but weren't?
-   - Are there stale issues or PRs?
-   - Are commit messages clear and descriptive?
-
-2. **Process Issues**
-   - Are issues properly labeled?
-   - Are there duplicate issues?
-   - Are PRs being reviewed in a timely manner?
-
-3. **Project Health**
-   - Is the project progressing well?
-   - Are there any red flags?
-   - Are the AI agents working correctly?
-
-4. **Specific Problems**
-   - Any broken workflows?
-   - Any security concerns?
-   - Any performance issues mentioned?
-
-Respond in this EXACT JSON format:
-{
-  "status": "healthy" or "warning" or "critical",
-  "summary": "Brief overall assessment (max 200 chars)",
-  "problems": [
-    {
-      "severity": "low" or "medium" or "high",
-      "category": "code_quality" or "process" or "health" or "security",
-      "title": "Brief problem title (max 80 chars)",
-      "description": "Detailed description (max 300 chars)",
-      "recommendation": "What should be done (max 200 chars)"
-    }
-  ],
-  "positive_observations": [
-    "Things that are going well (max 150 chars each)"
-  ]
-}
+            parts.append(f"- [{commit['sha']}] {commit['message']} by {commit['author']}\n")
 
-If everything looks good, return status "healthy" with empty problems array.
-Output ONLY the JSON, nothing else.
-"""
-        return prompt
+        parts.append(_QA_TASK_SUFFIX)
+        return "".join(parts)
 
     def _run_qa_analysis(self, context: Dict) -> Optional[str]:
         """Run QA analysis using Claude AI"""
         prompt = self._build_qa_prompt(context)
         logger.debug(f"Prompt length: {len(prompt)} chars")
 
+        # The prompt covers all of the context, so an identical prompt means
+        # nothing has changed since the cached analysis
+        cache_file = self.cache_dir / f"{hashlib.blake2b(prompt.encode('utf-8')).hexdigest()}.json"
+        cached_response = self._load_cached_response(cache_file)
+        if cached_response is not None:
+            logger.info("Repository activity unchanged - reusing cached QA analysis")
+            return cached_response
+
         try:
             if USE_CLAUDE_CLI:
                 logger.info("Using Claude CLI...")
@@ -306,7 +448,8 @@ Output ONLY the JSON, nothing else.
                     response_text = str(result)
             else:
                 logger.info("Using Anthropic API...")
-                response_text = call_anthropic_api(
+                # Streamed, and cut off as soon as the JSON report closes
+                response_text = stream_anthropic_json(
                     api_key=self.anthropic_api_key,
                     prompt=prompt,
                     model=CLAUDE_MODELS.QA_ANALYSIS,
@@ -315,6 +458,7 @@ Output ONLY the JSON, nothing else.
                 )
 
             logger.info(f"Received response ({len(response_text)} chars)")
+            self._save_cached_response(cache_file, response_text)
             return response_text
 
         except RateLimitError as e:
@@ -331,26 +475,58 @@ Output ONLY the JSON, nothing else.
             logger.exception(f"Error calling Claude: {anthropic_error}")
             return None
 
+    def _load_cached_response(self, cache_file: Path) -> Optional[str]:
+        """Return a cached analysis younger than cache_ttl, if any"""
+        if self.cache_ttl <= 0:
+            return None
+        try:
+            with open(cache_file, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable QA cache entry {cache_file}: {e}")
+            return None
+
+        if time.time() - entry["timestamp"] >= self.cache_ttl:
+            return None
+        return entry["response"]
+
+    def _save_cached_response(self, cache_file: Path, response_text: str) -> None:
+        """Store an analysis; failures only cost a future Claude call"""
+        if self.cache_ttl <= 0:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump({"timestamp": time.time(), "response": response_text}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to cache QA analysis: {e}")
+
     def _parse_and_act_on_results(self, response_text: str) -> bool:
         """Parse QA results and create issues if needed"""
         try:
             # Clean up response
             cleaned = response_text.strip()
             if "```json" in cleaned:
-                cleaned = cleaned.split("```json")[1].split("```")[0].strip()
+                cleaned = cleaned.partition("```json")[2].partition("```")[0].strip()
             elif "```" in cleaned:
-                cleaned = cleaned.split("```")[1].split("```")[0].strip()
+                cleaned = cleaned.partition("```")[2].partition("```")[0].strip()
 
-            # Find JSON object
             start_idx = cleaned.find("{")
-            end_idx = cleaned.rfind("}") + 1
-            if start_idx == -1 or end_idx == 0:
+            if start_idx == -1:
                 raise JSONParseError(
                     response_text, "No JSON object found in response"
                 )
 
-            json_str = cleaned[start_idx:end_idx]
-            data = json.loads(json_str)
+            try:
+                # Usually the object is all that is left (fast path via orjson)
+                data = json_helpers.loads(cleaned[start_idx:])
+            except json.JSONDecodeError:
+                # Decode just the first JSON object, ignoring trailing text
+                data, _ = json.JSONDecoder().raw_decode(cleaned, start_idx)
 
             status = data.get("status", "unknown")
             summary = data.get("summary", "")
@@ -409,6 +585,25 @@ Output ONLY the JSON, nothing else.
             logger.exception(f"Error processing results: {e}")
             return False
 
+    def _find_recent_qa_issue(self, report_key: str) -> Optional[object]:
+        """Find an open QA issue for the same report created in the last REPORT_REUSE_WINDOW"""
+        cutoff = datetime.now(timezone.utc) - self.REPORT_REUSE_WINDOW
+        marker = _REPORT_KEY_MARKER.format(report_key)
+        try:
+            # One search request; bodies come with the results
+            candidates = search_open_issues(
+                self.repo, labels_any=["qa-report"], sort="created", direction="desc"
+            )
+            for issue in islice(candidates, 20):
+                if issue.created_at < cutoff:
+                    break
+                if marker in (issue.body or ""):
+                    return issue
+        except Exception as e:
+            github_error = get_exception_for_github_error(e, "Failed to search QA issues")
+            logger.warning(f"Could not look up existing QA issues: {github_error}")
+        return None
+
     def _create_qa_issue(
         self, status: str, summary: str, problems: List[Dict], positive: List[str]
     ) -> Optional[object]:
@@ -416,19 +611,19 @@ Output ONLY the JSON, nothing else.
         logger.info(f"Creating QA issue for {status} status...")
 
         # Build issue body
-        severity_emoji = {"warning": "⚠️", "critical": "🔴"}.get(status, "⚠️")
+        severity_emoji = _STATUS_EMOJI.get(status, "⚠️")
 
-        body = f"""# {severity_emoji} QA Agent Report - {status.upper()}
+        parts = [f"""# {severity_emoji} QA Agent Report - {status.upper()}
 
 **Summary:** {summary}
 
-**Scan Date:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
+**Scan Date:** {datetime.now(timezone.utc).strftime(_SCAN_DATE_FORMAT)}
 
 ---
 
 ## 🔍 Problems Detected
 
-"""
+"""]
 
         for i, problem in enumerate(problems, 1):
             severity = problem.get("severity", "unknown")
@@ -437,9 +632,9 @@ Output ONLY the JSON, nothing else.
             description = problem.get("description", "")
             recommendation = problem.get("recommendation", "")
 
-            emoji = {"low": "🟡", "medium": "🟠", "high": "🔴"}.get(severity, "⚪")
+            emoji = _SEVERITY_EMOJI.get(severity, "⚪")
 
-            body += f"""
+            parts.append(f"""
 ### {emoji} Problem {i}: {title}
 
 **Severity:** {severity.upper()}
@@ -452,16 +647,21 @@ Output ONLY the JSON, nothing else.
 {recommendation}
 
 ---
-"""
+""")
 
         # Add positive observations if any
         if positive:
-            body += "\n## ✅ Positive Observations\n\n"
+            parts.append("\n## ✅ Positive Observations\n\n")
             for obs in positive:
-                body += f"- {obs}\n"
-            body += "\n---\n"
+                parts.append(f"- {obs}\n")
+            parts.append("\n---\n")
 
-        body += "\n*Generated by QA Agent*"
+        parts.append("\n*Generated by QA Agent*")
+
+        # Identifies repeat reports so they update one issue instead of opening more
+        report_key = hashlib.blake2b(f"{status}|{summary}".encode("utf-8"), digest_size=8).hexdigest()
+        parts.append(f"\n\n{_REPORT_KEY_MARKER.format(report_key)}")
+        body = "".join(parts)
 
         # Determine labels
         labels = ["qa-report"]
@@ -471,11 +671,21 @@ Output ONLY the JSON, nothing else.
             labels.append("priority-medium")
 
         # Add category labels
-        categories = set(p.get("category", "") for p in problems)
+        categories = {p.get("category", "") for p in problems}
         for cat in categories:
-            if cat in ["security", "code_quality", "process", "health"]:
+            if cat in _CATEGORY_LABELS:
                 labels.append(cat)
 
+        existing_issue = self._find_recent_qa_issue(report_key)
+        if existing_issue is not None:
+            try:
+                update_issue(existing_issue, body=body, labels=labels)
+                logger.info(f"Updated existing QA issue #{existing_issue.number} with the same findings")
+                return existing_issue
+            except Exception as e:
+                github_error = get_exception_for_github_error(e, "Failed to update QA issue")
+                logger.warning(f"Failed to update QA issue #{existing_issue.number}, creating a new one: {github_error}")
+
         # Create the issue with retry
         try:
             issue_title = f"QA Report: {summary[:60]}"
@@ -4,9 +4,16 @@ Claude CLI Agent - Python wrapper for Claude Code CLI headless mode
 Provides a Python interface to interact with Claude CLI in headless mode
 """
 
+import fnmatch
 import json
+import logging
 import os
+import re
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 
 import sys
@@ -16,6 +23,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from logging_config import get_logger
+from utils import json_helpers
 from utils.exceptions import (
     AgentError,
     AgentResponseError,
@@ -28,6 +36,127 @@ from utils.exceptions import (
 
 logger = get_logger(__name__)
 
+# Largest read from the CLI's stdout in streaming mode
+STREAM_CHUNK_SIZE = 65536
+
+# Streamed output is echoed to the debug log in batches of this many bytes,
+# or after this many seconds, rather than one log record per read
+STREAM_LOG_BYTES = 16384
+STREAM_LOG_INTERVAL = 0.05
+
+# CLI stderr that only carries warnings (e.g. Bun's AVX notice) is not fatal
+_WARN_RE = re.compile(rb"warn(?:ing)?:", re.IGNORECASE)
+
+# Stdin content at least this long (a pipe buffer's worth) is handed to the
+# CLI as an in-memory file instead of being pumped through a pipe
+STDIN_MEMFD_THRESHOLD = 65536
+
+# Most files named in one per-directory batch_process prompt; larger
+# directories are split across several CLI invocations
+BATCH_DIRECTORY_MAX_FILES = 20
+
+
+def _is_warning_only(stderr: Optional[bytes], stdout: Optional[bytes]) -> bool:
+    """Whether stderr holds only warnings and the CLI still produced output."""
+    return bool(stderr and _WARN_RE.search(stderr)) and bool(stdout and stdout.strip())
+
+
+def _cli_error(returncode: int, stdout: bytes, stderr: str) -> AgentError:
+    """
+    Build the error for a failed claude CLI run.
+
+    Credit and authentication problems are reported on stdout, so those are
+    recognised there; anything else is reported with stderr.
+
+    Args:
+        returncode: CLI exit code
+        stdout: Raw CLI stdout
+        stderr: Decoded CLI stderr
+
+    Returns:
+        AgentError to raise
+    """
+    error_msg = f"Claude CLI error (exit code {returncode})"
+    error_details = {"returncode": returncode}
+
+    # Check stdout for specific error messages
+    stdout_text = stdout.decode("utf-8", errors="replace") if stdout else ""
+    stdout_lower = stdout_text.lower()
+
+    # Detect credit balance issues
+    if "credit balance is too low" in stdout_lower or "quota" in stdout_lower:
+        error_msg = "Claude CLI credit balance is too low"
+        if stdout_text:
+            error_msg += f": {stdout_text.strip()}"
+            error_details["stdout"] = stdout_text.strip()
+    # Detect authentication issues
+    elif "authentication" in stdout_lower or "unauthorized" in stdout_lower or "api key" in stdout_lower:
+        error_msg = "Claude CLI authentication failed"
+        if stdout_text:
+            error_msg += f": {stdout_text.strip()}"
+            error_details["stdout"] = stdout_text.strip()
+    else:
+        # Generic error handling
+        if stderr:
+            error_msg += f": {stderr}"
+            error_details["stderr"] = stderr
+        else:
+            error_msg += ": No error message provided"
+        if stdout_text:
+            error_msg += f"\nStdout: {stdout_text[:200]}"
+            error_details["stdout_preview"] = stdout_text[:200]
+
+    logger.error(error_msg)
+    return AgentError(error_msg, details=error_details)
+
+
+def _stdin_memfd(content: str) -> Optional[int]:
+    """
+    Put stdin content in an anonymous in-memory file (Linux memfd).
+
+    The child reads the file directly, so the parent doesn't have to feed
+    the content through a pipe while it waits for the CLI.
+
+    Returns:
+        File descriptor positioned at the start, or None if unsupported
+    """
+    if not hasattr(os, "memfd_create"):
+        return None
+
+    fd = os.memfd_create("claude_input")
+    try:
+        view = memoryview(content.encode("utf-8"))
+        while view:
+            view = view[os.write(fd, view):]
+        os.lseek(fd, 0, os.SEEK_SET)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _iter_matching_files(directory: str, file_pattern: str):
+    """
+    Yield files under a directory whose name matches a glob pattern.
+
+    Walks with os.scandir so the file/directory checks use the entry type
+    already returned by the directory listing instead of a stat per path.
+    Order matches Path.rglob: a directory's files, then its subdirectories.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError as e:
+        logger.debug(f"Skipping unreadable directory {directory}: {e}")
+        return
+
+    for entry in entries:
+        if fnmatch.fnmatchcase(entry.name, file_pattern) and entry.is_file():
+            yield Path(entry.path)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_matching_files(entry.path, file_pattern)
+
 
 class ClaudeAgent:
     """
@@ -35,6 +164,27 @@ class ClaudeAgent:
     Enables programmatic access to Claude's capabilities.
     """
 
+    __slots__ = (
+        "output_format",
+        "verbose",
+        "allowed_tools",
+        "disallowed_tools",
+        "permission_mode",
+        "cli_available",
+        "_base_args",
+        "_session",
+        "_session_stderr",
+        "_session_lock",
+    )
+
+    # Result of the `claude --version` probe, shared by every instance
+    _claude_installed: Optional[bool] = None
+
+    # Options baked into the flags _build_command reuses across queries
+    _BASE_ARG_FIELDS = frozenset(
+        {"output_format", "verbose", "allowed_tools", "disallowed_tools", "permission_mode"}
+    )
+
     def __init__(
         self,
         output_format: str = "json",
@@ -61,6 +211,11 @@ class ClaudeAgent:
         self.disallowed_tools = disallowed_tools
         self.permission_mode = permission_mode
 
+        # Long-lived stream-json CLI process; see open_session
+        self._session = None
+        self._session_stderr = None
+        self._session_lock = threading.Lock()
+
         # Check if claude CLI is installed
         self.cli_available = self._is_claude_installed()
         if require_cli and not self.cli_available:
@@ -73,18 +228,30 @@ class ClaudeAgent:
         else:
             logger.warning("Claude CLI not available, but not required")
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Changing a CLI option invalidates the precomputed flags
+        if name in self._BASE_ARG_FIELDS:
+            super().__setattr__("_base_args", None)
+
     def _is_claude_installed(self) -> bool:
-        """Check if claude CLI is installed."""
-        try:
-            subprocess.run(["claude", "--version"], capture_output=True, check=True)
-            logger.debug("Claude CLI is installed and available")
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            logger.debug(f"Claude CLI not found: {e}")
-            return False
+        """Check if claude CLI is installed (probed once per process)."""
+        if ClaudeAgent._claude_installed is None:
+            try:
+                subprocess.run(["claude", "--version"], capture_output=True, check=True)
+                logger.debug("Claude CLI is installed and available")
+                ClaudeAgent._claude_installed = True
+            except (subprocess.CalledProcessError, FileNotFoundError) as e:
+                logger.debug(f"Claude CLI not found: {e}")
+                ClaudeAgent._claude_installed = False
+        return ClaudeAgent._claude_installed
 
     def _build_command(
-        self, prompt: str, additional_args: Optional[List[str]] = None
+        self,
+        prompt: str,
+        additional_args: Optional[List[str]] = None,
+        resume: Optional[str] = None,
+        continue_last: bool = False,
     ) -> List[str]:
         """
         Build the claude CLI command for headless mode.
@@ -92,39 +259,73 @@ class ClaudeAgent:
         Args:
             prompt: The prompt to send
             additional_args: Additional command line arguments
+            resume: Session ID of a conversation to resume
+            continue_last: Continue the most recent conversation
 
         Returns:
             List of command arguments
         """
+        if self._base_args is None:
+            self._base_args = tuple(self._compute_base_args())
+
+        if resume:
+            session_args = ("--resume", resume)
+        elif continue_last:
+            session_args = ("--continue",)
+        else:
+            session_args = ()
+
         # Use -p (--print) for headless mode
-        cmd = ["claude", "-p", prompt]
+        cmd = [
+            "claude", *session_args, "-p", prompt,
+            *self._base_args, *(additional_args or ()),
+        ]
+
+        logger.debug(f"Built command with {len(cmd)} arguments")
+        return cmd
+
+    def _compute_base_args(self) -> List[str]:
+        """
+        Build the flags that are the same for every query from this agent.
+
+        Returns:
+            List of command arguments
+        """
+        args = []
 
         # Add output format
         if self.output_format:
-            cmd.extend(["--output-format", self.output_format])
+            args.extend(["--output-format", self.output_format])
 
         # Add verbose flag
         if self.verbose:
-            cmd.append("--verbose")
+            args.append("--verbose")
+
+        args.extend(self._tool_args())
+        return args
+
+    def _tool_args(self) -> List[str]:
+        """
+        Build the tool and permission flags shared by every CLI invocation.
+
+        Returns:
+            List of command arguments
+        """
+        args = []
 
         # Add allowed tools
         if self.allowed_tools:
-            cmd.extend(["--allowedTools", ",".join(self.allowed_tools)])
+            args.extend(["--allowedTools", ",".join(self.allowed_tools)])
 
         # Add disallowed tools
         if self.disallowed_tools:
-            cmd.extend(["--disallowedTools", ",".join(self.disallowed_tools)])
+            args.extend(["--disallowedTools", ",".join(self.disallowed_tools)])
 
         # Add permission mode (acceptEdits for automated workflows)
         if self.permission_mode:
-            cmd.extend(["--permission-mode", self.permission_mode])
-
-        # Add any additional arguments
-        if additional_args:
-            cmd.extend(additional_args)
+            args.extend(["--permission-mode", self.permission_mode])
 
-        logger.debug(f"Built command with {len(cmd)} arguments")
-        return cmd
+        return args
 
     def query(
         self,
@@ -132,6 +333,7 @@ class ClaudeAgent:
         system_prompt: Optional[str] = None,
         mcp_config: Optional[str] = None,
         stream_output: bool = False,
+        timeout: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Send a query to Claude in headless mode.
@@ -141,9 +343,13 @@ class ClaudeAgent:
             system_prompt: Additional system prompt
             mcp_config: Path to MCP configuration file
             stream_output: If True, print output in real-time
+            timeout: Seconds before the CLI process is killed (default: no limit)
 
         Returns:
             Dict containing response and metadata
+
+        Raises:
+            AgentTimeoutError: If the query runs longer than timeout
         """
         additional_args = []
 
@@ -162,167 +368,85 @@ class ClaudeAgent:
             if stream_output:
                 logger.debug("Using streaming output mode")
                 # Stream output in real-time
+                # Bytes, not text: stdout accumulates in one buffer and JSON is
+                # parsed from it directly; it is only decoded when text is needed
                 process = subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    text=True,
-                    bufsize=1,
                 )
 
-                stdout_lines = []
-                stderr_lines = []
+                stdout_buf = bytearray()
 
-                # Read stdout in real-time
-                for line in process.stdout:
-                    logger.debug(f"Stream output: {line.strip()}")
-                    stdout_lines.append(line)
+                # Reading stdout blocks, so the deadline is enforced by a timer
+                timed_out = threading.Event()
+                watchdog = None
+                if timeout is not None:
+                    def kill_on_timeout():
+                        timed_out.set()
+                        process.kill()
 
-                # Wait for completion and get stderr
-                process.wait()
-                stderr_output = process.stderr.read()
+                    watchdog = threading.Timer(timeout, kill_on_timeout)
+                    watchdog.start()
 
-                stdout_text = "".join(stdout_lines)
+                try:
+                    # Read stdout in real-time, as whatever bytes are available
+                    log_chunks = logger.isEnabledFor(logging.DEBUG)
+                    logged = 0
+                    last_log = time.monotonic()
+                    while chunk := process.stdout.read1(STREAM_CHUNK_SIZE):
+                        stdout_buf += chunk
+                        if log_chunks and (
+                            len(stdout_buf) - logged >= STREAM_LOG_BYTES
+                            or time.monotonic() - last_log >= STREAM_LOG_INTERVAL
+                        ):
+                            logger.debug(f"Stream output: {stdout_buf[logged:].decode('utf-8', errors='replace').strip()}")
+                            logged = len(stdout_buf)
+                            last_log = time.monotonic()
+
+                    if log_chunks and logged < len(stdout_buf):
+                        logger.debug(f"Stream output: {stdout_buf[logged:].decode('utf-8', errors='replace').strip()}")
+
+                    # Wait for completion and get stderr
+                    process.wait()
+                finally:
+                    if watchdog is not None:
+                        watchdog.cancel()
+
+                if timed_out.is_set():
+                    logger.error(f"Claude CLI query timed out after {timeout}s")
+                    raise AgentTimeoutError("query", timeout)
+
+                stderr_bytes = process.stderr.read()
+                stderr_output = stderr_bytes.decode("utf-8", errors="replace")
 
                 # Handle stderr - distinguish between warnings and errors
+                is_warning_only = _is_warning_only(stderr_bytes, stdout_buf)
                 if stderr_output:
-                    stderr_lower = stderr_output.lower()
-                    is_warning_only = (
-                        "warn:" in stderr_lower or "warning:" in stderr_lower
-                    ) and stdout_text.strip()  # Has actual output
-
                     if is_warning_only:
                         logger.warning(f"Claude CLI warning: {stderr_output.strip()}")
                     else:
                         logger.error(f"Claude CLI error: {stderr_output}")
-                        stderr_lines.append(stderr_output)
 
                 # Only raise error if returncode is non-zero AND it's not just a warning
-                if process.returncode != 0:
-                    stderr_lower = stderr_output.lower() if stderr_output else ""
-                    is_warning_only = (
-                        "warn:" in stderr_lower or "warning:" in stderr_lower
-                    ) and stdout_text.strip()
-
-                    if not is_warning_only:
-                        error_details = {"returncode": process.returncode}
-                        stdout_lower = stdout_text.lower() if stdout_text else ""
-                        
-                        # Detect credit balance issues
-                        if "credit balance is too low" in stdout_lower or "quota" in stdout_lower:
-                            error_msg = "Claude CLI credit balance is too low"
-                            if stdout_text:
-                                error_msg += f": {stdout_text.strip()}"
-                                error_details["stdout"] = stdout_text.strip()
-                        # Detect authentication issues
-                        elif "authentication" in stdout_lower or "unauthorized" in stdout_lower or "api key" in stdout_lower:
-                            error_msg = "Claude CLI authentication failed"
-                            if stdout_text:
-                                error_msg += f": {stdout_text.strip()}"
-                                error_details["stdout"] = stdout_text.strip()
-                        else:
-                            # Generic error handling
-                            error_msg = f"Claude CLI error: {stderr_output}"
-                            if stderr_output:
-                                error_details["stderr"] = stderr_output
-                        
-                        logger.error(error_msg)
-                        raise AgentError(error_msg, details=error_details)
+                if process.returncode != 0 and not is_warning_only:
+                    raise _cli_error(process.returncode, stdout_buf, stderr_output)
 
                 if self.output_format == "json":
                     try:
-                        result = json.loads(stdout_text)
+                        result = json_helpers.loads(bytes(stdout_buf))
                         logger.info("Successfully parsed JSON response")
                         return result
                     except json.JSONDecodeError as e:
                         logger.error(f"Failed to parse JSON response: {e}")
-                        raise JSONParseError(stdout_text, str(e))
+                        raise JSONParseError(stdout_buf.decode("utf-8", errors="replace"), str(e))
                 else:
                     logger.info("Query completed successfully")
-                    return {"result": stdout_text}
+                    return {"result": stdout_buf.decode("utf-8", errors="replace")}
             else:
                 logger.debug("Using non-streaming output mode")
-                # Capture all output at once
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    check=False,  # Don't raise on non-zero exit, we'll check manually
-                )
+                return self._run(cmd, "query", timeout=timeout)
 
-                # Check if there's actual output despite warnings in stderr
-                # Bun/AVX warnings shouldn't be treated as fatal errors
-                if result.returncode != 0:
-                    # Check if stderr contains only warnings (not actual errors)
-                    stderr_lower = result.stderr.lower() if result.stderr else ""
-                    is_warning_only = (
-                        "warn:" in stderr_lower or "warning:" in stderr_lower
-                    ) and result.stdout.strip()  # Has actual output
-
-                    if not is_warning_only:
-                        # Provide more context in error message
-                        error_msg = f"Claude CLI error (exit code {result.returncode})"
-                        error_details = {"returncode": result.returncode}
-
-                        # Check stdout for specific error messages
-                        stdout_lower = result.stdout.lower() if result.stdout else ""
-                        
-                        # Detect credit balance issues
-                        if "credit balance is too low" in stdout_lower or "quota" in stdout_lower:
-                            error_msg = "Claude CLI credit balance is too low"
-                            if result.stdout:
-                                error_msg += f": {result.stdout.strip()}"
-                                error_details["stdout"] = result.stdout.strip()
-                        # Detect authentication issues
-                        elif "authentication" in stdout_lower or "unauthorized" in stdout_lower or "api key" in stdout_lower:
-                            error_msg = "Claude CLI authentication failed"
-                            if result.stdout:
-                                error_msg += f": {result.stdout.strip()}"
-                                error_details["stdout"] = result.stdout.strip()
-                        else:
-                            # Generic error handling
-                            if result.stderr:
-                                error_msg += f": {result.stderr}"
-                                error_details["stderr"] = result.stderr
-                            else:
-                                error_msg += ": No error message provided"
-                            if result.stdout:
-                                error_msg += f"\nStdout: {result.stdout[:200]}"
-                                error_details["stdout_preview"] = result.stdout[:200]
-
-                        logger.error(error_msg)
-                        raise AgentError(error_msg, details=error_details)
-                    else:
-                        # Log warning but continue
-                        if result.stderr:
-                            logger.warning(f"Claude CLI warning: {result.stderr.strip()}")
-
-                # Check if we have any output
-                if not result.stdout or not result.stdout.strip():
-                    error_msg = "Claude CLI returned no output"
-                    error_details = {}
-                    if result.stderr:
-                        error_msg += f"\nStderr: {result.stderr}"
-                        error_details["stderr"] = result.stderr
-                    logger.error(error_msg)
-                    raise AgentResponseError(error_msg, details=error_details)
-
-                if self.output_format == "json":
-                    try:
-                        result_data = json.loads(result.stdout)
-                        logger.info("Successfully parsed JSON response")
-                        return result_data
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse JSON response: {e}")
-                        raise JSONParseError(result.stdout, str(e))
-                else:
-                    logger.info("Query completed successfully")
-                    return {"result": result.stdout}
-
-        except subprocess.CalledProcessError as e:
-            error_msg = f"Claude CLI subprocess error: {e.stderr}"
-            logger.error(error_msg)
-            raise AgentError(error_msg, details={"stderr": e.stderr})
         except JSONParseError:
             # Re-raise our custom exception
             raise
@@ -338,6 +462,85 @@ class ClaudeAgent:
             logger.exception(error_msg)
             raise AgentError(error_msg, details={"original_error": str(e)})
 
+    def _run(
+        self, cmd: List[str], operation: str, timeout: Optional[float] = None, **run_kwargs
+    ) -> Dict[str, Any]:
+        """
+        Run a one-shot claude CLI command and parse its output.
+
+        Shared by query, query_with_stdin and continue_conversation.
+
+        Args:
+            cmd: Command from _build_command
+            operation: Name of the calling operation, for errors and logs
+            timeout: Seconds before the CLI process is killed (default: no limit)
+            **run_kwargs: Extra subprocess.run arguments (input/stdin)
+
+        Returns:
+            Dict containing response and metadata
+
+        Raises:
+            AgentTimeoutError: If the command runs longer than timeout
+        """
+        try:
+            # Capture all output at once, as bytes: stdout goes straight to the
+            # JSON parser and is only decoded when text is actually needed
+            result = subprocess.run(
+                cmd,
+                **run_kwargs,
+                capture_output=True,
+                check=False,  # Don't raise on non-zero exit, we'll check manually
+                timeout=timeout,
+            )
+            stdout = result.stdout or b""
+            stderr = result.stderr.decode("utf-8", errors="replace") if result.stderr else ""
+            has_output = bool(stdout.strip())
+
+            # Check if there's actual output despite warnings in stderr
+            # Bun/AVX warnings shouldn't be treated as fatal errors
+            if result.returncode != 0:
+                if not _is_warning_only(result.stderr, stdout):
+                    raise _cli_error(result.returncode, stdout, stderr)
+                if stderr:
+                    logger.warning(f"Claude CLI warning: {stderr.strip()}")
+
+            # Check if we have any output
+            if not has_output:
+                error_msg = "Claude CLI returned no output"
+                error_details = {}
+                if stderr:
+                    error_msg += f"\nStderr: {stderr}"
+                    error_details["stderr"] = stderr
+                logger.error(error_msg)
+                raise AgentResponseError(error_msg, details=error_details)
+
+            if self.output_format == "json":
+                try:
+                    result_data = json_helpers.loads(stdout)
+                    logger.info("Successfully parsed JSON response")
+                    return result_data
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse JSON response: {e}")
+                    raise JSONParseError(stdout.decode("utf-8", errors="replace"), str(e))
+            else:
+                logger.info(f"Claude CLI {operation} completed successfully")
+                return {"result": stdout.decode("utf-8", errors="replace")}
+
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode("utf-8", errors="replace") if isinstance(e.stderr, bytes) else e.stderr
+            error_msg = f"Claude CLI error: {stderr}"
+            logger.error(error_msg)
+            raise AgentError(error_msg, details={"stderr": stderr, "returncode": e.returncode})
+        except subprocess.TimeoutExpired:
+            logger.error(f"Claude CLI {operation} timed out after {timeout}s")
+            raise AgentTimeoutError(operation, timeout)
+        except SeedGPTException:
+            raise
+        except Exception as e:
+            error_msg = f"Unexpected error during {operation}: {str(e)}"
+            logger.exception(error_msg)
+            raise AgentError(error_msg, details={"original_error": str(e)})
+
     def query_with_stdin(
         self, prompt: str, stdin_content: str, system_prompt: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -362,40 +565,160 @@ class ClaudeAgent:
         logger.info("Executing Claude CLI query with stdin")
         logger.debug(f"Stdin content length: {len(stdin_content)} characters")
 
+        stdin_fd = None
+        if len(stdin_content) >= STDIN_MEMFD_THRESHOLD:
+            stdin_fd = _stdin_memfd(stdin_content)
+        if stdin_fd is None:
+            stdin_kwargs = {"input": stdin_content.encode("utf-8")}
+        else:
+            stdin_kwargs = {"stdin": stdin_fd}
+
         try:
-            result = subprocess.run(
-                cmd, input=stdin_content, capture_output=True, text=True, check=True
-            )
+            return self._run(cmd, "query_with_stdin", **stdin_kwargs)
+        finally:
+            if stdin_fd is not None:
+                os.close(stdin_fd)
 
-            if self.output_format == "json":
-                try:
-                    result_data = json.loads(result.stdout)
-                    logger.info("Successfully parsed JSON response from stdin query")
-                    return result_data
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse JSON response: {e}")
-                    raise JSONParseError(result.stdout, str(e))
-            else:
-                logger.info("Stdin query completed successfully")
-                return {"result": result.stdout}
+    def open_session(self, system_prompt: Optional[str] = None) -> None:
+        """
+        Start a long-lived claude CLI process for multi-turn work.
 
-        except subprocess.CalledProcessError as e:
-            error_msg = f"Claude CLI error: {e.stderr}"
+        Prompts sent with send() reuse this process over stream-json stdin,
+        so only the first one pays the CLI startup cost. Turns share one
+        conversation. Close it with close_session().
+
+        Args:
+            system_prompt: Additional system prompt for the session
+        """
+        if self._session is not None and self._session.poll() is None:
+            return
+
+        cmd = [
+            "claude", "-p",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose",
+        ]
+        cmd.extend(self._tool_args())
+        if system_prompt:
+            cmd.extend(["--append-system-prompt", system_prompt])
+
+        logger.info("Starting Claude CLI session")
+        try:
+            self._session = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as e:
+            error_msg = f"Failed to start Claude CLI session: {str(e)}"
             logger.error(error_msg)
-            raise AgentError(error_msg, details={"stderr": e.stderr, "returncode": e.returncode})
-        except JSONParseError:
-            raise
-        except Exception as e:
-            error_msg = f"Unexpected error during stdin query: {str(e)}"
-            logger.exception(error_msg)
             raise AgentError(error_msg, details={"original_error": str(e)})
 
+        # Drain stderr so a chatty CLI can't fill the pipe and stall the session
+        self._session_stderr = deque(maxlen=50)
+        session, stderr_tail = self._session, self._session_stderr
+
+        def drain_stderr():
+            for line in session.stderr:
+                stderr_tail.append(line.decode("utf-8", errors="replace"))
+
+        threading.Thread(target=drain_stderr, daemon=True).start()
+
+    def send(self, prompt: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Send a prompt to the open session and wait for its result.
+
+        Args:
+            prompt: The prompt to send
+            timeout: Seconds to wait for the result before ending the session
+
+        Returns:
+            Dict containing response and metadata (the CLI's result event)
+        """
+        if self._session is None or self._session.poll() is not None:
+            raise AgentError("No open Claude CLI session; call open_session() first")
+
+        with self._session_lock:
+            session = self._session
+            message = {"type": "user", "message": {"role": "user", "content": prompt}}
+
+            # Reading stdout blocks, so the deadline is enforced by a timer
+            timed_out = threading.Event()
+            watchdog = None
+            if timeout is not None:
+                def kill_on_timeout():
+                    timed_out.set()
+                    session.kill()
+
+                watchdog = threading.Timer(timeout, kill_on_timeout)
+                watchdog.start()
+
+            try:
+                session.stdin.write(json_helpers.dumps(message).encode("utf-8") + b"\n")
+                session.stdin.flush()
+
+                for line in session.stdout:
+                    if not line.strip():
+                        continue
+                    try:
+                        event = json_helpers.loads(line)
+                    except json.JSONDecodeError:
+                        logger.debug(f"Ignoring non-JSON session output: {line[:200]!r}")
+                        continue
+                    if event.get("type") == "result":
+                        if event.get("is_error"):
+                            raise AgentResponseError(
+                                f"Claude CLI session error: {event.get('result')}",
+                                details={"session_id": event.get("session_id")},
+                            )
+                        logger.info("Session turn completed successfully")
+                        return event
+            except OSError as e:
+                if not timed_out.is_set():
+                    error_msg = f"Claude CLI session failed: {str(e)}"
+                    logger.error(error_msg)
+                    raise AgentError(error_msg, details={"original_error": str(e)})
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+
+            if timed_out.is_set():
+                logger.error(f"Claude CLI session turn timed out after {timeout}s")
+                raise AgentTimeoutError("send", timeout)
+
+            stderr_output = "".join(self._session_stderr or ())
+            error_msg = f"Claude CLI session ended unexpectedly: {stderr_output}"
+            logger.error(error_msg)
+            raise AgentError(error_msg, details={"returncode": session.poll()})
+
+    def close_session(self) -> None:
+        """End the open session, if any."""
+        session, self._session = self._session, None
+        if session is None:
+            return
+
+        try:
+            session.stdin.close()
+        except OSError:
+            pass
+        try:
+            session.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            session.kill()
+            session.wait()
+        logger.info("Claude CLI session closed")
+
     def continue_conversation(
         self, prompt: str, session_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Continue a previous conversation.
 
+        With an open session and no session_id, the prompt goes to the
+        session's process instead of starting a new CLI.
+
         Args:
             prompt: The prompt to send
             session_id: Session ID to resume (None for most recent)
@@ -403,42 +726,48 @@ class ClaudeAgent:
         Returns:
             Dict containing response and metadata
         """
+        if session_id is None and self._session is not None and self._session.poll() is None:
+            logger.info("Continuing conversation in open session")
+            return self.send(prompt)
+
         if session_id:
-            cmd = ["claude", "--resume", session_id, prompt]
             logger.info(f"Resuming conversation with session ID: {session_id}")
+            cmd = self._build_command(prompt, resume=session_id)
         else:
-            cmd = ["claude", "--continue", prompt]
             logger.info("Continuing most recent conversation")
+            cmd = self._build_command(prompt, continue_last=True)
 
-        # Add output format
-        if self.output_format:
-            cmd.extend(["--output-format", self.output_format])
+        return self._run(cmd, "continue_conversation")
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    def _read_source(self, file_path: str) -> str:
+        """
+        Read a file to send to the CLI.
 
-            if self.output_format == "json":
-                try:
-                    result_data = json.loads(result.stdout)
-                    logger.info("Successfully parsed JSON response from continued conversation")
-                    return result_data
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse JSON response: {e}")
-                    raise JSONParseError(result.stdout, str(e))
-            else:
-                logger.info("Conversation continued successfully")
-                return {"result": result.stdout}
+        Opens the file directly (no separate existence check) and maps the
+        failure to our exceptions.
 
-        except subprocess.CalledProcessError as e:
-            error_msg = f"Claude CLI error: {e.stderr}"
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            File content
+
+        Raises:
+            CustomFileNotFoundError: If the file does not exist
+            FileOperationError: If the file cannot be read
+        """
+        try:
+            file_content = Path(file_path).read_bytes().decode("utf-8", errors="replace")
+        except FileNotFoundError:
+            logger.error(f"File not found: {file_path}")
+            raise CustomFileNotFoundError(file_path)
+        except OSError as e:
+            error_msg = f"Failed to read file {file_path}: {str(e)}"
             logger.error(error_msg)
-            raise AgentError(error_msg, details={"stderr": e.stderr, "returncode": e.returncode})
-        except JSONParseError:
-            raise
-        except Exception as e:
-            error_msg = f"Unexpected error during conversation continuation: {str(e)}"
-            logger.exception(error_msg)
-            raise AgentError(error_msg, details={"original_error": str(e)})
+            raise FileOperationError(error_msg, details={"file_path": file_path, "error": str(e)})
+
+        logger.debug(f"Successfully read file: {file_path} ({len(file_content)} characters)")
+        return file_content
 
     def code_review(self, file_path: str) -> Dict[str, Any]:
         """
@@ -452,19 +781,7 @@ class ClaudeAgent:
         """
         logger.info(f"Starting code review for file: {file_path}")
 
-        if not os.path.exists(file_path):
-            error_msg = f"File not found: {file_path}"
-            logger.error(error_msg)
-            raise CustomFileNotFoundError(file_path)
-
-        try:
-            with open(file_path, "r") as f:
-                file_content = f.read()
-            logger.debug(f"Successfully read file: {file_path} ({len(file_content)} characters)")
-        except IOError as e:
-            error_msg = f"Failed to read file {file_path}: {str(e)}"
-            logger.error(error_msg)
-            raise FileOperationError(error_msg, details={"file_path": file_path, "error": str(e)})
+        file_content = self._read_source(file_path)
 
         prompt = f"""Review this code for:
         1. Security vulnerabilities
@@ -493,19 +810,7 @@ class ClaudeAgent:
         """
         logger.info(f"Generating documentation for file: {file_path}")
 
-        if not os.path.exists(file_path):
-            error_msg = f"File not found: {file_path}"
-            logger.error(error_msg)
-            raise CustomFileNotFoundError(file_path)
-
-        try:
-            with open(file_path, "r") as f:
-                file_content = f.read()
-            logger.debug(f"Successfully read file: {file_path} ({len(file_content)} characters)")
-        except IOError as e:
-            error_msg = f"Failed to read file {file_path}: {str(e)}"
-            logger.error(error_msg)
-            raise FileOperationError(error_msg, details={"file_path": file_path, "error": str(e)})
+        file_content = self._read_source(file_path)
 
         prompt = f"""Generate comprehensive documentation for this code including:
         1. Overview and purpose
@@ -536,19 +841,7 @@ class ClaudeAgent:
         logger.info(f"Fixing code in file: {file_path}")
         logger.debug(f"Issue description: {issue_description}")
 
-        if not os.path.exists(file_path):
-            error_msg = f"File not found: {file_path}"
-            logger.error(error_msg)
-            raise CustomFileNotFoundError(file_path)
-
-        try:
-            with open(file_path, "r") as f:
-                file_content = f.read()
-            logger.debug(f"Successfully read file: {file_path} ({len(file_content)} characters)")
-        except IOError as e:
-            error_msg = f"Failed to read file {file_path}: {str(e)}"
-            logger.error(error_msg)
-            raise FileOperationError(error_msg, details={"file_path": file_path, "error": str(e)})
+        file_content = self._read_source(file_path)
 
         prompt = f"""Fix the following issue in this code:
 
@@ -563,23 +856,38 @@ class ClaudeAgent:
         return result
 
     def batch_process(
-        self, directory: str, prompt: str, file_pattern: str = "*.py"
+        self,
+        directory: str,
+        prompt: str,
+        file_pattern: str = "*.py",
+        max_workers: int = 4,
+        per_directory: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Process multiple files in a directory.
 
+        Files are processed concurrently; each one runs its own claude CLI
+        process, so threads overlap the time spent waiting on the CLI.
+        With per_directory, each directory's files instead go to a single
+        CLI process that reads them itself and answers for all of them,
+        trading per-file isolation for one CLI start per directory.
+        Directories with more than BATCH_DIRECTORY_MAX_FILES files are
+        split into several such invocations.
+
         Args:
             directory: Directory to process
             prompt: Prompt to apply to each file
             file_pattern: Glob pattern for files to process
+            max_workers: Maximum number of claude CLI processes run at once
+            per_directory: Run one CLI invocation per directory of files
+                (at most BATCH_DIRECTORY_MAX_FILES files each)
 
         Returns:
-            List of results for each file
+            List of results for each file, in file discovery order
         """
         logger.info(f"Starting batch processing in directory: {directory}")
         logger.debug(f"File pattern: {file_pattern}, Prompt: {prompt[:100]}...")
 
-        results = []
         path = Path(directory)
 
         if not path.exists():
@@ -592,33 +900,35 @@ class ClaudeAgent:
             logger.error(error_msg)
             raise FileOperationError(error_msg, details={"path": directory})
 
-        files_to_process = list(path.rglob(file_pattern))
+        if "/" in file_pattern or os.sep in file_pattern:
+            files_to_process = [p for p in path.rglob(file_pattern) if p.is_file()]
+        else:
+            files_to_process = list(_iter_matching_files(directory, file_pattern))
         logger.info(f"Found {len(files_to_process)} files to process")
 
-        for file_path in files_to_process:
-            if file_path.is_file():
-                try:
-                    logger.debug(f"Processing file: {file_path}")
-                    with open(file_path, "r") as f:
-                        content = f.read()
-
-                    result = self.query_with_stdin(
-                        f"{prompt}\n\nFile: {file_path}", content
-                    )
-                    results.append(
-                        {"file": str(file_path), "result": result, "success": True}
-                    )
-                    logger.info(f"Successfully processed file: {file_path}")
-                except SeedGPTException as e:
-                    logger.warning(f"Failed to process file {file_path}: {e.message}")
-                    results.append(
-                        {"file": str(file_path), "error": e.message, "success": False}
-                    )
-                except Exception as e:
-                    logger.warning(f"Unexpected error processing file {file_path}: {str(e)}")
-                    results.append(
-                        {"file": str(file_path), "error": str(e), "success": False}
-                    )
+        results = []
+        if files_to_process and per_directory:
+            groups: Dict[Path, List[Path]] = {}
+            for file_path in files_to_process:
+                groups.setdefault(file_path.parent, []).append(file_path)
+            # Bound each prompt (and the answer it asks for) in size
+            chunks = [
+                files[i:i + BATCH_DIRECTORY_MAX_FILES]
+                for files in groups.values()
+                for i in range(0, len(files), BATCH_DIRECTORY_MAX_FILES)
+            ]
+            workers = max(1, min(max_workers, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for group_results in executor.map(
+                    lambda files: self._process_directory(files, prompt), chunks
+                ):
+                    results.extend(group_results)
+        elif files_to_process:
+            workers = max(1, min(max_workers, len(files_to_process)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(lambda p: self._process_file(p, prompt), files_to_process)
+                )
 
         successful = sum(1 for r in results if r["success"])
         failed = len(results) - successful
@@ -626,6 +936,97 @@ class ClaudeAgent:
 
         return results
 
+    def _process_file(self, file_path: Path, prompt: str) -> Dict[str, Any]:
+        """
+        Run the batch prompt against a single file.
+
+        Args:
+            file_path: File to process
+            prompt: Prompt to apply to the file
+
+        Returns:
+            Result entry with success flag and result or error
+        """
+        try:
+            logger.debug(f"Processing file: {file_path}")
+            content = file_path.read_bytes().decode("utf-8", errors="replace")
+
+            result = self.query_with_stdin(f"{prompt}\n\nFile: {file_path}", content)
+            logger.info(f"Successfully processed file: {file_path}")
+            return {"file": str(file_path), "result": result, "success": True}
+        except SeedGPTException as e:
+            logger.warning(f"Failed to process file {file_path}: {e.message}")
+            return {"file": str(file_path), "error": e.message, "success": False}
+        except Exception as e:
+            logger.warning(f"Unexpected error processing file {file_path}: {str(e)}")
+            return {"file": str(file_path), "error": str(e), "success": False}
+
+    def _process_directory(self, files: List[Path], prompt: str) -> List[Dict[str, Any]]:
+        """
+        Run the batch prompt against several files with one CLI invocation.
+
+        The CLI is given the file list and the Read tool, and asked for a
+        JSON object keyed by file path.
+
+        Args:
+            files: Files to process (from one directory, at most
+                BATCH_DIRECTORY_MAX_FILES)
+            prompt: Prompt to apply to each file
+
+        Returns:
+            Result entries with success flag and result or error, one per file
+        """
+        file_list = "\n".join(f"- {file_path}" for file_path in files)
+        combined_prompt = (
+            f"{prompt}\n\n"
+            f"Apply this to each of the following files, reading them yourself:\n"
+            f"{file_list}\n\n"
+            "Respond with only a JSON object that maps each file path, exactly as "
+            "listed, to your result for that file."
+        )
+        additional_args = []
+        if not self.allowed_tools or "Read" not in self.allowed_tools:
+            additional_args.extend(["--allowedTools", "Read"])
+
+        try:
+            logger.debug(f"Processing {len(files)} files in {files[0].parent} with one query")
+            response = self._run(
+                self._build_command(combined_prompt, additional_args), "batch_process"
+            )
+            text = str(response.get("result", ""))
+            start_idx = text.find("{")
+            if start_idx == -1:
+                raise AgentResponseError(
+                    "Batch response contained no JSON object",
+                    details={"response_preview": text[:200]},
+                )
+            per_file, _ = json.JSONDecoder().raw_decode(text, start_idx)
+            if not isinstance(per_file, dict):
+                raise AgentResponseError("Batch response JSON is not an object")
+        except SeedGPTException as e:
+            logger.warning(f"Failed to process files in {files[0].parent}: {e.message}")
+            return [{"file": str(f), "error": e.message, "success": False} for f in files]
+        except json.JSONDecodeError as e:
+            logger.warning(f"Unparseable batch response for {files[0].parent}: {str(e)}")
+            return [{"file": str(f), "error": str(e), "success": False} for f in files]
+
+        results = []
+        for file_path in files:
+            if str(file_path) in per_file:
+                results.append({
+                    "file": str(file_path),
+                    "result": {"result": per_file[str(file_path)]},
+                    "success": True,
+                })
+            else:
+                results.append({
+                    "file": str(file_path),
+                    "error": "No result returned for file",
+                    "success": False,
+                })
+        logger.info(f"Processed {len(files)} files in {files[0].parent}")
+        return results
+
 
 def main():
     """Example usage of ClaudeAgent."""
@@ -644,7 +1045,7 @@ def main():
         if "result" in result:
             logger.info(f"Query result: {result['result'][:200]}...")
         else:
-            logger.info(f"Query result: {json.dumps(result, indent=2)[:200]}...")
+            logger.info(f"Query result: {json_helpers.dumps(result, indent=True)[:200]}...")
 
         # Example 2: Code review (if file provided)
         if len(sys.argv) > 1:
@@ -654,7 +1055,7 @@ def main():
             if "result" in result:
                 logger.info(f"Review result: {result['result'][:200]}...")
             else:
-                logger.info(f"Review result: {json.dumps(result, indent=2)[:200]}...")
+                logger.info(f"Review result: {json_helpers.dumps(result, indent=True)[:200]}...")
 
         logger.info("Examples completed successfully")
 
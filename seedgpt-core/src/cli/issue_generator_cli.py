@@ -15,7 +15,7 @@ from github import Github, Auth
 if __name__ == '__main__':
     sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from agents.issue_generator import IssueGenerator
+from agents.issue_generator import IssueGenerator, IssueGeneratorBatch
 from utils.github_helpers import get_repository
 from utils.exceptions import (
     MissingEnvironmentVariableError,
@@ -41,6 +41,8 @@ def main():
     ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
     REPO_NAME = os.getenv('REPO_NAME')
     DRY_MODE = os.getenv('DRY_MODE', 'false').lower() in ('true', '1', 'yes')
+    # Submit all repositories as one Message Batches request (cheaper, not interactive)
+    BATCH_MODE = os.getenv('BATCH_MODE', 'false').lower() in ('true', '1', 'yes')
 
     if not GITHUB_TOKEN or not REPO_NAME:
         print("\n" + "="*80)
@@ -48,7 +50,7 @@ def main():
         print("="*80)
         print("\n📋 This workflow requires the following environment variables:")
         print("   • GITHUB_TOKEN - GitHub API access token")
-        print("   • REPO_NAME - Repository name (owner/repo)")
+        print("   • REPO_NAME - Repository name (owner/repo), comma-separated for several")
         print("\n💡 These are typically not available in forked repositories.")
         print("   This is expected behavior and not an error.")
         print("\n🔒 Repository owners can configure these secrets in:")
@@ -57,26 +59,46 @@ def main():
         logger.info("Skipping execution due to missing environment variables (expected in forks)")
         sys.exit(0)
 
+    repo_names = [name.strip() for name in REPO_NAME.split(',') if name.strip()]
+
+    if BATCH_MODE and not ANTHROPIC_API_KEY:
+        raise MissingEnvironmentVariableError("ANTHROPIC_API_KEY")
+
     # Initialize GitHub client with retry using shared utility
-    try:
-        auth = Auth.Token(GITHUB_TOKEN)
-        gh = Github(auth=auth)
-        repo = get_repository(gh, REPO_NAME)
-        logger.info(f"Connected to repository: {REPO_NAME}")
-    except Exception as e:
-        logger.error(f"Failed to connect to GitHub repository: {REPO_NAME}")
-        raise get_exception_for_github_error(e, f"Failed to connect to repository {REPO_NAME}")
+    auth = Auth.Token(GITHUB_TOKEN)
+    gh = Github(auth=auth)
+    repos = []
+    for repo_name in repo_names:
+        try:
+            repos.append(get_repository(gh, repo_name))
+            logger.info(f"Connected to repository: {repo_name}")
+        except Exception as e:
+            logger.error(f"Failed to connect to GitHub repository: {repo_name}")
+            raise get_exception_for_github_error(e, f"Failed to connect to repository {repo_name}")
 
     # Run the agent
     try:
-        agent = IssueGenerator(
-            repo=repo,
-            anthropic_api_key=ANTHROPIC_API_KEY,
-            min_issues=MIN_ISSUES,
-            dry_mode=DRY_MODE
-        )
-
-        agent.check_and_generate()
+        # Several repositories keep separate rate limit state so one repo's
+        # generation doesn't throttle (or overwrite the record of) another
+        agents = [
+            IssueGenerator(
+                repo=repo,
+                anthropic_api_key=ANTHROPIC_API_KEY,
+                min_issues=MIN_ISSUES,
+                dry_mode=DRY_MODE,
+                rate_limit_state_path=(
+                    Path.cwd() / ".seedgpt" / f"rate_limit_state_{repo.full_name.replace('/', '_')}.json"
+                    if len(repos) > 1 else None
+                )
+            )
+            for repo in repos
+        ]
+
+        if BATCH_MODE:
+            IssueGeneratorBatch(agents, ANTHROPIC_API_KEY).run()
+        else:
+            for agent in agents:
+                agent.check_and_generate()
         logger.info("Issue generator completed successfully")
 
     except CreditBalanceError as e:
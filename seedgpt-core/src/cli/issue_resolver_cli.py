@@ -77,7 +77,8 @@ def main():
     # Initialize GitHub client with retry using shared utility
     try:
         auth = Auth.Token(GITHUB_TOKEN)
-        gh = Github(auth=auth)
+        # 100 per page (the API maximum) so issue selection fits in one request
+        gh = Github(auth=auth, per_page=100)
         repo = get_repository(gh, REPO_NAME)
         logger.info(f"Connected to repository: {REPO_NAME}")
     except Exception as e:
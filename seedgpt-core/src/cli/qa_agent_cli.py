@@ -54,7 +54,8 @@ def main():
     @retry_github_api
     def initialize_github():
         auth = Auth.Token(GITHUB_TOKEN)
-        gh = Github(auth=auth)
+        # 100 per page (the API maximum) so larger review limits need fewer requests
+        gh = Github(auth=auth, per_page=100)
         return gh.get_repo(REPO_NAME)
 
     try:
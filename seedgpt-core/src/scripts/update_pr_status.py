@@ -12,7 +12,9 @@ Usage:
 import os
 import sys
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 from github import Github
 from github.GithubException import GithubException, UnknownObjectException, RateLimitExceededException
 
@@ -30,6 +32,52 @@ from utils.outcome_tracker import OutcomeTracker, ResolutionStatus
 
 logger = get_logger(__name__)
 
+# PRs fetched from the GitHub API at once
+MAX_WORKERS = 10
+
+# PR `state` value for a closed (merged or unmerged) PR
+_CLOSED_STATE = "closed"
+
+
+def _check_pr(repo, issue_number: int, pr_number: int) -> Optional[ResolutionStatus]:
+    """
+    Fetch one PR and work out the status its issue should move to
+
+    Args:
+        repo: PyGithub Repository object
+        issue_number: Tracked issue number
+        pr_number: PR linked to the issue
+
+    Returns:
+        Optional[ResolutionStatus]: New status, or None if the PR is still open
+            or could not be checked
+
+    Raises:
+        RateLimitError: If the GitHub rate limit is exceeded
+    """
+    try:
+        # get_pull returns the full PR payload; read the fields straight from it
+        pr_data = repo.get_pull(pr_number).raw_data
+
+        if pr_data.get("merged"):
+            logger.info(f"PR #{pr_number} (Issue #{issue_number}) was merged")
+            return ResolutionStatus.MERGED
+        if pr_data.get("state") == _CLOSED_STATE:
+            logger.info(f"PR #{pr_number} (Issue #{issue_number}) was closed without merge")
+            return ResolutionStatus.CLOSED
+
+    except UnknownObjectException as e:
+        logger.warning(f"PR #{pr_number} not found (may have been deleted): {e}")
+    except RateLimitExceededException as e:
+        logger.error(f"GitHub rate limit exceeded while checking PR #{pr_number}: {e}")
+        raise RateLimitError("GitHub", retry_after=e.reset.timestamp() if hasattr(e, 'reset') else None)
+    except GithubException as e:
+        logger.error(f"GitHub API error checking PR #{pr_number}: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error checking PR #{pr_number}: {e}", exc_info=True)
+
+    return None
+
 
 def main():
     # Get GitHub token from environment
@@ -63,30 +111,13 @@ def main():
     # Initialize tracker
     tracker = OutcomeTracker()
 
-    # Get all resolved issues that might need status update
-    try:
-        conn = sqlite3.connect(tracker.db_path)
-        cursor = conn.cursor()
-    except sqlite3.Error as e:
-        logger.error(f"Failed to connect to database: {e}")
-        raise
-
-    # Find all resolved (but not merged/closed) issues with PR numbers
+    # Find all resolved (but not merged/closed) issues with PR numbers, on
+    # the tracker's own WAL-mode connection rather than a second one
     try:
-        cursor.execute("""
-            SELECT issue_number, pr_number
-            FROM outcomes
-            WHERE status = 'resolved'
-            AND pr_number IS NOT NULL
-            ORDER BY created_at DESC
-        """)
-
-        pending_prs = cursor.fetchall()
+        pending_prs = tracker.get_pending_prs()
     except sqlite3.Error as e:
         logger.error(f"Database query failed: {e}")
         raise
-    finally:
-        conn.close()
 
     if not pending_prs:
         logger.info("No PRs pending status update")
@@ -94,45 +125,39 @@ def main():
 
     logger.info(f"Found {len(pending_prs)} PR(s) to check")
 
-    updated_count = 0
-    for issue_number, pr_number in pending_prs:
+    # Each check is an HTTP round-trip, so fetch the PRs concurrently and
+    # apply the resulting status changes afterwards
+    updates = []
+    rate_limit_error = None
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pending_prs))) as executor:
+        futures = [
+            executor.submit(_check_pr, repo, issue_number, pr_number)
+            for issue_number, pr_number in pending_prs
+        ]
+        for (issue_number, pr_number), future in zip(pending_prs, futures):
+            try:
+                status = future.result()
+            except RateLimitError as e:
+                # Keep the statuses already fetched; raise once they're saved
+                rate_limit_error = rate_limit_error or e
+                continue
+            if status is not None:
+                updates.append((issue_number, status, pr_number))
+
+    if updates:
+        # One transaction (and one commit) for every status change
         try:
-            pr = repo.get_pull(pr_number)
-
-            if pr.merged:
-                logger.info(f"PR #{pr_number} (Issue #{issue_number}) was merged")
-                tracker.update_status(
-                    issue_number=issue_number,
-                    status=ResolutionStatus.MERGED,
-                    pr_number=pr_number
-                )
-                updated_count += 1
-            elif pr.state == "closed":
-                logger.info(f"PR #{pr_number} (Issue #{issue_number}) was closed without merge")
-                tracker.update_status(
-                    issue_number=issue_number,
-                    status=ResolutionStatus.CLOSED,
-                    pr_number=pr_number
-                )
-                updated_count += 1
-
-        except UnknownObjectException as e:
-            logger.warning(f"PR #{pr_number} not found (may have been deleted): {e}")
-            continue
-        except RateLimitExceededException as e:
-            logger.error(f"GitHub rate limit exceeded while checking PR #{pr_number}: {e}")
-            raise RateLimitError("GitHub", retry_after=e.reset.timestamp() if hasattr(e, 'reset') else None)
-        except GithubException as e:
-            logger.error(f"GitHub API error checking PR #{pr_number}: {e}")
-            continue
+            tracker.update_statuses(updates)
         except sqlite3.Error as e:
-            logger.error(f"Database error updating PR #{pr_number} status: {e}")
-            continue
-        except Exception as e:
-            logger.error(f"Unexpected error checking PR #{pr_number}: {e}", exc_info=True)
-            continue
+            logger.error(f"Database error updating PR statuses: {e}")
+            raise
+
+        logger.info(f"Updated {len(updates)} PR status(es)")
+    else:
+        logger.info("No PR status changes")
 
-    logger.info(f"Updated {updated_count} PR status(es)")
+    if rate_limit_error is not None:
+        raise rate_limit_error
 
 
 if __name__ == "__main__":
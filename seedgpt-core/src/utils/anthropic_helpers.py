@@ -4,11 +4,18 @@ Anthropic API Helper Functions
 Centralized utilities for calling Anthropic API with retry logic.
 """
 
-from typing import Optional
-from anthropic import Anthropic
+import json
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
 from logging_config import get_logger
+from utils import json_helpers
+from utils.exceptions import TimeoutError as SeedGPTTimeoutError
 from utils.retry import retry_anthropic_api
 
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+
 logger = get_logger(__name__)
 
 
@@ -33,6 +40,9 @@ def call_anthropic_api(
     Returns:
         str: Response text from the API
     """
+    # Deferred so importing these helpers doesn't load the SDK
+    from anthropic import Anthropic
+
     client = Anthropic(api_key=api_key)
     
     kwargs = {
@@ -46,3 +56,178 @@ def call_anthropic_api(
     
     message = client.messages.create(**kwargs)
     return message.content[0].text
+
+
+@retry_anthropic_api
+def stream_anthropic_json(
+    api_key: str,
+    prompt: str,
+    model: str,
+    max_tokens: int,
+    system_prompt: Optional[str] = None
+) -> str:
+    """
+    Stream a response that should hold one JSON object, with retry logic
+
+    Reading stops as soon as a top-level object closes and parses, so any
+    trailing text (closing code fence, commentary) is never waited for.
+    Balanced braces that don't parse (e.g. "{name}" in leading prose) are
+    skipped and reading continues.
+
+    Args:
+        api_key: Anthropic API key
+        prompt: User prompt/message
+        model: Model name to use
+        max_tokens: Maximum tokens in response
+        system_prompt: Optional system prompt
+
+    Returns:
+        str: The JSON object's text (the whole response if no object
+            closes and parses)
+    """
+    from anthropic import Anthropic
+
+    client = Anthropic(api_key=api_key)
+
+    kwargs = {
+        "model": model,
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": prompt}]
+    }
+
+    if system_prompt:
+        kwargs["system"] = system_prompt
+
+    parts = []
+    offset = 0  # Length of the text before the current chunk
+    start = 0  # Index of the `{` that opened the current object
+    depth = 0
+    in_string = False
+    escaped = False
+
+    with client.messages.stream(**kwargs) as stream:
+        for chunk in stream.text_stream:
+            parts.append(chunk)
+            for i, ch in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"' and depth:
+                    in_string = True
+                elif ch == "{":
+                    if not depth:
+                        start = offset + i
+                    depth += 1
+                elif ch == "}" and depth:
+                    depth -= 1
+                    if depth == 0:
+                        candidate = "".join(parts)[start:offset + i + 1]
+                        try:
+                            json_helpers.loads(candidate)
+                        except json.JSONDecodeError:
+                            # Braces in prose, not the object; keep reading
+                            continue
+                        # Leaving the context manager closes the stream
+                        return candidate
+            offset += len(chunk)
+
+    return "".join(parts)
+
+
+@retry_anthropic_api
+def submit_message_batch(
+    api_key: str,
+    prompts: Dict[str, str],
+    model: str,
+    max_tokens: int,
+    system_prompt: Optional[str] = None
+) -> str:
+    """
+    Submit prompts to the Message Batches API with retry logic
+
+    Batched requests are billed at half the price of synchronous calls and
+    are processed asynchronously.
+
+    Args:
+        api_key: Anthropic API key
+        prompts: Mapping of custom_id (1-64 chars of [A-Za-z0-9_-]) to prompt
+        model: Model name to use
+        max_tokens: Maximum tokens in each response
+        system_prompt: Optional system prompt shared by every request
+
+    Returns:
+        str: ID of the created batch
+    """
+    from anthropic import Anthropic
+
+    client = Anthropic(api_key=api_key)
+
+    requests = []
+    for custom_id, prompt in prompts.items():
+        params = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system_prompt:
+            params["system"] = system_prompt
+        requests.append({"custom_id": custom_id, "params": params})
+
+    batch = client.messages.batches.create(requests=requests)
+    logger.info(f"Submitted message batch {batch.id} with {len(requests)} request(s)")
+    return batch.id
+
+
+@retry_anthropic_api
+def _get_batch_status(client: "Anthropic", batch_id: str) -> str:
+    """Fetch a batch's processing status with retry logic"""
+    return client.messages.batches.retrieve(batch_id).processing_status
+
+
+def get_message_batch_results(
+    api_key: str,
+    batch_id: str,
+    poll_interval: float = 30.0,
+    max_wait_seconds: int = 3600
+) -> Dict[str, Optional[str]]:
+    """
+    Wait for a message batch to finish and collect its responses
+
+    Args:
+        api_key: Anthropic API key
+        batch_id: ID returned by submit_message_batch
+        poll_interval: Seconds between status checks
+        max_wait_seconds: Give up after this many seconds
+
+    Returns:
+        Dict mapping custom_id to response text, or None if that request
+        errored, was canceled or expired
+
+    Raises:
+        TimeoutError: If the batch has not ended within max_wait_seconds
+    """
+    from anthropic import Anthropic
+
+    client = Anthropic(api_key=api_key)
+    deadline = time.monotonic() + max_wait_seconds
+
+    while _get_batch_status(client, batch_id) != "ended":
+        if time.monotonic() >= deadline:
+            raise SeedGPTTimeoutError(f"message batch {batch_id}", max_wait_seconds)
+        logger.debug(f"Message batch {batch_id} still processing, checking again in {poll_interval}s")
+        time.sleep(poll_interval)
+
+    responses: Dict[str, Optional[str]] = {}
+    for entry in client.messages.batches.results(batch_id):
+        if entry.result.type == "succeeded":
+            responses[entry.custom_id] = entry.result.message.content[0].text
+        else:
+            logger.warning(f"Batch request {entry.custom_id} did not succeed: {entry.result.type}")
+            responses[entry.custom_id] = None
+
+    logger.info(f"Collected {len(responses)} result(s) from message batch {batch_id}")
+    return responses
@@ -11,6 +11,7 @@ Uses multiple techniques:
 5. Quality scoring (clarity, actionability, scope)
 """
 
+import importlib.util
 import re
 import math
 from typing import List, Dict, Tuple, Any, Optional
@@ -24,12 +25,9 @@ from utils.exceptions import (
 
 logger = get_logger(__name__)
 
-# Try to import Anthropic for embeddings
-try:
-    from anthropic import Anthropic
-    EMBEDDINGS_AVAILABLE = True
-except ImportError:
-    EMBEDDINGS_AVAILABLE = False
+# Anthropic SDK for embeddings - only imported once a client is needed
+EMBEDDINGS_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not EMBEDDINGS_AVAILABLE:
     logger.warning("Anthropic SDK not available - semantic similarity disabled")
 
 
@@ -72,6 +70,8 @@ class IssueDuplicateChecker:
         self.anthropic_client = None
         if self.enable_semantic_dedup and anthropic_api_key:
             try:
+                from anthropic import Anthropic
+
                 self.anthropic_client = Anthropic(api_key=anthropic_api_key)
                 logger.info("Semantic deduplication enabled with embeddings")
             except Exception as e:
@@ -169,14 +169,27 @@ class IssueDuplicateChecker:
         Returns:
             Dictionary with similarity scores and combined score
         """
-        # Calculate title similarities
-        title_seq_sim = self.calculate_sequence_similarity(title1, title2)
-        title_jaccard_sim = self.calculate_jaccard_similarity(title1, title2)
-        title_similarity = max(title_seq_sim, title_jaccard_sim)
+        return self._combine_scores(
+            self.calculate_sequence_similarity(title1, title2),
+            self.calculate_jaccard_similarity(title1, title2),
+            self.calculate_sequence_similarity(body1, body2),
+            self.calculate_jaccard_similarity(body1, body2),
+            title1, body1, title2, body2,
+        )
 
-        # Calculate body similarities
-        body_seq_sim = self.calculate_sequence_similarity(body1, body2)
-        body_jaccard_sim = self.calculate_jaccard_similarity(body1, body2)
+    def _combine_scores(
+        self,
+        title_seq_sim: float,
+        title_jaccard_sim: float,
+        body_seq_sim: float,
+        body_jaccard_sim: float,
+        title1: str,
+        body1: str,
+        title2: str,
+        body2: str,
+    ) -> Dict[str, float]:
+        """Combine per-field similarity scores into the scores dictionary"""
+        title_similarity = max(title_seq_sim, title_jaccard_sim)
         body_similarity = max(body_seq_sim, body_jaccard_sim)
 
         # Calculate combined score (weighted: title is more important)
@@ -199,6 +212,57 @@ class IssueDuplicateChecker:
 
         return result
 
+    def _prepare_text(self, text: str) -> Optional[Tuple[SequenceMatcher, set]]:
+        """
+        Normalize text once and index it as the fixed side of a SequenceMatcher
+
+        SequenceMatcher indexes its second sequence, so keeping an existing
+        issue there lets every proposed issue reuse that work.
+
+        Args:
+            text: Text to prepare
+
+        Returns:
+            Tuple of (matcher, word set), or None for empty text
+        """
+        if not text:
+            return None
+
+        normalized = self.normalize_text(text)
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(normalized)
+        return matcher, set(normalized.split())
+
+    def _prepared_similarity(
+        self, text: str, prepared: Optional[Tuple[SequenceMatcher, set]]
+    ) -> Tuple[float, float]:
+        """
+        Sequence and Jaccard similarity of text against a prepared text
+
+        Matches calculate_sequence_similarity and calculate_jaccard_similarity.
+
+        Args:
+            text: Text to compare
+            prepared: Result of _prepare_text for the other text
+
+        Returns:
+            Tuple of (sequence similarity, Jaccard similarity)
+        """
+        if not text or prepared is None:
+            return 0.0, 0.0
+
+        matcher, words2 = prepared
+        normalized = self.normalize_text(text)
+        matcher.set_seq1(normalized)
+        sequence_sim = matcher.ratio()
+
+        words1 = set(normalized.split())
+        if not words1 or not words2:
+            return sequence_sim, 0.0
+
+        union = len(words1 | words2)
+        return sequence_sim, (len(words1 & words2) / union if union > 0 else 0.0)
+
     def _get_embedding(self, text: str) -> Optional[List[float]]:
         """
         Get embedding for text using Anthropic API with caching
@@ -505,7 +569,10 @@ class IssueDuplicateChecker:
             new_title, new_body, existing_title, existing_body
         )
 
-        # Check if it's a duplicate based on thresholds
+        return self._is_duplicate_scores(scores), scores
+
+    def _is_duplicate_scores(self, scores: Dict[str, float]) -> bool:
+        """Apply the duplicate thresholds to a scores dictionary"""
         is_dup = (
             scores["title_similarity"] >= self.title_threshold
             or scores["combined_similarity"] >= self.combined_threshold
@@ -516,7 +583,7 @@ class IssueDuplicateChecker:
             if scores["semantic_similarity"] >= self.semantic_threshold:
                 is_dup = True
 
-        return is_dup, scores
+        return is_dup
 
     def find_duplicates(
         self,
@@ -535,17 +602,43 @@ class IssueDuplicateChecker:
         Returns:
             List of tuples (issue, similarity_scores) for all duplicates found
         """
-        duplicates = []
+        return self._find_prepared_duplicates(
+            new_title, new_body, self._prepare_issues(existing_issues)
+        )
 
+    def _prepare_issues(self, existing_issues: List[Any]) -> List[Tuple[Any, str, str, Any, Any]]:
+        """Prepare each existing issue's title and body for repeated comparison"""
+        prepared = []
         for existing_issue in existing_issues:
             existing_title = getattr(existing_issue, 'title', '')
             existing_body = getattr(existing_issue, 'body', '') or ''
+            prepared.append((
+                existing_issue,
+                existing_title,
+                existing_body,
+                self._prepare_text(existing_title),
+                self._prepare_text(existing_body),
+            ))
+        return prepared
+
+    def _find_prepared_duplicates(
+        self,
+        new_title: str,
+        new_body: str,
+        prepared_issues: List[Tuple[Any, str, str, Any, Any]],
+    ) -> List[Tuple[Any, Dict[str, float]]]:
+        """find_duplicates against issues from _prepare_issues"""
+        duplicates = []
 
-            is_dup, scores = self.is_duplicate(
-                new_title, new_body, existing_title, existing_body
+        for existing_issue, existing_title, existing_body, title_prep, body_prep in prepared_issues:
+            title_seq_sim, title_jaccard_sim = self._prepared_similarity(new_title, title_prep)
+            body_seq_sim, body_jaccard_sim = self._prepared_similarity(new_body, body_prep)
+            scores = self._combine_scores(
+                title_seq_sim, title_jaccard_sim, body_seq_sim, body_jaccard_sim,
+                new_title, new_body, existing_title, existing_body,
             )
 
-            if is_dup:
+            if self._is_duplicate_scores(scores):
                 duplicates.append((existing_issue, scores))
 
         # Sort by combined similarity (highest first)
@@ -575,6 +668,7 @@ class IssueDuplicateChecker:
         non_duplicates = []
         duplicates_found = []
         quality_rejected = []
+        prepared_issues = self._prepare_issues(existing_issues)
 
         for new_issue in new_issues:
             new_title = new_issue.get("title", "")
@@ -606,7 +700,7 @@ class IssueDuplicateChecker:
                     continue  # Skip this issue
 
             # Find duplicates
-            duplicate_matches = self.find_duplicates(new_title, new_body, existing_issues)
+            duplicate_matches = self._find_prepared_duplicates(new_title, new_body, prepared_issues)
 
             if duplicate_matches:
                 # Found at least one duplicate
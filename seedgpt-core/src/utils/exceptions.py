@@ -229,9 +229,9 @@ class AgentResponseError(AgentError):
 class AgentTimeoutError(AgentError):
     """Raised when AI agent operation times out."""
 
-    def __init__(self, operation: str, timeout_seconds: int):
+    def __init__(self, operation: str, timeout_seconds: float):
         super().__init__(
-            f"Agent operation '{operation}' timed out after {timeout_seconds}s",
+            f"Agent operation '{operation}' timed out after {timeout_seconds:g}s",
             details={
                 "operation": operation,
                 "timeout_seconds": timeout_seconds
@@ -0,0 +1,97 @@
+"""
+GitHub Response Cache
+
+On-disk cache for GitHub API GET responses. Fresh entries are served without
+a request; stale entries are revalidated with If-None-Match, and a 304 reply
+(which does not count against the rate limit) keeps the cached body.
+"""
+
+import gzip
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from logging_config import get_logger
+from utils import json_helpers
+
+logger = get_logger(__name__)
+
+CACHE_DIR = Path.cwd() / ".seedgpt" / "github_cache"
+
+
+def _cache_file(repo_full_name: str, endpoint_key: str, params: Optional[Dict[str, Any]]) -> Path:
+    """Map a repository endpoint (and its query parameters) to a cache file"""
+    key = f"{repo_full_name}|{endpoint_key}|{sorted((params or {}).items())}"
+    return CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json.gz"
+
+
+def _load_entry(path: Path) -> Optional[Dict[str, Any]]:
+    """Load a cache entry, treating any unreadable file as a miss"""
+    try:
+        with gzip.open(path, "rb") as f:
+            return json_helpers.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+        return None
+
+
+def _save_entry(path: Path, entry: Dict[str, Any]) -> None:
+    """Write a cache entry atomically; failures only cost a future request"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(json_helpers.dumps(entry).encode("utf-8"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Failed to write cache entry {path}: {e}")
+
+
+def cached_get(repo, endpoint_key: str, path: str, ttl: int,
+               params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a repository endpoint's JSON through the on-disk cache
+
+    Args:
+        repo: PyGithub Repository object
+        endpoint_key: Short name for the endpoint (e.g. "readme")
+        path: Endpoint path relative to the repository URL (e.g. "/readme")
+        ttl: Seconds a cached response is served without revalidation
+        params: Query parameters
+
+    Returns:
+        Any: Decoded JSON response
+
+    Raises:
+        GithubException: If the request fails (not cached)
+    """
+    cache_file = _cache_file(repo.full_name, endpoint_key, params)
+    entry = _load_entry(cache_file)
+    now = time.time()
+
+    if entry and now - entry["timestamp"] < ttl:
+        logger.debug(f"GitHub cache hit: {repo.full_name} {endpoint_key}")
+        return entry["data"]
+
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+    response_headers, data = repo._requester.requestJsonAndCheck(
+        "GET", f"{repo.url}{path}", parameters=params, headers=headers
+    )
+
+    if entry and data is None:
+        # 304 Not Modified - the cached body is still current
+        logger.debug(f"GitHub cache revalidated: {repo.full_name} {endpoint_key}")
+        entry["timestamp"] = now
+        _save_entry(cache_file, entry)
+        return entry["data"]
+
+    _save_entry(cache_file, {
+        "etag": response_headers.get("etag"),
+        "timestamp": now,
+        "data": data,
+    })
+    return data
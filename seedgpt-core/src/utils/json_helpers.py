@@ -0,0 +1,64 @@
+"""
+JSON Helper Functions
+
+Fast JSON encode/decode using orjson when it is installed, falling back to
+ujson for decoding and then the standard library json module otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
+try:
+    import ujson
+    USE_UJSON = True
+except ImportError:
+    USE_UJSON = False
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize an object to a JSON string
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with a two-space indent
+
+    Returns:
+        str: JSON document
+    """
+    if USE_ORJSON:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON document
+
+    Args:
+        data: JSON text or UTF-8 bytes
+
+    Returns:
+        Any: Decoded object
+
+    Raises:
+        json.JSONDecodeError: If the document is invalid (orjson's
+            JSONDecodeError subclasses it)
+    """
+    if USE_ORJSON:
+        return orjson.loads(data)
+    if USE_UJSON:
+        try:
+            return ujson.loads(data)
+        except ValueError as e:
+            # Keep the json.JSONDecodeError contract callers catch
+            doc = data.decode("utf-8", errors="replace") if isinstance(data, bytes) else data
+            raise json.JSONDecodeError(str(e), doc, 0) from e
+    return json.loads(data)
@@ -11,13 +11,22 @@ Tracks:
 Enables the system to learn what works and adapt generation prompts dynamically.
 """
 
-import json
+import re
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from math import exp as _exp, e as _E
+
+from . import json_helpers
+
+_E_INV = 1.0 / _E
 
 
 class ResolutionStatus(Enum):
@@ -30,6 +39,11 @@ class ResolutionStatus(Enum):
     TIMEOUT = "timeout"    # Took too long
 
 
+# Status values that mark an attempt as resolved / merged
+_RESOLVED_STATES = frozenset({ResolutionStatus.RESOLVED.value, ResolutionStatus.MERGED.value})
+_MERGE_STATE = ResolutionStatus.MERGED.value
+
+
 class IssueType(Enum):
     """Categorization of issues"""
     FEATURE = "feature"
@@ -43,7 +57,29 @@ class IssueType(Enum):
     OTHER = "other"
 
 
-@dataclass
+# Label keyword -> issue type, in classification priority order
+_TYPE_KEYWORDS: Dict[str, str] = {
+    'security': IssueType.SECURITY.value,
+    'bug': IssueType.BUG.value,
+    'performance': IssueType.PERFORMANCE.value,
+    'ci/cd': IssueType.CI_CD.value,
+    'ci-cd': IssueType.CI_CD.value,
+    'test': IssueType.TEST.value,
+    'documentation': IssueType.DOCUMENTATION.value,
+    'docs': IssueType.DOCUMENTATION.value,
+    'refactor': IssueType.REFACTOR.value,
+    'refactoring': IssueType.REFACTOR.value,
+    'feature': IssueType.FEATURE.value,
+    'enhancement': IssueType.FEATURE.value,
+}
+_TYPE_PRIORITY = {keyword: i for i, keyword in enumerate(_TYPE_KEYWORDS)}
+# Longer keywords first so e.g. "documentation" wins over a partial match
+_TYPE_KEYWORD_PATTERN = re.compile(
+    "|".join(re.escape(k) for k in sorted(_TYPE_KEYWORDS, key=len, reverse=True))
+)
+
+
+@dataclass(slots=True)
 class OutcomeRecord:
     """Record of a single issue resolution attempt"""
     issue_number: int
@@ -65,7 +101,7 @@ class OutcomeRecord:
             self.created_at = datetime.utcnow().isoformat()
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeSuccessMetrics:
     """Success metrics for a specific issue type"""
     issue_type: str
@@ -80,9 +116,68 @@ class TypeSuccessMetrics:
     weight: float  # Dynamic weight based on success rate
 
 
+# Column order of the get_recent_outcomes / iter_recent_outcomes query
+_RECENT_COLUMNS = (
+    'issue_number', 'issue_title', 'issue_type', 'labels', 'status',
+    'pr_number', 'created_at', 'resolved_at', 'merged_at',
+    'time_to_resolve_minutes', 'time_to_merge_minutes',
+    'files_changed', 'error_message'
+)
+_RECENT_FETCH_SIZE = 50
+
+
 class OutcomeTracker:
     """Tracks issue resolution outcomes and provides analytics"""
 
+    # Kept as constants so sqlite3's statement cache reuses the compiled plan
+    # Timestamps are bound once as epoch milliseconds (?6) and formatted
+    # to ISO text by SQLite
+    _INSERT_SQL = """
+        INSERT INTO outcomes
+        (issue_number, issue_title, issue_type, labels, status,
+         created_at, created_at_epoch, updated_at, files_changed)
+        VALUES (?1, ?2, ?3, ?4, ?5,
+                strftime('%Y-%m-%dT%H:%M:%f', ?6 / 1000.0, 'unixepoch'), ?6,
+                strftime('%Y-%m-%dT%H:%M:%f', ?6 / 1000.0, 'unixepoch'), ?7)
+    """
+
+    # Durations are integer arithmetic on epoch milliseconds; rows written
+    # before created_at_epoch existed fall back to julianday() on the
+    # ISO created_at text. Everything runs in one statement against the
+    # latest attempt for this issue.
+    _UPDATE_STATUS_SQL = """
+        UPDATE outcomes
+        SET
+            status = :status,
+            updated_at = strftime('%Y-%m-%dT%H:%M:%f', :now_ms / 1000.0, 'unixepoch'),
+            pr_number = COALESCE(:pr_number, pr_number),
+            files_changed = COALESCE(:files_changed, files_changed),
+            error_message = COALESCE(:error_message, error_message),
+            resolved_at = CASE
+                WHEN :is_resolved AND resolved_at IS NULL
+                THEN strftime('%Y-%m-%dT%H:%M:%f', :now_ms / 1000.0, 'unixepoch')
+                ELSE resolved_at END,
+            time_to_resolve_minutes = CASE
+                WHEN :is_resolved AND time_to_resolve_minutes IS NULL
+                THEN COALESCE(
+                    (:now_ms - created_at_epoch) / 60000,
+                    CAST((julianday('now') - julianday(created_at)) * 1440 AS INTEGER))
+                ELSE time_to_resolve_minutes END,
+            merged_at = CASE
+                WHEN :is_merged
+                THEN strftime('%Y-%m-%dT%H:%M:%f', :now_ms / 1000.0, 'unixepoch')
+                ELSE merged_at END,
+            time_to_merge_minutes = CASE
+                WHEN :is_merged
+                THEN COALESCE(
+                    (:now_ms - created_at_epoch) / 60000,
+                    CAST((julianday('now') - julianday(created_at)) * 1440 AS INTEGER))
+                ELSE time_to_merge_minutes END
+        WHERE id = (
+            SELECT MAX(id) FROM outcomes WHERE issue_number = :issue_number
+        )
+    """
+
     def __init__(self, db_path: Optional[Path] = None):
         """
         Initialize outcome tracker
@@ -95,13 +190,97 @@ class OutcomeTracker:
 
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Single long-lived connection in autocommit mode; write methods
+        # wrap their statements in explicit BEGIN/COMMIT
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+
+        # Per-thread read-only connections used by _run_read_only()
+        self._local = threading.local()
+
+        # All-time get_type_metrics result; cleared on every write. Windowed
+        # (`days`) results aren't cached since their cutoff moves with time.
+        self._metrics_cache: Dict[Optional[int], Dict[str, TypeSuccessMetrics]] = {}
+
+        # get_overall_stats result; cleared on every write
+        self._overall_stats_cache: Optional[Dict] = None
+
+        # Bumped on every write; a read only fills a cache if no write
+        # landed between its query and the store
+        self._cache_generation = 0
+
         self._init_database()
 
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            # Re-analyzes only tables whose statistics have gone stale
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run a block of writes inside an explicit transaction"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                yield cursor
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """
+        Provide a connection for read queries
+
+        Inside _run_read_only() this is the worker's private read-only
+        connection and no lock is taken; otherwise it is the shared
+        connection, held under the lock.
+        """
+        conn = getattr(self._local, 'read_conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with self._lock:
+            yield self._conn
+
+    def _run_read_only(self, func, *args):
+        """Run a read method on a private query_only connection"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA query_only=1")
+        self._local.read_conn = conn
+        try:
+            return func(*args)
+        finally:
+            del self._local.read_conn
+            conn.close()
+
+    def _invalidate_cache(self):
+        """Drop cached metrics after a write"""
+        with self._lock:
+            self._cache_generation += 1
+            self._metrics_cache.clear()
+            self._overall_stats_cache = None
+
     def _init_database(self):
         """Initialize SQLite database schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as cursor:
+            self._create_schema(cursor)
 
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Create the outcomes table and its indexes"""
         # Main outcomes table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS outcomes (
@@ -113,6 +292,7 @@ class OutcomeTracker:
                 status TEXT NOT NULL,
                 pr_number INTEGER,
                 created_at TEXT NOT NULL,
+                created_at_epoch INTEGER,
                 resolved_at TEXT,
                 merged_at TEXT,
                 time_to_resolve_minutes INTEGER,
@@ -123,6 +303,16 @@ class OutcomeTracker:
             )
         """)
 
+        # Databases created before created_at_epoch existed
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(outcomes)")}
+        if 'created_at_epoch' not in columns:
+            cursor.execute("ALTER TABLE outcomes ADD COLUMN created_at_epoch INTEGER")
+
+        # Statistics only need a full ANALYZE when the indexes are first built
+        indexes_existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_metrics_cov'"
+        ).fetchone() is not None
+
         # Index for fast lookups
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_issue_number
@@ -139,8 +329,23 @@ class OutcomeTracker:
             ON outcomes(status)
         """)
 
-        conn.commit()
-        conn.close()
+        # Covering index for the per-type aggregation in get_type_metrics
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_metrics_cov
+            ON outcomes(issue_type, status, created_at,
+                        time_to_resolve_minutes, time_to_merge_minutes)
+        """)
+
+        # Index for the time-window filter
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_created_at
+            ON outcomes(created_at)
+        """)
+
+        # Gather planner statistics so the indexes above get used; later
+        # refreshes are left to PRAGMA optimize in close()
+        if not indexes_existed:
+            cursor.execute("ANALYZE outcomes")
 
     def record_attempt(self,
                       issue_number: int,
@@ -159,42 +364,52 @@ class OutcomeTracker:
         Returns:
             Database record ID
         """
-        # Determine issue type from labels
-        issue_type = self._classify_issue_type(labels)
+        with self._transaction() as cursor:
+            cursor.execute(
+                self._INSERT_SQL,
+                self._build_insert_params(issue_number, issue_title, labels, status)
+            )
+            record_id = cursor.lastrowid
+        self._invalidate_cache()
 
-        record = OutcomeRecord(
-            issue_number=issue_number,
-            issue_title=issue_title,
-            issue_type=issue_type,
-            labels=json.dumps(labels),
-            status=status.value
-        )
+        return record_id
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def record_attempts(self,
+                       attempts: List[Tuple[int, str, List[str]]],
+                       status: ResolutionStatus = ResolutionStatus.PENDING):
+        """
+        Record several issue resolution attempts in one transaction
 
-        now = datetime.utcnow().isoformat()
-        cursor.execute("""
-            INSERT INTO outcomes
-            (issue_number, issue_title, issue_type, labels, status,
-             created_at, updated_at, files_changed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            record.issue_number,
-            record.issue_title,
-            record.issue_type,
-            record.labels,
-            record.status,
-            record.created_at,
-            now,
-            record.files_changed
-        ))
-
-        record_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        Args:
+            attempts: (issue_number, issue_title, labels) tuples
+            status: Initial status for every attempt (default: PENDING)
+        """
+        params = [
+            self._build_insert_params(issue_number, issue_title, labels, status)
+            for issue_number, issue_title, labels in attempts
+        ]
+        with self._transaction() as cursor:
+            cursor.executemany(self._INSERT_SQL, params)
+        self._invalidate_cache()
+
+    def _build_insert_params(self,
+                             issue_number: int,
+                             issue_title: str,
+                             labels: List[str],
+                             status: ResolutionStatus) -> Tuple:
+        """Build the parameter tuple for _INSERT_SQL"""
+        # Determine issue type from labels
+        issue_type = self._classify_issue_type(labels)
 
-        return record_id
+        return (
+            issue_number,
+            issue_title,
+            issue_type,
+            json_helpers.dumps(labels),
+            status.value,
+            int(time.time() * 1000),
+            0
+        )
 
     def update_status(self,
                      issue_number: int,
@@ -212,78 +427,48 @@ class OutcomeTracker:
             files_changed: Number of files changed
             error_message: Error message if failed
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get the existing record
-        cursor.execute("""
-            SELECT created_at FROM outcomes
-            WHERE issue_number = ?
-            ORDER BY created_at DESC LIMIT 1
-        """, (issue_number,))
+        with self._transaction() as cursor:
+            cursor.execute(
+                self._UPDATE_STATUS_SQL,
+                self._build_update_params(issue_number, status, pr_number,
+                                          files_changed, error_message)
+            )
+        self._invalidate_cache()
 
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return
+    def update_statuses(self,
+                        updates: List[Tuple[int, ResolutionStatus, Optional[int]]]):
+        """
+        Update the status of several issue resolution attempts in one transaction
 
-        created_at = datetime.fromisoformat(result[0])
-        now = datetime.utcnow()
-        updated_at = now.isoformat()
-
-        # Calculate time to resolve
-        time_to_resolve = None
-        resolved_at = None
-        if status in [ResolutionStatus.RESOLVED, ResolutionStatus.MERGED]:
-            resolved_at = updated_at
-            time_to_resolve = int((now - created_at).total_seconds() / 60)
-
-        # Calculate time to merge
-        time_to_merge = None
-        merged_at = None
-        if status == ResolutionStatus.MERGED:
-            merged_at = updated_at
-            time_to_merge = int((now - created_at).total_seconds() / 60)
-
-        # Build update query
-        update_fields = [
-            "status = ?",
-            "updated_at = ?"
+        Args:
+            updates: (issue_number, status, pr_number) tuples
+        """
+        params = [
+            self._build_update_params(issue_number, status, pr_number)
+            for issue_number, status, pr_number in updates
         ]
-        params = [status.value, updated_at]
-
-        if pr_number is not None:
-            update_fields.append("pr_number = ?")
-            params.append(pr_number)
-
-        if files_changed is not None:
-            update_fields.append("files_changed = ?")
-            params.append(files_changed)
-
-        if resolved_at is not None:
-            update_fields.append("resolved_at = ?")
-            update_fields.append("time_to_resolve_minutes = ?")
-            params.extend([resolved_at, time_to_resolve])
-
-        if merged_at is not None:
-            update_fields.append("merged_at = ?")
-            update_fields.append("time_to_merge_minutes = ?")
-            params.extend([merged_at, time_to_merge])
-
-        if error_message is not None:
-            update_fields.append("error_message = ?")
-            params.append(error_message)
-
-        params.append(issue_number)
-
-        cursor.execute(f"""
-            UPDATE outcomes
-            SET {', '.join(update_fields)}
-            WHERE issue_number = ?
-        """, params)
-
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.executemany(self._UPDATE_STATUS_SQL, params)
+        self._invalidate_cache()
+
+    def _build_update_params(self,
+                             issue_number: int,
+                             status: ResolutionStatus,
+                             pr_number: Optional[int] = None,
+                             files_changed: Optional[int] = None,
+                             error_message: Optional[str] = None) -> Dict:
+        """Build the parameter mapping for _UPDATE_STATUS_SQL"""
+        status_value = status.value
+        return {
+            'status': status_value,
+            'is_resolved': status_value in _RESOLVED_STATES,
+            'is_merged': status_value == _MERGE_STATE,
+            'now_ms': int(time.time() * 1000),
+            'pr_number': pr_number,
+            'files_changed': files_changed,
+            'error_message': error_message,
+            'issue_number': issue_number,
+        }
 
     def get_type_metrics(self,
                         days: Optional[int] = None) -> Dict[str, TypeSuccessMetrics]:
@@ -296,8 +481,10 @@ class OutcomeTracker:
         Returns:
             Dictionary mapping issue type to metrics
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            if days in self._metrics_cache:
+                return dict(self._metrics_cache[days])
+            generation = self._cache_generation
 
         # Build date filter
         date_filter = ""
@@ -308,22 +495,25 @@ class OutcomeTracker:
             params.append(cutoff)
 
         # Query for aggregated metrics by type
-        cursor.execute(f"""
-            SELECT
-                issue_type,
-                COUNT(*) as total_attempts,
-                SUM(CASE WHEN status IN ('resolved', 'merged') THEN 1 ELSE 0 END) as resolved_count,
-                SUM(CASE WHEN status = 'merged' THEN 1 ELSE 0 END) as merged_count,
-                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_count,
-                AVG(CASE WHEN time_to_resolve_minutes IS NOT NULL THEN time_to_resolve_minutes END) as avg_resolve_time,
-                AVG(CASE WHEN time_to_merge_minutes IS NOT NULL THEN time_to_merge_minutes END) as avg_merge_time
-            FROM outcomes
-            {date_filter}
-            GROUP BY issue_type
-        """, params)
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT
+                    issue_type,
+                    COUNT(*) as total_attempts,
+                    SUM(CASE WHEN status IN ('resolved', 'merged') THEN 1 ELSE 0 END) as resolved_count,
+                    SUM(CASE WHEN status = 'merged' THEN 1 ELSE 0 END) as merged_count,
+                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_count,
+                    AVG(CASE WHEN time_to_resolve_minutes IS NOT NULL THEN time_to_resolve_minutes END) as avg_resolve_time,
+                    AVG(CASE WHEN time_to_merge_minutes IS NOT NULL THEN time_to_merge_minutes END) as avg_merge_time
+                FROM outcomes
+                {date_filter}
+                GROUP BY issue_type
+            """, params)
+            rows = cursor.fetchall()
 
         metrics = {}
-        for row in cursor.fetchall():
+        for row in rows:
             (issue_type, total, resolved, merged, failed,
              avg_resolve, avg_merge) = row
 
@@ -349,8 +539,12 @@ class OutcomeTracker:
                 weight=weight
             )
 
-        conn.close()
-        return metrics
+        if days is None:
+            with self._lock:
+                if generation == self._cache_generation:
+                    self._metrics_cache[days] = metrics
+
+        return dict(metrics)
 
     def get_recent_outcomes(self, limit: int = 10) -> List[Dict]:
         """
@@ -362,54 +556,84 @@ class OutcomeTracker:
         Returns:
             List of outcome records as dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return list(self.iter_recent_outcomes(limit))
 
-        cursor.execute("""
-            SELECT
-                issue_number, issue_title, issue_type, labels, status,
-                pr_number, created_at, resolved_at, merged_at,
-                time_to_resolve_minutes, time_to_merge_minutes,
-                files_changed, error_message
-            FROM outcomes
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,))
-
-        columns = [
-            'issue_number', 'issue_title', 'issue_type', 'labels', 'status',
-            'pr_number', 'created_at', 'resolved_at', 'merged_at',
-            'time_to_resolve_minutes', 'time_to_merge_minutes',
-            'files_changed', 'error_message'
-        ]
+    def iter_recent_outcomes(self, limit: int = 10) -> Iterator[Dict]:
+        """
+        Lazily yield most recent outcome records, newest first
 
-        results = []
-        for row in cursor.fetchall():
-            record = dict(zip(columns, row))
-            # Parse labels JSON
-            record['labels'] = json.loads(record['labels'])
-            results.append(record)
+        Rows are fetched in small batches and labels are only decoded for
+        records that are actually consumed, so callers can stop early
+        (e.g. with itertools.islice) without materializing the full result.
 
-        conn.close()
-        return results
+        Args:
+            limit: Maximum number of records to yield
 
-    def get_overall_stats(self) -> Dict:
-        """Get overall statistics across all issue types"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        Yields:
+            Outcome records as dictionaries
+        """
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    issue_number, issue_title, issue_type, labels, status,
+                    pr_number, created_at, resolved_at, merged_at,
+                    time_to_resolve_minutes, time_to_merge_minutes,
+                    files_changed, error_message
+                FROM outcomes
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            """, (limit,))
+
+        while True:
+            with self._reading():
+                rows = cursor.fetchmany(_RECENT_FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                record = dict(zip(_RECENT_COLUMNS, row))
+                # Parse labels JSON
+                record['labels'] = json_helpers.loads(record['labels'])
+                yield record
+
+    def get_pending_prs(self) -> List[Tuple[int, int]]:
+        """
+        Find resolved outcomes whose PR has not been merged or closed yet
 
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status IN ('resolved', 'merged') THEN 1 ELSE 0 END) as resolved,
-                SUM(CASE WHEN status = 'merged' THEN 1 ELSE 0 END) as merged,
-                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed,
-                AVG(CASE WHEN time_to_resolve_minutes IS NOT NULL THEN time_to_resolve_minutes END) as avg_resolve_time,
-                AVG(CASE WHEN time_to_merge_minutes IS NOT NULL THEN time_to_merge_minutes END) as avg_merge_time
-            FROM outcomes
-        """)
+        Returns:
+            (issue_number, pr_number) tuples, newest first
+        """
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT issue_number, pr_number
+                FROM outcomes
+                WHERE status = ?
+                AND pr_number IS NOT NULL
+                ORDER BY created_at DESC
+            """, (ResolutionStatus.RESOLVED.value,))
+            return cursor.fetchall()
 
-        row = cursor.fetchone()
+    def get_overall_stats(self) -> Dict:
+        """Get overall statistics across all issue types"""
+        with self._lock:
+            if self._overall_stats_cache is not None:
+                return dict(self._overall_stats_cache)
+            generation = self._cache_generation
+
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    COUNT(*) as total,
+                    SUM(CASE WHEN status IN ('resolved', 'merged') THEN 1 ELSE 0 END) as resolved,
+                    SUM(CASE WHEN status = 'merged' THEN 1 ELSE 0 END) as merged,
+                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed,
+                    AVG(CASE WHEN time_to_resolve_minutes IS NOT NULL THEN time_to_resolve_minutes END) as avg_resolve_time,
+                    AVG(CASE WHEN time_to_merge_minutes IS NOT NULL THEN time_to_merge_minutes END) as avg_merge_time
+                FROM outcomes
+            """)
+            row = cursor.fetchone()
         total, resolved, merged, failed, avg_resolve, avg_merge = row
 
         stats = {
@@ -423,33 +647,27 @@ class OutcomeTracker:
             'avg_time_to_merge_minutes': avg_merge
         }
 
-        conn.close()
-        return stats
+        with self._lock:
+            if generation == self._cache_generation:
+                self._overall_stats_cache = stats
+
+        return dict(stats)
 
     def _classify_issue_type(self, labels: List[str]) -> str:
         """Classify issue type from labels"""
-        label_lower = [l.lower() for l in labels]
-
-        # Priority order for classification
-        type_map = {
-            'security': IssueType.SECURITY,
-            'bug': IssueType.BUG,
-            'performance': IssueType.PERFORMANCE,
-            'ci/cd': IssueType.CI_CD,
-            'ci-cd': IssueType.CI_CD,
-            'test': IssueType.TEST,
-            'documentation': IssueType.DOCUMENTATION,
-            'docs': IssueType.DOCUMENTATION,
-            'refactor': IssueType.REFACTOR,
-            'refactoring': IssueType.REFACTOR,
-            'feature': IssueType.FEATURE,
-            'enhancement': IssueType.FEATURE,
-        }
+        for label in labels:
+            label = label.lower()
+
+            # Exact label match is a single dict lookup
+            issue_type = _TYPE_KEYWORDS.get(label)
+            if issue_type is not None:
+                return issue_type
 
-        for label in label_lower:
-            for key, issue_type in type_map.items():
-                if key in label:
-                    return issue_type.value
+            # Otherwise scan for keywords inside the label in one regex pass,
+            # keeping the highest-priority keyword found
+            matches = _TYPE_KEYWORD_PATTERN.findall(label)
+            if matches:
+                return _TYPE_KEYWORDS[min(matches, key=_TYPE_PRIORITY.__getitem__)]
 
         return IssueType.OTHER.value
 
@@ -475,8 +693,7 @@ class OutcomeTracker:
 
         # Exponential scaling: 0% = 0.1, 50% = 1.0, 100% = 2.0+
         # e^(rate * 1.5) provides good exponential curve
-        import math
-        base_weight = math.exp(success_rate * 1.5) / math.e  # Normalize
+        base_weight = _exp(success_rate * 1.5) * _E_INV  # Normalize
 
         # Apply confidence adjustment
         adjusted_weight = base_weight * confidence + (1 - confidence) * 0.5
@@ -485,9 +702,15 @@ class OutcomeTracker:
 
     def export_metrics_json(self) -> str:
         """Export metrics as JSON string"""
-        metrics = self.get_type_metrics()
-        overall = self.get_overall_stats()
-        recent = self.get_recent_outcomes(limit=5)
+        # WAL mode lets the three queries run concurrently, each on its own
+        # read-only connection
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            metrics_future = executor.submit(self._run_read_only, self.get_type_metrics)
+            overall_future = executor.submit(self._run_read_only, self.get_overall_stats)
+            recent_future = executor.submit(self._run_read_only, self.get_recent_outcomes, 5)
+            metrics = metrics_future.result()
+            overall = overall_future.result()
+            recent = recent_future.result()
 
         export_data = {
             'generated_at': datetime.utcnow().isoformat(),
@@ -498,4 +721,4 @@ class OutcomeTracker:
             'recent_outcomes': recent
         }
 
-        return json.dumps(export_data, indent=2)
+        return json_helpers.dumps(export_data, indent=True)
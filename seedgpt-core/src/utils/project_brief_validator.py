@@ -5,11 +5,16 @@ Validates PROJECT_BRIEF.md structure and required fields before AI generation
 to prevent wasted API calls and provide better error messages.
 """
 
+import copy
+import hashlib
+import re
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 
 from logging_config import get_logger
+from utils import json_helpers
 from utils.exceptions import (
     FileNotFoundError as SeedGPTFileNotFoundError,
     FileReadError,
@@ -19,8 +24,52 @@ from utils.exceptions import (
 
 logger = get_logger(__name__)
 
+# Patterns reused across every validation
+_CHECKBOX_RE = re.compile(r"- \[([ xX])\]")
+# Leading markers and ordinals stripped from a header to form its section
+# index key, e.g. "## 🎯 Project Overview" or "## 1. Project Overview"
+# -> "project overview"
+_HEADER_PREFIX_RE = re.compile(r"^#+(?:[^\w]|\d+(?:[.)]\d*)+)*")
+_WHITESPACE_RE = re.compile(r"\s+")
 
-@dataclass
+# validate_project_brief() results: resolved path -> (mtime_ns, size, result)
+_validation_cache: Dict[str, Tuple[int, int, "ValidationResult"]] = {}
+
+# Brief text read by validate(), reused by get_project_brief():
+# resolved path -> (mtime_ns, size, content)
+_content_cache: Dict[str, Tuple[int, int, str]] = {}
+_MAX_CACHED_CONTENT_BYTES = 1_000_000
+
+
+def _read_brief(path: Path) -> str:
+    """
+    Read a brief as UTF-8 and remember it while the file is unchanged
+
+    Raises:
+        UnicodeDecodeError, PermissionError, OSError: As Path.read_text
+    """
+    stat = path.stat()
+    content = path.read_text(encoding="utf-8")
+    if stat.st_size <= _MAX_CACHED_CONTENT_BYTES:
+        _content_cache[str(path.resolve())] = (stat.st_mtime_ns, stat.st_size, content)
+    return content
+
+
+def _cached_brief(path: Path) -> Optional[str]:
+    """Return the brief text read earlier if the file hasn't changed since"""
+    try:
+        resolved = path.resolve()
+        stat = resolved.stat()
+    except OSError:
+        return None
+
+    cached = _content_cache.get(str(resolved))
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    return None
+
+
+@dataclass(slots=True)
 class ValidationResult:
     """Result of PROJECT_BRIEF.md validation"""
 
@@ -41,23 +90,24 @@ class ValidationResult:
     def get_summary(self) -> str:
         """Get a human-readable summary of validation results"""
         if self.is_valid:
-            summary = "✅ PROJECT_BRIEF.md validation passed"
+            header = "✅ PROJECT_BRIEF.md validation passed"
             if self.warnings:
-                summary += f" ({len(self.warnings)} warning(s))"
+                header += f" ({len(self.warnings)} warning(s))"
         else:
-            summary = f"❌ PROJECT_BRIEF.md validation failed with {len(self.errors)} error(s)"
+            header = f"❌ PROJECT_BRIEF.md validation failed with {len(self.errors)} error(s)"
+
+        # Collect lines and join once rather than growing a string per message
+        lines = [header]
 
         if self.errors:
-            summary += "\n\nErrors:"
-            for error in self.errors:
-                summary += f"\n  - {error}"
+            lines.extend(("", "Errors:"))
+            lines.extend(f"  - {error}" for error in self.errors)
 
         if self.warnings:
-            summary += "\n\nWarnings:"
-            for warning in self.warnings:
-                summary += f"\n  - {warning}"
+            lines.extend(("", "Warnings:"))
+            lines.extend(f"  - {warning}" for warning in self.warnings)
 
-        return summary
+        return "\n".join(lines)
 
 
 class ProjectBriefValidator:
@@ -88,11 +138,30 @@ class ProjectBriefValidator:
         "Target Users",
     ]
 
+    # Text suggesting a section was left unfinished
+    PLACEHOLDER_KEYWORDS = ["TODO", "FIXME", "TBD", "[placeholder", "fill in here", "your text here"]
+
+    # Casefolded forms of the constants above, computed once
+    _REQUIRED_CF = tuple(section.casefold() for section in REQUIRED_SECTIONS)
+    _RECOMMENDED_CF = tuple(section.casefold() for section in RECOMMENDED_SECTIONS)
+    _OVERVIEW_FIELDS_CF = tuple(field.casefold() for field in REQUIRED_OVERVIEW_FIELDS)
+    _PLACEHOLDERS_CF = tuple(keyword.casefold() for keyword in PLACEHOLDER_KEYWORDS)
+
+    # Every keyword searched for across the whole document (sections are
+    # matched against the header index instead)
+    _DOCUMENT_KEYWORDS = _PLACEHOLDERS_CF + ("completion checklist",)
+    # UTF-8 forms of the (ASCII) keywords for scanning non-ASCII documents
+    _DOCUMENT_KEYWORDS_UTF8 = tuple(keyword.encode("utf-8") for keyword in _DOCUMENT_KEYWORDS)
+
     # Minimum content length thresholds (characters) - lenient for AI consumption
+    MIN_BRIEF_LENGTH = 16
     MIN_DESCRIPTION_LENGTH = 20
     MIN_PROBLEM_STATEMENT_LENGTH = 30
     MIN_REQUIREMENTS_LENGTH = 30
 
+    # Bump when validation rules change so stale stamps are ignored
+    STAMP_VERSION = 1
+
     def __init__(self, project_brief_path: Optional[Path] = None):
         """
         Initialize validator
@@ -106,10 +175,17 @@ class ProjectBriefValidator:
         else:
             self.project_brief_path = Path(project_brief_path)
 
-    def validate(self) -> ValidationResult:
+        # Stamp of the last successful validation, kept beside the brief
+        self.stamp_path = self.project_brief_path.parent / ".seedgpt" / "project_brief.stamp"
+
+    def validate(self, force: bool = False) -> ValidationResult:
         """
         Perform comprehensive validation of PROJECT_BRIEF.md
 
+        Args:
+            force: Re-run every check even if the content matches the stamp
+                of the last successful validation
+
         Returns:
             ValidationResult with validation outcome and messages
         """
@@ -124,7 +200,7 @@ class ProjectBriefValidator:
 
         # Read file content
         try:
-            content = self.project_brief_path.read_text(encoding="utf-8")
+            content = _read_brief(self.project_brief_path)
         except UnicodeDecodeError as e:
             logger.error(f"Failed to decode PROJECT_BRIEF.md with UTF-8 encoding: {e}")
             result.add_error(f"Failed to read PROJECT_BRIEF.md: Invalid UTF-8 encoding")
@@ -138,51 +214,222 @@ class ProjectBriefValidator:
             result.add_error(f"Failed to read PROJECT_BRIEF.md: {e}")
             return result
 
-        if not content.strip():
+        stripped_length = len(content.strip())
+        if not stripped_length:
             result.add_error("PROJECT_BRIEF.md is empty")
             return result
 
+        # Too short to hold any section - skip the scans below
+        if stripped_length < self.MIN_BRIEF_LENGTH:
+            result.add_error(
+                f"PROJECT_BRIEF.md is too short ({stripped_length} chars) to contain a project brief"
+            )
+            return result
+
+        # No headers means no sections to validate - reject before scanning.
+        # str.find runs in C, so this is far cheaper than the line scan.
+        if not content.startswith("#") and "\n#" not in content:
+            result.add_error("No markdown section headers (#) found in PROJECT_BRIEF.md")
+            return result
+
+        # Unchanged since the last successful validation - reuse its result
+        content_hash = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+        if not force:
+            stamped = self._load_stamp(content_hash)
+            if stamped is not None:
+                return stamped
+
+        # Collect headers, section offsets and line statistics in a single pass
+        headers, sections, long_line_count, line_count = self._scan_lines(content)
+
         # Store metadata
         result.metadata["file_size"] = len(content)
-        result.metadata["line_count"] = content.count("\n") + 1
+        result.metadata["line_count"] = line_count
+
+        # Look up every document-wide keyword in one sweep over the
+        # casefolded text. Casefolding can change length (e.g. "ß" -> "ss"),
+        # so section offsets always slice the original content.
+        keywords = self._find_keywords(content.casefold())
 
         # Validate structure
-        self._validate_sections(content, result)
+        missing_required = self._validate_sections(headers, sections, result)
 
         # Validate content
-        self._validate_content(content, result)
+        self._validate_content(content, keywords, result)
 
-        # Validate overview section
-        self._validate_overview_section(content, result)
+        # Validate overview section (a missing section was already reported)
+        if "Project Overview" not in missing_required:
+            self._validate_overview_section(content, sections, result)
 
         # Validate requirements section
-        self._validate_requirements_section(content, result)
+        if "Core Requirements" not in missing_required:
+            self._validate_requirements_section(content, sections, result)
 
         # Check for common issues
-        self._check_common_issues(content, result)
+        self._check_common_issues(content, keywords, sections, long_line_count, result)
+
+        if result.is_valid:
+            self._save_stamp(content_hash, result)
 
         return result
 
-    def _validate_sections(self, content: str, result: ValidationResult):
-        """Validate that required sections exist"""
-        # Extract all headers (## Section Name) - simple line parsing
-        headers = [line.replace("##", "").strip() for line in content.split("\n") if line.startswith("##")]
+    def _load_stamp(self, content_hash: str) -> Optional[ValidationResult]:
+        """Return the stamped result if it was recorded for this exact content"""
+        try:
+            stamp = json_helpers.loads(self.stamp_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable validation stamp {self.stamp_path}: {e}")
+            return None
+
+        if (
+            not isinstance(stamp, dict)
+            or stamp.get("version") != self.STAMP_VERSION
+            or stamp.get("hash") != content_hash
+            or not stamp.get("valid")
+        ):
+            return None
+
+        logger.debug(f"PROJECT_BRIEF.md unchanged since {stamp.get('timestamp')} - reusing validation result")
+        return ValidationResult(
+            is_valid=True,
+            warnings=list(stamp.get("warnings", [])),
+            metadata=dict(stamp.get("metadata", {})),
+        )
+
+    def _save_stamp(self, content_hash: str, result: ValidationResult):
+        """Record a successful validation so unchanged content can skip the checks"""
+        stamp = {
+            "version": self.STAMP_VERSION,
+            "hash": content_hash,
+            "valid": True,
+            "warnings_count": len(result.warnings),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "warnings": result.warnings,
+            "metadata": result.metadata,
+        }
+        try:
+            self.stamp_path.parent.mkdir(parents=True, exist_ok=True)
+            self.stamp_path.write_text(json_helpers.dumps(stamp, indent=True), encoding="utf-8")
+        except Exception as e:
+            logger.warning(f"Failed to save validation stamp: {e}")
+
+    def _scan_lines(self, content: str) -> Tuple[List[str], Dict[str, Tuple[int, int]], int, int]:
+        """
+        Walk the document's lines once
+
+        Each header (of any level) opens a section whose body runs from the
+        end of the header line to the start of the next header (or end of
+        content). Lines inside ``` fences are never headers, so a "# comment"
+        in a code sample doesn't split its section.
+
+        Returns:
+            Tuple of (headers, section index mapping normalized header
+            name -> (start, end) offsets into content, number of long
+            non-URL lines, line count)
+        """
+        headers = []
+        sections: Dict[str, Tuple[int, int]] = {}
+        long_line_count = 0
+        line_count = 0
+        offset = 0
+        open_section = None
+        open_start = 0
+        in_fence = False
+
+        for line in content.split("\n"):
+            line_count += 1
+            if line.startswith("```"):
+                in_fence = not in_fence
+            elif line.startswith("#") and not in_fence:
+                headers.append(line.lstrip("#").strip())
+                if open_section is not None:
+                    sections.setdefault(open_section, (open_start, offset - 1))
+                open_section = self._section_key(line)
+                open_start = offset + len(line)
+            if len(line) > 200 and not line.startswith("http"):
+                long_line_count += 1
+            offset += len(line) + 1
+
+        if open_section is not None:
+            sections.setdefault(open_section, (open_start, len(content)))
+
+        return headers, sections, long_line_count, line_count
+
+    @staticmethod
+    def _section_key(header_line: str) -> str:
+        """Normalize a header line into its section index key"""
+        name = _HEADER_PREFIX_RE.sub("", header_line)
+        return _WHITESPACE_RE.sub(" ", name).strip().casefold()
+
+    @staticmethod
+    def _find_section(sections: Dict[str, Tuple[int, int]], name: str) -> Optional[Tuple[int, int]]:
+        """
+        Look up a section's (start, end) offsets by header name
+
+        Matches the exact header or one that begins with the name as whole
+        words (e.g. "Core Requirements (MVP)"); the first such header wins.
+        """
+        name = name.casefold()
+        span = sections.get(name)
+        if span is not None:
+            return span
+        prefix = name + " "
+        for key, span in sections.items():
+            if key.startswith(prefix):
+                return span
+        return None
+
+    def _find_keywords(self, content_cf: str) -> Set[str]:
+        """
+        Return the document-wide keywords present in the casefolded content
 
+        Each keyword is searched for exactly once per validation; the
+        validators then test membership in the returned set.
+
+        A single emoji widens a str to 4 bytes per character, so non-ASCII
+        documents are encoded once and searched as compact UTF-8 bytes.
+        The keywords are ASCII, so a bytes match is exactly a str match.
+        """
+        if content_cf.isascii():
+            return {keyword for keyword in self._DOCUMENT_KEYWORDS if keyword in content_cf}
+
+        content_bytes = content_cf.encode("utf-8", "surrogatepass")
+        return {
+            keyword
+            for keyword, keyword_bytes in zip(self._DOCUMENT_KEYWORDS, self._DOCUMENT_KEYWORDS_UTF8)
+            if keyword_bytes in content_bytes
+        }
+
+    def _validate_sections(self, headers: List[str], sections: Dict[str, Tuple[int, int]],
+                           result: ValidationResult) -> Set[str]:
+        """
+        Validate that required sections exist
+
+        Returns:
+            Set of required section names that are missing
+        """
         result.metadata["sections_found"] = headers
+        missing_required = set()
 
-        # Check required sections - just search for section name case-insensitively
-        for required_section in self.REQUIRED_SECTIONS:
-            if required_section.lower() not in content.lower():
+        # Check required sections against the headers, so a section name
+        # mentioned in body prose doesn't count as the section being present
+        for required_section, required_cf in zip(self.REQUIRED_SECTIONS, self._REQUIRED_CF):
+            if self._find_section(sections, required_cf) is None:
                 result.add_error(f"Missing required section: '{required_section}'")
+                missing_required.add(required_section)
 
         # Check recommended sections
-        for recommended_section in self.RECOMMENDED_SECTIONS:
-            if recommended_section.lower() not in content.lower():
+        for recommended_section, recommended_cf in zip(self.RECOMMENDED_SECTIONS, self._RECOMMENDED_CF):
+            if self._find_section(sections, recommended_cf) is None:
                 result.add_warning(
                     f"Missing recommended section: '{recommended_section}'"
                 )
 
-    def _validate_content(self, content: str, result: ValidationResult):
+        return missing_required
+
+    def _validate_content(self, content: str, keywords: Set[str], result: ValidationResult):
         """Validate overall content quality"""
         # Check minimum length - reduced to be more lenient
         if len(content) < 500:
@@ -192,60 +439,46 @@ class ProjectBriefValidator:
             )
 
         # Check for placeholder text - simple string checks
-        placeholder_keywords = ["TODO", "FIXME", "TBD", "[placeholder", "fill in here", "your text here"]
-        placeholders_found = [kw for kw in placeholder_keywords if kw.lower() in content.lower()]
+        placeholders_found = [
+            kw for kw, kw_cf in zip(self.PLACEHOLDER_KEYWORDS, self._PLACEHOLDERS_CF) if kw_cf in keywords
+        ]
 
         if placeholders_found:
             result.add_warning(
                 f"Found {len(placeholders_found)} potential placeholder keywords: {', '.join(placeholders_found)}"
             )
 
-    def _validate_overview_section(self, content: str, result: ValidationResult):
+    def _validate_overview_section(self, content: str,
+                                   sections: Dict[str, Tuple[int, int]], result: ValidationResult):
         """Validate Project Overview section"""
-        # Just search for "project overview" case-insensitively
-        if "project overview" not in content.lower():
+        # Locate the "Project Overview" header, ignoring mentions in prose
+        span = self._find_section(sections, "Project Overview")
+        if span is None:
             result.add_warning("Could not find Project Overview section - skipping detailed validation")
             return
-        
-        # Extract content between "project overview" and next ## or end
-        start_idx = content.lower().find("project overview")
-        if start_idx < 0:
-            result.add_warning("Could not parse Project Overview section - skipping detailed validation")
-            return
-        
-        # Find the next ## section or end of content
-        next_section = content.find("\n##", start_idx + 1)
-        if next_section < 0:
-            overview_content = content[start_idx:]
-        else:
-            overview_content = content[start_idx:next_section]
+
+        start_idx, end_idx = span
+        overview_cf = content[start_idx:end_idx].casefold()
 
         # Check required fields - just verify they exist
-        for field in self.REQUIRED_OVERVIEW_FIELDS:
-            if field.lower() not in overview_content.lower():
+        for field, field_cf in zip(self.REQUIRED_OVERVIEW_FIELDS, self._OVERVIEW_FIELDS_CF):
+            if field_cf not in overview_cf:
                 result.add_error(
                     f"Missing required field in Project Overview: '{field}'"
                 )
 
-    def _validate_requirements_section(self, content: str, result: ValidationResult):
+    def _validate_requirements_section(self, content: str,
+                                       sections: Dict[str, Tuple[int, int]], result: ValidationResult):
         """Validate Core Requirements section"""
-        # Just search for "core requirements" case-insensitively
-        if "core requirements" not in content.lower():
+        # Locate the "Core Requirements" header, ignoring mentions in prose
+        span = self._find_section(sections, "Core Requirements")
+        if span is None:
             result.add_warning("Could not find Core Requirements section - skipping detailed validation")
             return
-        
-        # Extract content between "core requirements" and next ## or end
-        start_idx = content.lower().find("core requirements")
-        if start_idx < 0:
-            result.add_warning("Could not parse Core Requirements section - skipping detailed validation")
-            return
-        
-        # Find the next ## section or end of content
-        next_section = content.find("\n##", start_idx + 1)
-        if next_section < 0:
-            requirements_content = content[start_idx:]
-        else:
-            requirements_content = content[start_idx:next_section]
+
+        start_idx, end_idx = span
+        requirements_content = content[start_idx:end_idx]
+        requirements_cf = requirements_content.casefold()
 
         # Check minimum length - make this a warning instead of error
         if len(requirements_content.strip()) < self.MIN_REQUIREMENTS_LENGTH:
@@ -255,8 +488,8 @@ class ProjectBriefValidator:
             )
 
         # Check for both functional and non-functional requirements
-        has_functional = "functional requirements" in requirements_content.lower()
-        has_non_functional = "non-functional requirements" in requirements_content.lower()
+        has_functional = "functional requirements" in requirements_cf
+        has_non_functional = "non-functional requirements" in requirements_cf
 
         if not has_functional:
             result.add_warning("Missing 'Functional Requirements' subsection")
@@ -272,29 +505,29 @@ class ProjectBriefValidator:
                 f"Only {functional_reqs} requirements found. Consider adding more specific requirements."
             )
 
-    def _check_common_issues(self, content: str, result: ValidationResult):
+    def _check_common_issues(self, content: str, keywords: Set[str],
+                             sections: Dict[str, Tuple[int, int]], long_line_count: int,
+                             result: ValidationResult):
         """Check for common issues and anti-patterns"""
-        # Check for excessively long lines
-        lines = content.split("\n")
-        long_lines = [
-            i + 1
-            for i, line in enumerate(lines)
-            if len(line) > 200 and not line.startswith("http")
-        ]
-
-        if long_lines:
+        # Check for excessively long lines (counted by _scan_lines)
+        if long_line_count:
             result.add_warning(
-                f"Found {len(long_lines)} lines longer than 200 characters. "
+                f"Found {long_line_count} lines longer than 200 characters. "
                 "Consider breaking them up for readability."
             )
 
         # Skip empty section check - AI can handle free-form text and various formats
 
         # Check completion checklist if exists
-        if "completion checklist" in content.lower():
-            # Simple count of checked/unchecked items
-            unchecked = content.count("- [ ]")
-            checked = content.lower().count("- [x]")
+        if "completion checklist" in keywords:
+            # Count checked/unchecked items within the checklist section when
+            # it has its own header, otherwise across the whole document
+            span = self._find_section(sections, "Completion Checklist")
+            checklist = content[span[0]:span[1]] if span is not None else content
+            # A plain substring test is cheaper than the regex when there are no boxes
+            boxes = _CHECKBOX_RE.findall(checklist) if "- [" in checklist else []
+            unchecked = boxes.count(" ")
+            checked = len(boxes) - unchecked
 
             result.metadata["checklist_progress"] = {
                 "checked": checked,
@@ -311,18 +544,43 @@ class ProjectBriefValidator:
 
 def validate_project_brief(
     project_brief_path: Optional[Path] = None,
+    force: bool = False,
 ) -> ValidationResult:
     """
     Convenience function to validate PROJECT_BRIEF.md
 
     Args:
         project_brief_path: Path to PROJECT_BRIEF.md file
+        force: Bypass the in-process cache and the on-disk validation stamp
 
     Returns:
         ValidationResult with validation outcome
     """
     validator = ProjectBriefValidator(project_brief_path)
-    return validator.validate()
+
+    # Reuse the previous result while the file is unchanged on disk
+    try:
+        path = validator.project_brief_path.resolve()
+        stat = path.stat()
+    except OSError:
+        return validator.validate(force=force)
+
+    key = str(path)
+    cached = _validation_cache.get(key)
+    if not force and cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        result = cached[2]
+    else:
+        result = validator.validate(force=force)
+        _validation_cache[key] = (stat.st_mtime_ns, stat.st_size, result)
+
+    # Callers may mutate the result, so never hand out the cached instance
+    return copy.deepcopy(result)
+
+
+def clear_validation_cache() -> None:
+    """Forget all memoized validate_project_brief() results and brief text"""
+    _validation_cache.clear()
+    _content_cache.clear()
 
 
 def validate_or_exit(project_brief_path: Optional[Path] = None) -> None:
@@ -366,12 +624,17 @@ def get_project_brief(max_length: int = 5000) -> str:
     
     if not project_brief_path.exists():
         return ""
-    
+
+    # Reuse the text validate() already read if the file is unchanged
+    cached = _cached_brief(project_brief_path)
+    if cached is not None:
+        return cached[:max_length]
+
     try:
+        # Limit to reasonable size to avoid token limits; reading in text
+        # mode with a size bounds the read to max_length characters
         with open(project_brief_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        # Limit to reasonable size to avoid token limits
-        return content[:max_length]
+            return f.read(max_length)
     except Exception as e:
         logger.warning(f"Failed to read PROJECT_BRIEF.md: {e}")
         return ""
@@ -4,6 +4,7 @@ Pytest configuration and shared fixtures
 
 import pytest
 import os
+import shutil
 import sys
 from pathlib import Path
 
@@ -20,6 +21,15 @@ def project_root():
     return Path(__file__).parent.parent
 
 
+@pytest.fixture(scope="session")
+def claude_cli_present():
+    """Whether the claude CLI is installed, probed once per session"""
+    return shutil.which("claude") is not None or any(
+        os.path.exists(path)
+        for path in ("/usr/local/bin/claude", os.path.expanduser("~/.local/bin/claude"))
+    )
+
+
 @pytest.fixture
 def mock_env_vars(monkeypatch):
     """Fixture to mock environment variables"""
@@ -5,6 +5,7 @@ Tests for the feedback loop system
 Run with: python -m pytest tests/test_feedback_loop.py
 """
 
+import sqlite3
 import sys
 import tempfile
 from pathlib import Path
@@ -40,6 +41,7 @@ def test_outcome_tracking():
             pr_number=10,
             files_changed=3
         )
+        assert tracker.get_pending_prs() == [(1, 10)]
 
         # Get stats
         stats = tracker.get_overall_stats()
@@ -47,6 +49,24 @@ def test_outcome_tracking():
         assert stats['resolved_count'] == 1
 
 
+def test_bulk_status_update():
+    """Test updating several outcomes in one call"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+
+        tracker.record_attempts([(1, "First", ["feature"]), (2, "Second", ["bug"])],
+                                status=ResolutionStatus.RESOLVED)
+        tracker.update_statuses([
+            (1, ResolutionStatus.MERGED, 10),
+            (2, ResolutionStatus.CLOSED, 11),
+        ])
+
+        stats = tracker.get_overall_stats()
+        assert stats['total_attempts'] == 2
+        assert stats['merged_count'] == 1
+
+
 def test_feedback_analyzer():
     """Test feedback analyzer with sample data"""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -171,11 +191,213 @@ def test_metrics_export():
         assert len(data['recent_outcomes']) == 1
 
 
+def test_status_durations():
+    """Test resolve/merge durations are computed in SQL from the creation time"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+
+        tracker.record_attempt(1, "Epoch row", ["feature"])
+        tracker.record_attempt(2, "Legacy row", ["bug"])
+
+        # Backdate both rows; issue 2 looks like a row written before
+        # created_at_epoch existed, so it falls back to julianday()
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE outcomes SET created_at_epoch = created_at_epoch - 90 * 60000 WHERE issue_number = 1"
+        )
+        conn.execute(
+            "UPDATE outcomes SET created_at_epoch = NULL, "
+            "created_at = strftime('%Y-%m-%dT%H:%M:%f', 'now', '-120 minutes') WHERE issue_number = 2"
+        )
+        conn.commit()
+        conn.close()
+
+        tracker.update_status(1, ResolutionStatus.RESOLVED, pr_number=10)
+        tracker.update_status(2, ResolutionStatus.RESOLVED, pr_number=20)
+        tracker.update_status(1, ResolutionStatus.MERGED)
+
+        records = {r['issue_number']: r for r in tracker.get_recent_outcomes()}
+        assert records[1]['time_to_resolve_minutes'] == 90
+        assert records[1]['time_to_merge_minutes'] == 90
+        assert records[1]['resolved_at'] is not None
+        assert records[1]['merged_at'] is not None
+        assert records[2]['time_to_resolve_minutes'] in (119, 120)
+        assert records[2]['time_to_merge_minutes'] is None
+        tracker.close()
+
+
+def test_metrics_cache_invalidated_on_write():
+    """Test cached type metrics are refreshed after every write"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+
+        tracker.record_attempt(1, "Test", ["feature"])
+        assert tracker.get_type_metrics()['feature'].resolved_count == 0
+
+        tracker.update_status(1, ResolutionStatus.RESOLVED, pr_number=1)
+        assert tracker.get_type_metrics()['feature'].resolved_count == 1
+
+        tracker.record_attempt(2, "Bug", ["bug"])
+        assert 'bug' in tracker.get_type_metrics()
+
+        tracker.update_status(1, ResolutionStatus.MERGED)
+        assert tracker.get_type_metrics()['feature'].merged_count == 1
+        tracker.close()
+
+
+def test_metrics_cache_skips_result_raced_by_write():
+    """Test a result read before a concurrent write is not cached"""
+    from contextlib import contextmanager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+        tracker.record_attempt(1, "Test", ["feature"])
+
+        # Land a write right after the metrics query, before the store
+        real_reading = tracker._reading
+
+        @contextmanager
+        def reading_then_write():
+            with real_reading() as conn:
+                yield conn
+            tracker._reading = real_reading
+            tracker.record_attempt(2, "Raced", ["feature"])
+
+        tracker._reading = reading_then_write
+        assert tracker.get_type_metrics()['feature'].total_attempts == 1
+        assert tracker.get_type_metrics()['feature'].total_attempts == 2
+        tracker.close()
+
+
+def test_windowed_metrics_not_cached():
+    """Test metrics for a `days` window are recomputed on every call"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+        tracker.record_attempt(1, "Test", ["feature"])
+
+        assert tracker.get_type_metrics(days=7)['feature'].total_attempts == 1
+        assert 7 not in tracker._metrics_cache
+        tracker.close()
+
+
+def test_iter_recent_outcomes():
+    """Test recent outcomes are yielded newest first, lazily and within the limit"""
+    from itertools import islice
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+        for n in range(1, 6):
+            tracker.record_attempt(n, f"Issue {n}", ["feature"])
+
+        first_two = list(islice(tracker.iter_recent_outcomes(limit=10), 2))
+        assert [r['issue_number'] for r in first_two] == [5, 4]
+        assert first_two[0]['labels'] == ["feature"]
+
+        assert [r['issue_number'] for r in tracker.iter_recent_outcomes(limit=3)] == [5, 4, 3]
+        assert tracker.get_recent_outcomes(limit=10) == list(tracker.iter_recent_outcomes(limit=10))
+        tracker.close()
+
+
+def test_concurrent_metrics_export():
+    """Test exports running on several threads at once all see the same data"""
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+        for n in range(1, 4):
+            tracker.record_attempt(n, f"Issue {n}", ["feature"])
+        tracker.update_status(1, ResolutionStatus.RESOLVED, pr_number=1)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            exports = list(executor.map(lambda _: tracker.export_metrics_json(), range(8)))
+
+        for export in exports:
+            data = json.loads(export)
+            assert data['overall_stats']['total_attempts'] == 3
+            assert data['overall_stats']['resolved_count'] == 1
+            assert data['type_metrics']['feature']['total_attempts'] == 3
+            assert [r['issue_number'] for r in data['recent_outcomes']] == [3, 2, 1]
+        tracker.close()
+
+
+def test_overall_stats_cache_invalidated_on_write():
+    """Test the cached overall stats are refreshed after every write"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+
+        tracker.record_attempt(1, "Test", ["feature"])
+        assert tracker.get_overall_stats()['resolved_count'] == 0
+
+        tracker.update_status(1, ResolutionStatus.RESOLVED, pr_number=1)
+        assert tracker.get_overall_stats()['resolved_count'] == 1
+
+        tracker.record_attempt(2, "Bug", ["bug"])
+        assert tracker.get_overall_stats()['total_attempts'] == 2
+        tracker.close()
+
+
+def test_overall_stats_cache_skips_result_raced_by_write():
+    """Test overall stats read before a concurrent write are not cached"""
+    from contextlib import contextmanager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        tracker = OutcomeTracker(db_path=db_path)
+        tracker.record_attempt(1, "Test", ["feature"])
+
+        # Land a write right after the stats query, before the store
+        real_reading = tracker._reading
+
+        @contextmanager
+        def reading_then_write():
+            with real_reading() as conn:
+                yield conn
+            tracker._reading = real_reading
+            tracker.update_status(1, ResolutionStatus.RESOLVED, pr_number=1)
+
+        tracker._reading = reading_then_write
+        assert tracker.get_overall_stats()['resolved_count'] == 0
+        assert tracker.get_overall_stats()['resolved_count'] == 1
+        tracker.close()
+
+
+def test_analyze_only_when_indexes_created():
+    """Test planner statistics are gathered on first open only"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        stat_query = "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+
+        OutcomeTracker(db_path=db_path).close()
+        conn = sqlite3.connect(db_path)
+        assert conn.execute(stat_query).fetchone() is not None
+        conn.execute("DROP TABLE sqlite_stat1")
+        conn.commit()
+        conn.close()
+
+        # Reopening an existing database must not run ANALYZE again
+        tracker = OutcomeTracker(db_path=db_path)
+        conn = sqlite3.connect(db_path)
+        assert conn.execute(stat_query).fetchone() is None
+        conn.close()
+        tracker.close()
+
+
 if __name__ == "__main__":
     print("Running feedback loop tests...")
     test_outcome_tracking()
     print("✅ test_outcome_tracking passed")
 
+    test_bulk_status_update()
+    print("✅ test_bulk_status_update passed")
+
     test_feedback_analyzer()
     print("✅ test_feedback_analyzer passed")
 
@@ -188,4 +410,31 @@ if __name__ == "__main__":
     test_metrics_export()
     print("✅ test_metrics_export passed")
 
+    test_status_durations()
+    print("✅ test_status_durations passed")
+
+    test_metrics_cache_invalidated_on_write()
+    print("✅ test_metrics_cache_invalidated_on_write passed")
+
+    test_metrics_cache_skips_result_raced_by_write()
+    print("✅ test_metrics_cache_skips_result_raced_by_write passed")
+
+    test_windowed_metrics_not_cached()
+    print("✅ test_windowed_metrics_not_cached passed")
+
+    test_iter_recent_outcomes()
+    print("✅ test_iter_recent_outcomes passed")
+
+    test_concurrent_metrics_export()
+    print("✅ test_concurrent_metrics_export passed")
+
+    test_overall_stats_cache_invalidated_on_write()
+    print("✅ test_overall_stats_cache_invalidated_on_write passed")
+
+    test_overall_stats_cache_skips_result_raced_by_write()
+    print("✅ test_overall_stats_cache_skips_result_raced_by_write passed")
+
+    test_analyze_only_when_indexes_created()
+    print("✅ test_analyze_only_when_indexes_created passed")
+
     print("\n🎉 All tests passed!")
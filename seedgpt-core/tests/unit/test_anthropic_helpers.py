@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Anthropic API helpers
+"""
+
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
+
+import anthropic
+
+# src/ is put on sys.path once by tests/conftest.py
+from utils import anthropic_helpers
+
+
+def _fake_client(chunks, consumed):
+    """Anthropic client stand-in whose message stream yields the given chunks"""
+
+    def text_stream():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    class Stream:
+        pass
+
+    class Messages:
+        @contextmanager
+        def stream(self, **kwargs):
+            stream = Stream()
+            stream.text_stream = text_stream()
+            yield stream
+
+    class Client:
+        def __init__(self, api_key):
+            self.messages = Messages()
+
+    return Client
+
+
+class TestStreamAnthropicJson:
+    """Test stream_anthropic_json"""
+
+    def _stream(self, monkeypatch, chunks):
+        consumed = []
+        monkeypatch.setattr(anthropic, "Anthropic", _fake_client(chunks, consumed))
+        text = anthropic_helpers.stream_anthropic_json(
+            api_key="key", prompt="p", model="m", max_tokens=10
+        )
+        return text, consumed
+
+    def test_stops_after_object(self, monkeypatch):
+        """Test reading stops once the object closes, skipping trailing text"""
+        text, consumed = self._stream(
+            monkeypatch, ["```json\n{\"a\": ", "{\"b\": \"}\"}}", "\n```", " more"]
+        )
+        assert text == '{"a": {"b": "}"}}'
+        assert len(consumed) == 2
+
+    def test_skips_braces_in_prose(self, monkeypatch):
+        """Test a balanced {name} in leading prose does not end the stream"""
+        text, _ = self._stream(
+            monkeypatch, ["Use the {name} ", "field:\n", '{"issues": []}', " done"]
+        )
+        assert text == '{"issues": []}'
+
+    def test_no_object_returns_everything(self, monkeypatch):
+        """Test the whole response comes back when no object parses"""
+        text, _ = self._stream(monkeypatch, ["no ", "{json} ", "here"])
+        assert text == "no {json} here"
+
+
+def test_import_does_not_load_sdk(project_root):
+    """Test importing the agents package leaves the Anthropic SDK unloaded"""
+    src = project_root / "src"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        str(path) for path in (src, src / "gemini-agent", src / "claude-agent")
+    ))
+    code = "import sys, agents; sys.exit('anthropic' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], env=env, capture_output=True).returncode == 0
@@ -235,6 +235,33 @@ class TestIssueDuplicateChecker:
 
         assert len(duplicates) == 0
 
+    def test_find_duplicates_matches_pairwise_scoring(self):
+        """Test find_duplicates agrees with is_duplicate pair by pair"""
+        checker = IssueDuplicateChecker()
+
+        existing_issues = [
+            MockIssue(1, "Fix authentication bug", "Auth system is broken"),
+            MockIssue(2, "Add dark mode", "Users want dark theme"),
+            MockIssue(3, "Fix login authentication issue", "Login auth not working"),
+            MockIssue(4, "Authentication bug fix", ""),
+            MockIssue(5, "!!!", "???"),
+        ]
+        proposals = [
+            ("Fix authentication problem", "Authentication is broken"),
+            ("Bug fix authentication", "Auth is broken"),
+            ("Add dark theme", "Users want a dark mode"),
+            ("...", ""),
+        ]
+
+        for title, body in proposals:
+            expected = {}
+            for issue in existing_issues:
+                is_dup, scores = checker.is_duplicate(title, body, issue.title, issue.body)
+                if is_dup:
+                    expected[issue.number] = scores
+            found = checker.find_duplicates(title, body, existing_issues)
+            assert {issue.number: scores for issue, scores in found} == expected
+
     def test_check_issue_list_all_unique(self):
         """Test checking issue list with all unique issues"""
         checker = IssueDuplicateChecker()
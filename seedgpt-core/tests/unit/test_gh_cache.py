@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the on-disk GitHub response cache
+"""
+
+import gzip
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# src/ is put on sys.path once by tests/conftest.py
+from utils import gh_cache
+
+
+class _FakeRequester:
+    """Stand-in for repo._requester returning queued (headers, data) replies"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def requestJsonAndCheck(self, verb, url, parameters=None, headers=None):
+        self.calls.append({"verb": verb, "url": url, "parameters": parameters, "headers": headers})
+        return self.replies.pop(0)
+
+
+def _repo(*replies):
+    return SimpleNamespace(
+        full_name="org/repo",
+        url="https://api.github.com/repos/org/repo",
+        _requester=_FakeRequester(*replies),
+    )
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the cache at a per-test directory"""
+    monkeypatch.setattr(gh_cache, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def _entry(endpoint_key="readme", params=None):
+    return gh_cache._load_entry(gh_cache._cache_file("org/repo", endpoint_key, params))
+
+
+class TestCachedGet:
+    """Test gh_cache.cached_get"""
+
+    def test_miss_fetches_and_stores(self):
+        """Test a miss requests the endpoint and caches the body with its ETag"""
+        repo = _repo(({"etag": '"v1"'}, {"content": "a"}))
+
+        data = gh_cache.cached_get(repo, "readme", "/readme", ttl=60, params={"per_page": 5})
+
+        assert data == {"content": "a"}
+        assert repo._requester.calls == [{
+            "verb": "GET",
+            "url": "https://api.github.com/repos/org/repo/readme",
+            "parameters": {"per_page": 5},
+            "headers": None,
+        }]
+        assert _entry(params={"per_page": 5})["etag"] == '"v1"'
+
+    def test_fresh_hit_makes_no_request(self):
+        """Test an entry within its TTL is served without a request"""
+        gh_cache.cached_get(_repo(({"etag": '"v1"'}, {"content": "a"})), "readme", "/readme", ttl=60)
+        repo = _repo()
+
+        assert gh_cache.cached_get(repo, "readme", "/readme", ttl=60) == {"content": "a"}
+        assert repo._requester.calls == []
+
+    def test_stale_entry_revalidated_with_etag(self, monkeypatch):
+        """Test a 304 on a stale entry keeps the body and refreshes its timestamp"""
+        gh_cache.cached_get(_repo(({"etag": '"v1"'}, {"content": "a"})), "readme", "/readme", ttl=60)
+        later = time.time() + 120
+        monkeypatch.setattr(gh_cache.time, "time", lambda: later)
+        repo = _repo(({}, None))
+
+        assert gh_cache.cached_get(repo, "readme", "/readme", ttl=60) == {"content": "a"}
+        assert repo._requester.calls[0]["headers"] == {"If-None-Match": '"v1"'}
+        assert _entry() == {"etag": '"v1"', "timestamp": later, "data": {"content": "a"}}
+
+    def test_stale_entry_replaced_on_200(self, monkeypatch):
+        """Test a 200 on revalidation replaces the cached body and ETag"""
+        gh_cache.cached_get(_repo(({"etag": '"v1"'}, {"content": "a"})), "readme", "/readme", ttl=60)
+        later = time.time() + 120
+        monkeypatch.setattr(gh_cache.time, "time", lambda: later)
+        repo = _repo(({"etag": '"v2"'}, {"content": "b"}))
+
+        assert gh_cache.cached_get(repo, "readme", "/readme", ttl=60) == {"content": "b"}
+        assert repo._requester.calls[0]["headers"] == {"If-None-Match": '"v1"'}
+        assert _entry() == {"etag": '"v2"', "timestamp": later, "data": {"content": "b"}}
+
+    @pytest.mark.parametrize("content", [b"not gzip", gzip.compress(b"{not json")], ids=["not_gzip", "not_json"])
+    def test_unreadable_entry_is_a_miss(self, content):
+        """Test a corrupt cache file is ignored and overwritten by a fresh fetch"""
+        cache_file = gh_cache._cache_file("org/repo", "readme", None)
+        cache_file.write_bytes(content)
+        repo = _repo(({"etag": '"v1"'}, {"content": "a"}))
+
+        assert gh_cache.cached_get(repo, "readme", "/readme", ttl=60) == {"content": "a"}
+        assert repo._requester.calls[0]["headers"] is None
+        assert _entry()["data"] == {"content": "a"}
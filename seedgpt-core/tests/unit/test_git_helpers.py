@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit tests for git repository helpers
+"""
+
+from pathlib import Path
+
+import git
+import pytest
+
+# src/ is put on sys.path once by tests/conftest.py
+from utils.git_helpers import get_all_changed_files
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Repository with one commit of a few tracked files"""
+    repo = git.Repo.init(tmp_path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    for name in ("modified.txt", "staged file.txt", "old name.txt", "conflict.txt"):
+        (tmp_path / name).write_text("original\n")
+    repo.git.add(all=True)
+    repo.git.commit(m="initial")
+    return repo
+
+
+class TestGetAllChangedFiles:
+    """Test get_all_changed_files porcelain v2 parsing"""
+
+    def test_clean_repository(self, git_repo):
+        """Test a clean repository reports no files"""
+        assert get_all_changed_files(git_repo) == []
+
+    def test_every_entry_kind(self, git_repo):
+        """Test modified, staged, renamed, unmerged and untracked paths are all reported"""
+        root = Path(git_repo.working_tree_dir)
+        base = git_repo.active_branch.name
+        git_repo.git.checkout("-b", "other")
+        (root / "conflict.txt").write_text("theirs\n")
+        git_repo.git.commit("-am", "theirs")
+        git_repo.git.checkout(base)
+        (root / "conflict.txt").write_text("ours\n")
+        git_repo.git.commit("-am", "ours")
+        with pytest.raises(git.GitCommandError):
+            git_repo.git.merge("other")
+
+        (root / "modified.txt").write_text("changed\n")
+        (root / "staged file.txt").write_text("changed\n")
+        git_repo.git.add("staged file.txt")
+        git_repo.git.mv("old name.txt", "new name.txt")
+        (root / "untracked dir").mkdir()
+        (root / "untracked dir" / "new file.txt").write_text("new\n")
+
+        # The rename's source path "old name.txt" must not be reported
+        assert sorted(get_all_changed_files(git_repo)) == [
+            "conflict.txt",
+            "modified.txt",
+            "new name.txt",
+            "staged file.txt",
+            "untracked dir/new file.txt",
+        ]
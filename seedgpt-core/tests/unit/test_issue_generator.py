@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit tests for IssueGenerator response parsing
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+# src/ is put on sys.path once by tests/conftest.py
+from agents import issue_generator
+from agents.issue_generator import IssueGenerator
+from utils.exceptions import GitHubAPIError, JSONParseError
+
+
+class TestExtractJson:
+    """Test IssueGenerator._extract_json"""
+
+    @pytest.mark.parametrize(
+        "response_text",
+        [
+            '{"issues": []}',
+            'Here you go:\n```json\n{"issues": []}\n```',
+            'Respond in {json} form:\n```json\n{"issues": []}\n```',
+            '```json\n{"issues": []}\n```\nExample:\n```\n{"other": {"x": 1}}\n```',
+            'Use the {name} field. {"issues": []} trailing text',
+        ],
+        ids=["bare", "fenced", "prose_brace_before_fence", "second_fenced_block", "prose_brace_unfenced"],
+    )
+    def test_extracts_issues_object(self, response_text):
+        """Test the issues object is found despite surrounding prose and fences"""
+        assert IssueGenerator._extract_json(response_text) == {"issues": []}
+
+    def test_nested_object_in_fence(self):
+        """Test a fenced object with nested braces is captured whole"""
+        text = '```json\n{"issues": [{"title": "a", "labels": ["bug"]}]}\n```'
+        assert IssueGenerator._extract_json(text)["issues"][0]["title"] == "a"
+
+    def test_no_json(self):
+        """Test a response without any JSON object raises JSONParseError"""
+        with pytest.raises(JSONParseError):
+            IssueGenerator._extract_json("no json {here")
+
+
+class _FakeRateLimiter:
+    def __init__(self):
+        self.recorded = []
+
+    def record_generation(self, **kwargs):
+        self.recorded.append(kwargs)
+
+
+class TestParseAndCreateIssues:
+    """Test IssueGenerator._parse_and_create_issues issue creation"""
+
+    @pytest.fixture
+    def generator(self):
+        """IssueGenerator with no-op deduplication and a recording rate limiter"""
+        generator = IssueGenerator.__new__(IssueGenerator)
+        generator.repo = object()
+        generator.dry_mode = False
+        generator.duplicate_checker = SimpleNamespace(
+            check_issue_list=lambda issues, open_issues, verbose: (issues, [])
+        )
+        generator.rate_limiter = _FakeRateLimiter()
+        return generator
+
+    def test_failed_create_records_created_issues(self, generator, monkeypatch):
+        """Test issues created before a failing create are still recorded"""
+        created = []
+
+        def create_issue(repo, title, body, labels):
+            if title == "b":
+                raise RuntimeError("boom")
+            created.append(title)
+            return SimpleNamespace(number=len(created))
+
+        monkeypatch.setattr(issue_generator, "create_issue", create_issue)
+        response = json.dumps({"issues": [{"title": t} for t in ("a", "b", "c")]})
+
+        with pytest.raises(GitHubAPIError, match="'b'"):
+            generator._parse_and_create_issues(response, needed=3, open_issues=[])
+
+        assert sorted(created) == ["a", "c"]
+        assert generator.rate_limiter.recorded == [{
+            "issues_proposed": 3,
+            "issues_created": 2,
+            "duplicates_filtered": 0,
+            "quality_rejected": 0,
+        }]
+
+
+class _FakeGenerator:
+    def __init__(self, name, error=None):
+        self.repo = SimpleNamespace(full_name=name)
+        self.error = error
+        self.created = []
+
+    def _count_needed(self):
+        if self.error:
+            raise self.error
+        return 1, []
+
+    def _prepare_prompt(self, needed, open_issues):
+        return f"prompt for {self.repo.full_name}"
+
+    def _parse_and_create_issues(self, response_text, needed, open_issues):
+        self.created.append(response_text)
+
+
+class TestIssueGeneratorBatch:
+    """Test IssueGeneratorBatch.run across repositories"""
+
+    def test_failed_check_skips_only_that_repo(self, monkeypatch):
+        """Test a repository that fails its check is skipped and its error raised after the rest run"""
+        submitted = {}
+
+        def submit_message_batch(api_key, prompts, **kwargs):
+            submitted.update(prompts)
+            return "batch-1"
+
+        def get_message_batch_results(api_key, batch_id, **kwargs):
+            return {custom_id: f"response to {prompt}" for custom_id, prompt in submitted.items()}
+
+        monkeypatch.setattr(issue_generator, "submit_message_batch", submit_message_batch)
+        monkeypatch.setattr(issue_generator, "get_message_batch_results", get_message_batch_results)
+        failing = _FakeGenerator("org/broken", error=GitHubAPIError("rate limited"))
+        working = _FakeGenerator("org/ok")
+        batch = issue_generator.IssueGeneratorBatch([failing, working], anthropic_api_key="key")
+
+        with pytest.raises(GitHubAPIError, match="rate limited"):
+            batch.run()
+
+        assert list(submitted.values()) == ["prompt for org/ok"]
+        assert working.created == ["response to prompt for org/ok"]
+        assert failing.created == []
@@ -2,7 +2,10 @@
 Unit tests for PROJECT_BRIEF.md validator
 """
 
+import json
+import os
 import pytest
+from datetime import datetime
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -13,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 from utils.project_brief_validator import (
     ProjectBriefValidator,
     ValidationResult,
+    clear_validation_cache,
     validate_project_brief,
     validate_or_exit,
 )
@@ -506,6 +510,213 @@ Flows
                 "Functional Requirements" in warning for warning in result.warnings
             )
 
+    @pytest.mark.parametrize(
+        "header",
+        [
+            "## Project Overview",
+            "## 🎯 Project Overview",
+            "## 1. Project Overview",
+            "## 1) Project Overview",
+            "## 1.2 Project Overview",
+            "## 🎯 1. Project Overview",
+        ],
+    )
+    def test_section_key_strips_markers(self, header):
+        """Test emoji and numbering prefixes are dropped from section keys"""
+        assert ProjectBriefValidator._section_key(header) == "project overview"
+
+    def test_section_key_keeps_leading_year(self):
+        """Test a number that isn't an ordinal stays part of the key"""
+        assert ProjectBriefValidator._section_key("## 2024 Roadmap") == "2024 roadmap"
+
+    def test_validator_numbered_headers(self):
+        """Test numbered section headers satisfy the required sections"""
+        content = "\n".join(
+            f"## {number}. {section}\n\nDetails for this section go here.\n"
+            for number, section in enumerate(ProjectBriefValidator.REQUIRED_SECTIONS, 1)
+        )
+        with TemporaryDirectory() as tmpdir:
+            brief_path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            brief_path.write_text(content)
+            result = ProjectBriefValidator(brief_path).validate()
+            assert not any("Missing required section" in error for error in result.errors)
+
+    def test_validator_single_hash_headers(self):
+        """Test a brief using top-level # headers is accepted"""
+        content = "\n".join(
+            f"# {section}\n\nDetails for this section go here.\n"
+            for section in ProjectBriefValidator.REQUIRED_SECTIONS
+        )
+        with TemporaryDirectory() as tmpdir:
+            brief_path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            brief_path.write_text(content)
+            result = ProjectBriefValidator(brief_path).validate()
+            assert not any("No markdown section headers" in error for error in result.errors)
+            assert not any("Missing required section" in error for error in result.errors)
+
+    def test_validator_no_headers(self):
+        """Test a brief without any markdown header is rejected"""
+        with TemporaryDirectory() as tmpdir:
+            brief_path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            brief_path.write_text("Project Overview and Core Requirements, no headers at all.")
+            result = ProjectBriefValidator(brief_path).validate()
+            assert result.is_valid is False
+            assert any("No markdown section headers" in error for error in result.errors)
+
+    def test_scan_lines_ignores_code_comments(self):
+        """Test a # comment inside a fenced block doesn't open a section"""
+        content = "## Technical Preferences\n\n```bash\n# install\npip install x\n```\nmore\n"
+        _, sections, _, _ = ProjectBriefValidator()._scan_lines(content)
+        assert list(sections) == ["technical preferences"]
+        start, end = sections["technical preferences"]
+        assert content[start:end].rstrip().endswith("more")
+
+
+class TestValidationStamp:
+    """Test the stamp recorded after a successful validation"""
+
+    @staticmethod
+    def _count_scans(monkeypatch):
+        """Count full validations by counting calls to the line scan"""
+        calls = []
+        original = ProjectBriefValidator._scan_lines
+
+        def scan_lines(self, content):
+            calls.append(content)
+            return original(self, content)
+
+        monkeypatch.setattr(ProjectBriefValidator, "_scan_lines", scan_lines)
+        return calls
+
+    def test_stamp_written_with_utc_timestamp(self):
+        """Test a passing validation records a timezone-aware stamp"""
+        with TemporaryDirectory() as tmpdir:
+            brief_path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            brief_path.write_text(MINIMAL_VALID_BRIEF)
+            validator = ProjectBriefValidator(brief_path)
+            assert validator.validate().is_valid is True
+
+            stamp = json.loads(validator.stamp_path.read_text())
+            assert stamp["valid"] is True
+            assert stamp["version"] == ProjectBriefValidator.STAMP_VERSION
+            assert datetime.fromisoformat(stamp["timestamp"]).tzinfo is not None
+
+    def test_stamp_hit_skips_checks(self, monkeypatch):
+        """Test unchanged content reuses the stamped result"""
+        calls = self._count_scans(monkeypatch)
+        with TemporaryDirectory() as tmpdir:
+            brief_path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            brief_path.write_text(MINIMAL_VALID_BRIEF)
+            first = ProjectBriefValidator(brief_path).validate()
+            second = ProjectBriefValidator(brief_path).validate()
+
+            assert len(calls) == 1
+            assert second.is_valid is True
+            assert second.warnings == first.warnings
+            assert second.metadata["line_count"] == first.metadata["line_count"]
+
+    def test_stamp_miss_after_edit(self, monkeypatch):
+        """Test edited content is validated again"""
+        calls = self._count_scans(monkeypatch)
+        with TemporaryDirectory() as tmpdir:
+            brief_path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            brief_path.write_text(MINIMAL_VALID_BRIEF)
+            validator = ProjectBriefValidator(brief_path)
+            validator.validate()
+
+            brief_path.write_text(INVALID_BRIEF_MISSING_SECTIONS)
+            result = validator.validate()
+
+            assert len(calls) == 2
+            assert result.is_valid is False
+
+    def test_force_ignores_stamp(self, monkeypatch):
+        """Test force=True re-runs every check despite a matching stamp"""
+        calls = self._count_scans(monkeypatch)
+        with TemporaryDirectory() as tmpdir:
+            brief_path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            brief_path.write_text(MINIMAL_VALID_BRIEF)
+            validator = ProjectBriefValidator(brief_path)
+            validator.validate()
+            validator.validate(force=True)
+
+            assert len(calls) == 2
+
+
+class TestValidationCache:
+    """Test the in-process memo behind validate_project_brief"""
+
+    @pytest.fixture(autouse=True)
+    def _clean_cache(self):
+        clear_validation_cache()
+        yield
+        clear_validation_cache()
+
+    @pytest.fixture
+    def validate_calls(self, monkeypatch):
+        """Record every ProjectBriefValidator.validate call"""
+        calls = []
+        original = ProjectBriefValidator.validate
+
+        def validate(self, force=False):
+            calls.append(force)
+            return original(self, force=force)
+
+        monkeypatch.setattr(ProjectBriefValidator, "validate", validate)
+        return calls
+
+    @pytest.fixture
+    def brief_path(self):
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "PROJECT_BRIEF.md"
+            path.write_text(INVALID_BRIEF_MISSING_SECTIONS)
+            yield path
+
+    def test_cache_hit(self, brief_path, validate_calls):
+        """Test an unchanged file is validated once and copies are returned"""
+        first = validate_project_brief(brief_path)
+        first.errors.clear()
+        second = validate_project_brief(brief_path)
+
+        assert len(validate_calls) == 1
+        assert second is not first
+        assert second.errors
+
+    def test_mtime_change_invalidates(self, brief_path, validate_calls):
+        """Test a newer mtime with the same size re-validates"""
+        validate_project_brief(brief_path)
+        stat = brief_path.stat()
+        os.utime(brief_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        validate_project_brief(brief_path)
+
+        assert len(validate_calls) == 2
+
+    def test_size_change_invalidates(self, brief_path, validate_calls):
+        """Test a different size with the same mtime re-validates"""
+        validate_project_brief(brief_path)
+        stat = brief_path.stat()
+        brief_path.write_text(MINIMAL_VALID_BRIEF)
+        os.utime(brief_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        result = validate_project_brief(brief_path)
+
+        assert len(validate_calls) == 2
+        assert result.is_valid is True
+
+    def test_clear_validation_cache(self, brief_path, validate_calls):
+        """Test clearing the cache forces the next call to validate"""
+        validate_project_brief(brief_path)
+        clear_validation_cache()
+        validate_project_brief(brief_path)
+
+        assert len(validate_calls) == 2
+
+    def test_force_bypasses_cache(self, brief_path, validate_calls):
+        """Test force=True validates again and passes force through"""
+        validate_project_brief(brief_path)
+        validate_project_brief(brief_path, force=True)
+
+        assert validate_calls == [False, True]
+
 
 class TestConvenienceFunctions:
     """Test convenience functions"""
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Unit tests for QAAgent repository context gathering
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+# src/ is put on sys.path once by tests/conftest.py
+from agents import qa_agent
+from agents.qa_agent import QAAgent
+
+CREATED = "2024-05-01T08:30:00Z"
+UPDATED = "2024-05-02T09:45:10Z"
+LONG_BODY = "é" * 150  # 300 bytes of UTF-8
+LONG_HEADLINE = "Fix “quoted” handling " * 8
+
+
+def _rest_time(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _graphql_activity(with_branch=True):
+    """Canned get_recent_activity payload"""
+    commit_history = {"nodes": [{
+        "oid": "0123456789abcdef",
+        "messageHeadline": LONG_HEADLINE,
+        "author": {"name": "Dev", "date": CREATED},
+    }]}
+    return {
+        "name": "repo",
+        "description": "A repository",
+        "stargazerCount": 7,
+        "primaryLanguage": {"name": "Python"},
+        "openIssues": {"totalCount": 3},
+        "openPullRequests": {"totalCount": 2},
+        "defaultBranchRef": {"target": {"history": commit_history}} if with_branch else None,
+        "issues": {"nodes": [
+            {
+                "number": 1,
+                "title": "Open issue",
+                "state": "OPEN",
+                "labels": {"nodes": [{"name": "bug"}]},
+                "createdAt": CREATED,
+                "updatedAt": UPDATED,
+                "body": LONG_BODY,
+            },
+            {
+                "number": 2,
+                "title": "Closed issue",
+                "state": "CLOSED",
+                "labels": {"nodes": []},
+                "createdAt": CREATED,
+                "updatedAt": UPDATED,
+                "body": None,
+            },
+        ]},
+        "pullRequests": {"nodes": [
+            {
+                "number": number,
+                "title": f"PR {number}",
+                "state": state,
+                "merged": state == "MERGED",
+                "createdAt": CREATED,
+                "updatedAt": UPDATED,
+                "additions": 10,
+                "deletions": 2,
+                "changedFiles": 1,
+            }
+            for number, state in ((3, "OPEN"), (4, "MERGED"), (5, "CLOSED"))
+        ]},
+    }
+
+
+def _rest_objects():
+    """PyGithub-like objects carrying the same data as the canned payload"""
+    issues = [
+        SimpleNamespace(number=1, title="Open issue", state="open", labels=[SimpleNamespace(name="bug")],
+                        created_at=_rest_time(CREATED), updated_at=_rest_time(UPDATED), body=LONG_BODY),
+        SimpleNamespace(number=2, title="Closed issue", state="closed", labels=[],
+                        created_at=_rest_time(CREATED), updated_at=_rest_time(UPDATED), body=None),
+    ]
+    prs = [
+        SimpleNamespace(number=number, title=f"PR {number}", state=state, merged=merged,
+                        created_at=_rest_time(CREATED), updated_at=_rest_time(UPDATED),
+                        additions=10, deletions=2, changed_files=1)
+        for number, state, merged in ((3, "open", False), (4, "closed", True), (5, "closed", False))
+    ]
+    commits = [SimpleNamespace(
+        sha="0123456789abcdef",
+        commit=SimpleNamespace(
+            message=LONG_HEADLINE + "\n\nDetails",
+            author=SimpleNamespace(name="Dev", date=_rest_time(CREATED)),
+        ),
+    )]
+    return issues, prs, commits
+
+
+@pytest.fixture
+def agent():
+    """QAAgent over a fake repository whose REST listings match the canned payload"""
+    agent = QAAgent.__new__(QAAgent)
+    agent.repo = SimpleNamespace(
+        full_name="org/repo",
+        name="repo",
+        description="A repository",
+        open_issues_count=5,
+        stargazers_count=7,
+        language="Python",
+    )
+    agent.max_issues = 10
+    agent.max_prs = 10
+    agent.max_commits = 10
+    return agent
+
+
+class TestGatherRepositoryContextGraphql:
+    """Test the GraphQL context matches the REST listings"""
+
+    def test_matches_rest_context(self, agent, monkeypatch):
+        """Test state mapping, counts, timestamps and truncation match the REST path"""
+        issues, prs, commits = _rest_objects()
+        monkeypatch.setattr(qa_agent, "search_recent_issues", lambda repo, **kwargs: issues)
+        monkeypatch.setattr(qa_agent, "get_recent_pull_requests", lambda repo, **kwargs: prs)
+        monkeypatch.setattr(qa_agent, "get_recent_commits", lambda repo, **kwargs: commits)
+
+        def graphql_unavailable(repo, **kwargs):
+            raise RuntimeError("GraphQL unavailable")
+
+        monkeypatch.setattr(qa_agent, "get_recent_activity", graphql_unavailable)
+        rest_context = agent._gather_repository_context()
+
+        monkeypatch.setattr(qa_agent, "get_recent_activity", lambda repo, **kwargs: _graphql_activity())
+        graphql_context = agent._gather_repository_context_graphql()
+
+        assert graphql_context == rest_context
+        assert graphql_context["repo_info"]["open_issues_count"] == 5
+        assert [pr["state"] for pr in graphql_context["pull_requests"]] == ["open", "closed", "closed"]
+        assert graphql_context["issues"][0]["created_at"] == "2024-05-01T08:30:00+00:00"
+        assert len(graphql_context["issues"][0]["body"].encode("utf-8")) == 200
+        assert len(graphql_context["commits"][0]["message"].encode("utf-8")) <= 100
+
+    def test_missing_default_branch(self, agent, monkeypatch):
+        """Test an empty repository without a default branch yields no commits"""
+        activity = _graphql_activity(with_branch=False)
+        monkeypatch.setattr(qa_agent, "get_recent_activity", lambda repo, **kwargs: activity)
+
+        assert agent._gather_repository_context_graphql()["commits"] == []
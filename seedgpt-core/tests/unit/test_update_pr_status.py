@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the PR status update job
+"""
+
+import pytest
+
+# src/ is put on sys.path once by tests/conftest.py
+from scripts import update_pr_status
+from utils.exceptions import RateLimitError
+from utils.outcome_tracker import ResolutionStatus
+
+
+class _FakeGithub:
+    def __init__(self, token):
+        pass
+
+    def get_repo(self, name):
+        return object()
+
+
+class _FakeTracker:
+    def __init__(self, pending):
+        self.pending = pending
+        self.updates = None
+
+    def get_pending_prs(self):
+        return self.pending
+
+    def update_statuses(self, updates):
+        self.updates = updates
+
+
+@pytest.fixture
+def run_job(monkeypatch):
+    """Run main() against fake GitHub and tracker objects"""
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("GITHUB_REPOSITORY", "owner/repo")
+    monkeypatch.setattr(update_pr_status, "Github", _FakeGithub)
+
+    def run(pending, check_pr):
+        tracker = _FakeTracker(pending)
+        monkeypatch.setattr(update_pr_status, "OutcomeTracker", lambda: tracker)
+        monkeypatch.setattr(update_pr_status, "_check_pr", check_pr)
+        return tracker
+
+    return run
+
+
+def test_writes_statuses(run_job):
+    """Test merged and closed PRs are written and open ones skipped"""
+    results = {10: ResolutionStatus.MERGED, 11: None, 12: ResolutionStatus.CLOSED}
+    tracker = run_job([(1, 10), (2, 11), (3, 12)], lambda repo, issue, pr: results[pr])
+
+    update_pr_status.main()
+
+    assert tracker.updates == [
+        (1, ResolutionStatus.MERGED, 10),
+        (3, ResolutionStatus.CLOSED, 12),
+    ]
+
+
+def test_rate_limit_keeps_completed_statuses(run_job):
+    """Test statuses fetched before a rate limit are saved before it's raised"""
+
+    def check_pr(repo, issue_number, pr_number):
+        if pr_number == 11:
+            raise RateLimitError("GitHub")
+        return ResolutionStatus.MERGED
+
+    tracker = run_job([(1, 10), (2, 11), (3, 12)], check_pr)
+
+    with pytest.raises(RateLimitError):
+        update_pr_status.main()
+
+    assert tracker.updates == [
+        (1, ResolutionStatus.MERGED, 10),
+        (3, ResolutionStatus.MERGED, 12),
+    ]